@@ -278,6 +278,7 @@ export interface MonthScore {
 export interface BloomPrediction {
   variety: string;
   bloom_date: string | null;
+  full_bloom_date: string | null;
   harvest_date: string | null;
   gdd_at_bloom: number | null;
   days_to_harvest: number | null;
@@ -4,7 +4,11 @@ GET  /api/forecast/annual       → 연간 작황 전망
 GET  /api/forecast/gdd          → GDD 진행상황
 GET  /api/forecast/variety-risk → 품종별 리스크
 GET  /api/forecast/bloom        → 개화/수확 예측
-POST /api/forecast/train        → ML 학습 (수동)
+POST /api/forecast/train        → ML 학습 (수동, 백그라운드 작업)
+GET  /api/forecast/cache        → 전망 결과 캐시 통계
+GET  /api/forecast/models       → ML 모델 레지스트리 (로드 시간·예측 지연·크기)
+
+annual / variety-risk / bloom은 같은 전망 결과 캐시를 공유한다.
 """
 
 from __future__ import annotations
@@ -13,13 +17,10 @@ from datetime import date
 
 from fastapi import APIRouter, Query
 
-from services.yield_forecaster import (
-    annual_forecast,
-    get_gdd_progress,
-    train_model,
-)
-from services.climate_collector import get_climate_collector
-from services.gdd_calculator import extract_ml_features
+from services.forecast_cache import get_forecast_cache
+from services.job_queue import get_job_queue
+from services.model_registry import get_model_registry
+from services.yield_forecaster import get_gdd_progress
 
 router = APIRouter(prefix="/api/forecast", tags=["forecast"])
 
@@ -30,7 +31,7 @@ async def forecast_annual(
     year: int | None = Query(None, description="연도 (기본: 올해)"),
 ):
     """연간 작황 전망 (Lv1 규칙 + Lv2 통계 + Lv3 ML)."""
-    return await annual_forecast(region_id, year)
+    return await get_forecast_cache().annual(region_id, year)
 
 
 @router.get("/gdd")
@@ -48,7 +49,7 @@ async def forecast_variety_risk(
     year: int | None = Query(None),
 ):
     """품종별 리스크 매트릭스."""
-    result = await annual_forecast(region_id, year)
+    result = await get_forecast_cache().annual(region_id, year)
     return {
         "region_id": result["region_id"],
         "year": result["year"],
@@ -62,7 +63,7 @@ async def forecast_bloom(
     year: int | None = Query(None),
 ):
     """개화·수확 예측."""
-    result = await annual_forecast(region_id, year)
+    result = await get_forecast_cache().annual(region_id, year)
     return {
         "region_id": result["region_id"],
         "year": result["year"],
@@ -70,24 +71,33 @@ async def forecast_bloom(
     }
 
 
+@router.get("/cache")
+async def forecast_cache_stats():
+    """전망 결과 캐시 적중/미스 통계."""
+    return get_forecast_cache().get_stats()
+
+
+@router.get("/models")
+async def forecast_models():
+    """지역별 ML 모델 로드 상태·로드 시간·예측 지연·모델 크기."""
+    return get_model_registry().get_stats()
+
+
 @router.post("/train")
 async def forecast_train(
     region_id: str = Query("yeongju"),
     start_year: int = Query(2013),
     end_year: int = Query(2023),
+    wait: bool = Query(False, description="학습 완료까지 대기 후 결과 반환"),
 ):
-    """ML 모델 학습 (KOSIS 수확량 + ASOS 기상 데이터 결합)."""
-    collector = get_climate_collector()
-    kosis_data = await collector.fetch_kosis_yield(start_year, end_year)
-
-    historical = []
-    for record in kosis_data:
-        y = record["year"]
-        daily = await collector.fetch_asos_daily(region_id, y)
-        features = extract_ml_features(daily)
-        historical.append({
-            "features": features,
-            "yield_kg_per_10a": record["yield_kg_per_10a"],
-        })
-
-    return train_model(region_id, historical)
+    """ML 모델 학습 (KOSIS 수확량 + ASOS 기상 데이터 결합).
+
+    작업 큐에 제출하고 job 정보를 즉시 반환한다 (학습은 프로세스 풀에서 실행).
+    진행률·결과는 GET /api/jobs/{job_id}.
+
+    응답 형식 변경: 이전에는 학습 결과를, 이제는 기본으로 job 정보를 반환한다.
+    기존 클라이언트는 ?wait=true를 붙여 이전과 같은 학습 결과를 받는다.
+    """
+    return await get_job_queue().dispatch(
+        "forecast_train", wait, region_id=region_id, start_year=start_year, end_year=end_year,
+    )
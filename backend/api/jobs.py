@@ -0,0 +1,42 @@
+"""백그라운드 작업 API — 학습·진화·마이그레이션·배치 실행 작업의 상태·진행률·취소.
+
+GET  /api/jobs                  → 최근 작업 목록 + 큐 통계
+GET  /api/jobs/{job_id}         → 작업 상태·진행률·결과
+POST /api/jobs/{job_id}/cancel  → 취소 (대기 중이면 즉시, 실행 중이면 다음 진행률 보고 시점)
+"""
+from __future__ import annotations
+
+from fastapi import APIRouter, Query
+
+from services.job_queue import get_job_queue
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+
+def _unknown(job_id: str) -> dict:
+    return {"job_id": job_id, "status": "unknown"}
+
+
+@router.get("")
+async def list_jobs(
+    status: str | None = Query(None, description="queued | running | done | failed | cancelled"),
+    kind: str | None = Query(None),
+    limit: int = Query(20, ge=1, le=200),
+):
+    """최근 작업 목록 (결과 제외)."""
+    queue = get_job_queue()
+    return {"jobs": queue.list_jobs(status=status, kind=kind, limit=limit), "stats": queue.get_stats()}
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: str):
+    """작업 상태 — status: queued | running | done | failed | cancelled | unknown."""
+    job = get_job_queue().get(job_id)
+    return job.to_dict() if job else _unknown(job_id)
+
+
+@router.post("/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    """작업 취소 요청."""
+    job = get_job_queue().cancel(job_id)
+    return job.to_dict(include_result=False) if job else _unknown(job_id)
@@ -1,39 +1,59 @@
+import asyncio
 import time
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
 
+from core.feature_flags import get_feature_flags
 from schemas.simulation import (
     SimulationRequest, SimulationResponse, AnalyticsContext,
     CompareRequest, CompareResponse,
     FeedbackRequest, FeedbackStats,
+    SimulationBatchRequest, SimulationBatchResponse,
+    MonteCarloRequest, MonteCarloResponse,
+    SensitivityRequest, SensitivityResponse,
+    SolveRequest, SolveResponse,
+    OptimizeRequest, OptimizeResponse,
+    QuickSimulationResponse,
 )
-from services.simulation import simulate, compare_scenarios
+from services.simulation import (
+    simulate, simulate_batch, simulate_monte_carlo, compare_scenarios,
+)
+from services.critique_queue import get_critique_queue
+from services.job_queue import get_job_queue
 from services.simulation_analytics import get_analytics
+from services.simulation_cache import get_result_cache
+from services.simulation_cube import get_simulation_cube, quick_simulate
 from services.simulation_feedback import get_feedback_collector
-from services.simulation_validator import validate_simulation, suggest_refinement
+from services.simulation_optimizer import optimize_portfolio
+from services.simulation_sensitivity import analyze_sensitivity
+from services.simulation_session import StaleComputation, get_session_registry
+from services.simulation_solver import solve
+from services.simulation_validator import validate_and_refine
 
 router = APIRouter(prefix="/api/simulation", tags=["simulation"])
 
 
+def _simulate_and_refine(req: SimulationRequest) -> SimulationResponse:
+    """simulate → 검증 → 보정 단일 패스 (결과 캐시 미스 시 실행)."""
+    # self-refine-loop R51: 보정값은 중간 산출물에 직접 적용 (재시뮬레이션 없음)
+    try:
+        result, _ = validate_and_refine(req)
+    except Exception:
+        result = simulate(req)
+    return result
+
+
 @router.post("/run", response_model=SimulationResponse)
 async def run_simulation(req: SimulationRequest):
     """수익 시뮬레이션 — 품종+면적 입력 → 연도별 수익 예측"""
     t0 = time.perf_counter()
-    result = simulate(req)
-
-    # self-refine-loop R51: 검증 → 보정 → 재시뮬레이션
-    try:
-        notes = validate_simulation(result)
-        if notes:
-            refined_req = suggest_refinement(req, result, notes)
-            if refined_req is not None:
-                result = simulate(refined_req)
-                result.refined = True
-                # 보정 결과도 재검증 (1회만)
-                notes = validate_simulation(result)
-            result.validation_notes = notes if notes else None
-    except Exception:
-        pass
+    cache = get_result_cache() if get_feature_flags().is_enabled("simulation_result_cache") else None
+    result = cache.get(req) if cache else None
+    if result is None:
+        result = _simulate_and_refine(req)
+        if cache:
+            cache.put(req, result)
 
     duration_ms = (time.perf_counter() - t0) * 1000
 
@@ -68,13 +88,90 @@ async def run_simulation(req: SimulationRequest):
     return result
 
 
+@router.post("/quick", response_model=QuickSimulationResponse)
+async def run_quick_simulation(req: SimulationRequest):
+    """슬라이더용 빠른 시뮬레이션 — 사전 계산 큐브 보간 (격자 밖이면 정확 계산)."""
+    t0 = time.perf_counter()
+    result = quick_simulate(req)
+    result.duration_ms = round((time.perf_counter() - t0) * 1000, 1)
+    return result
+
+
+@router.post("/batch", response_model=SimulationBatchResponse)
+async def run_simulation_batch(req: SimulationBatchRequest):
+    """다건 수익 시뮬레이션 — NumPy 커널 일괄 계산 (simulate()와 동일 결과, 열 지향 응답).
+
+    야간 자문 리포트용. 자가검증·보정, 실행 분석 기록은 적용하지 않는다.
+    """
+    t0 = time.perf_counter()
+    result = simulate_batch(req.requests)
+    result["duration_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+    return result
+
+
+@router.post("/batch/jobs")
+async def submit_simulation_batch(req: SimulationBatchRequest):
+    """대량 배치를 백그라운드 작업으로 제출 — job 정보를 즉시 반환.
+
+    입력 해석은 API 프로세스에서, 커널 계산·응답 조립은 프로세스 풀에서 실행한다.
+    결과(/batch와 같은 열 지향 딕셔너리)는 GET /api/jobs/{job_id}.
+    """
+    return await get_job_queue().dispatch(
+        "simulation_batch", requests=[r.model_dump(exclude_none=True) for r in req.requests],
+    )
+
+
+@router.post("/monte-carlo", response_model=MonteCarloResponse)
+async def run_monte_carlo(req: MonteCarloRequest):
+    """확률 시뮬레이션 — 수확량·가격·등급·비용상승 불확실성 → P10/P50/P90 구간."""
+    t0 = time.perf_counter()
+    result = simulate_monte_carlo(req)
+    result.duration_ms = round((time.perf_counter() - t0) * 1000, 1)
+    return result
+
+
+@router.post("/sensitivity", response_model=SensitivityResponse)
+async def run_sensitivity(req: SensitivityRequest):
+    """민감도 분석 — 입력 축별 ±delta 영향 (연간이익·ROI·손익분기 토네이도)."""
+    t0 = time.perf_counter()
+    result = analyze_sensitivity(req)
+    result.duration_ms = round((time.perf_counter() - t0) * 1000, 1)
+    return result
+
+
+@router.post("/solve", response_model=SolveResponse)
+async def run_inverse_solve(req: SolveRequest):
+    """역산 — 목표 지표(손익분기 연차·ROI·연간이익 등)를 만족하는 최소 가격·수확량·면적."""
+    t0 = time.perf_counter()
+    result = solve(req)
+    result.duration_ms = round((time.perf_counter() - t0) * 1000, 1)
+    return result
+
+
+@router.post("/optimize", response_model=OptimizeResponse)
+async def run_portfolio_optimizer(req: OptimizeRequest):
+    """식재 포트폴리오 최적화 — 품종·대목·급지·혼합 비율 조합의 비지배 상위 계획."""
+    t0 = time.perf_counter()
+    try:
+        result = optimize_portfolio(req)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    result.duration_ms = round((time.perf_counter() - t0) * 1000, 1)
+    return result
+
+
 @router.post("/compare", response_model=CompareResponse)
 async def compare_simulation(req: CompareRequest):
-    """낙관/중립/비관 3시나리오 비교 (워크플로우 렌즈 L4)"""
+    """낙관/중립/비관 3시나리오 (+ 사용자 시나리오) 비교 (워크플로우 렌즈 L4)"""
     return compare_scenarios(
         variety=req.variety,
         area_pyeong=req.area_pyeong,
         projection_years=req.projection_years,
+        extra_modifiers=[
+            {"scenario": m.scenario, "label": m.label,
+             "yield": m.yield_factor, "price": m.price_factor}
+            for m in req.extra_scenarios
+        ],
     )
 
 
@@ -84,12 +181,135 @@ async def simulation_analytics():
     return get_analytics().get_snapshot().to_dict()
 
 
+@router.get("/cache")
+async def simulation_cache_stats():
+    """결과 캐시 적중/미스 통계"""
+    return get_result_cache().get_stats()
+
+
+@router.get("/critique")
+async def simulation_critique_stats():
+    """크로스모델 비평 큐 상태."""
+    return get_critique_queue().get_stats()
+
+
+@router.get("/critique/{critique_id}")
+async def simulation_critique(critique_id: str):
+    """비평 조회 — status: pending | done | failed | timeout | empty | unknown."""
+    entry = get_critique_queue().get(critique_id)
+    return entry or {"critique_id": critique_id, "status": "unknown", "critique": None}
+
+
+@router.get("/cube")
+async def simulation_cube_status():
+    """사전 계산 큐브 상태 (크기·지문·적중/폴백 통계)."""
+    return get_simulation_cube().get_status()
+
+
+@router.post("/cube/rebuild")
+async def simulation_cube_rebuild():
+    """큐브 재구성을 백그라운드로 요청."""
+    cube = get_simulation_cube()
+    cube.schedule_refresh()
+    return cube.get_status()
+
+
+async def _run_session_step(ws: WebSocket, session, req: SimulationRequest, seq: int) -> None:
+    """세션 편집 1건 계산 → 여전히 최신 편집이면 결과 전송."""
+    try:
+        out = await asyncio.to_thread(session.compute, req, seq)
+    except StaleComputation:
+        return
+    if seq != session.seq:
+        return
+    out["result"] = out["result"].model_dump(mode="json")
+    await ws.send_json({"type": "result", **out})
+
+
+@router.websocket("/session")
+async def simulation_session(ws: WebSocket):
+    """What-if 세션 — 편집된 필드가 영향을 주는 단계만 재계산.
+
+    클라이언트 메시지:
+      {"type": "init", "request": {...SimulationRequest}}
+      {"type": "edit", "changes": {"price_per_kg": 6000, ...}}
+      {"type": "stats"}
+    새 편집이 오면 진행 중인 이전 계산은 취소되고 최신 편집 결과만 전송된다.
+    """
+    await ws.accept()
+    registry = get_session_registry()
+    session = registry.open()
+    pending: asyncio.Task | None = None
+    await ws.send_json({"type": "session", "session_id": session.session_id})
+    try:
+        while True:
+            msg = await ws.receive_json()
+            kind = msg.get("type", "edit")
+            if kind == "stats":
+                await ws.send_json({"type": "stats", **session.get_stats()})
+                continue
+            try:
+                seq, req = session.apply(
+                    msg.get("request") if kind == "init" else msg.get("changes") or {},
+                    replace=kind == "init",
+                )
+            except (ValidationError, TypeError) as exc:
+                await ws.send_json({"type": "error", "message": str(exc)})
+                continue
+            if pending is not None and not pending.done():
+                pending.cancel()
+                session.superseded += 1
+            pending = asyncio.create_task(_run_session_step(ws, session, req, seq))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if pending is not None and not pending.done():
+            pending.cancel()
+        registry.close(session)
+
+
+@router.get("/sessions")
+async def simulation_sessions():
+    """활성 what-if 세션 통계."""
+    return get_session_registry().get_stats()
+
+
 @router.get("/analytics/trends")
 async def simulation_trends(window: int = 50):
     """시뮬레이션 트렌드 분석 (L6 학습순환)"""
     return get_analytics().get_trends(window=window)
 
 
+@router.get("/analytics/query")
+async def simulation_analytics_query(
+    group_by: str = "variety",
+    metric: str = "roi_10year",
+    quantiles: str = "0.5,0.9",
+    time_bucket: str = "day",
+    since: float | None = Query(None, ge=0),
+    until: float | None = Query(None, ge=0),
+    limit: int = Query(1000, ge=1),
+):
+    """실행 이력 그룹 집계 — group_by: variety,area,time,roi (쉼표 구분), 건수·평균·분위수.
+
+    알 수 없는 group_by·metric·time_bucket, 잘못된 quantiles는 400.
+    """
+    try:
+        qs = tuple(float(q) for q in quantiles.split(",") if q.strip())
+        return await asyncio.to_thread(
+            get_analytics().query,
+            group_by=tuple(k.strip() for k in group_by.split(",") if k.strip()),
+            metric=metric,
+            quantiles=qs,
+            time_bucket=time_bucket,
+            since=since,
+            until=until,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.post("/feedback")
 async def submit_simulation_feedback(req: FeedbackRequest):
     """시뮬레이션 결과 피드백 제출 (feedback-system R48)"""
@@ -101,23 +321,21 @@ async def submit_simulation_feedback(req: FeedbackRequest):
         comment=req.comment,
     )
 
-    # Step 5: 피드백 20건마다 자동 진화 트리거
-    evolution_triggered = False
+    # Step 5: 피드백 20건마다 자동 진화 트리거 (작업 큐 — 대기 중인 진화와 병합)
+    evolution_job_id = None
     try:
-        from core.feature_flags import get_feature_flags
         if get_feature_flags().is_enabled("evolution_auto_trigger"):
             stats = collector.get_stats()
             if stats.get("total", 0) % 20 == 0 and stats.get("total", 0) > 0:
-                from core.evolution_engine import get_evolution_engine
-                result = get_evolution_engine().evolve()
-                evolution_triggered = result.get("evolved", False)
+                evolution_job_id = get_job_queue().submit("evolve").job_id
     except Exception:
         pass
 
     return {
         "received": True,
         "timestamp": entry["timestamp"],
-        "evolution_triggered": evolution_triggered,
+        "evolution_triggered": evolution_job_id is not None,
+        "evolution_job_id": evolution_job_id,
     }
 
 
@@ -58,13 +58,13 @@ class TaxonomyUsageTracker:
         self._usage_counts: Dict[str, int] = {e.value: 0 for e in enum_cls}
         self._unmapped: List[str] = []
 
-    def record(self, value: Any) -> None:
-        """Enum 값 사용 기록."""
+    def record(self, value: Any, count: int = 1) -> None:
+        """Enum 값 사용 기록 (배치 경로는 count로 일괄 기록)."""
         str_val = value.value if isinstance(value, Enum) else str(value)
         if str_val in self._usage_counts:
-            self._usage_counts[str_val] += 1
+            self._usage_counts[str_val] += count
         else:
-            self._unmapped.append(str_val)
+            self._unmapped.extend([str_val] * min(count, self._window * 2))
             if len(self._unmapped) > self._window * 2:
                 self._unmapped = self._unmapped[-self._window:]
 
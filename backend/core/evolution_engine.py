@@ -9,20 +9,33 @@
 3. 보정 계수 산출 → 적용
 4. 보정 이력 기록 (되돌리기 가능)
 5. 효과 측정 → 다음 보정에 반영 (자기강화 학습)
+
+소비 커서 (tuning_state.json "cursors"):
+  validator_offset — validator_outcomes.jsonl 바이트 오프셋 (완결된 줄까지만 전진)
+  alert_epoch/alert_seq — 이상감지 알림 일련번호 (재기동으로 epoch가 바뀌면 처음부터)
+  feedback_total — 지난 진단 시점의 피드백 건수
+진단 누적값(검증 건수·보정 건수·최근 50건 링)은 "diagnostics"에 함께 저장하므로
+사이클마다 새로 쌓인 이벤트만 처리한다.
 """
 from __future__ import annotations
 
 import json
 import logging
+import os
+import threading
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from core.log_writer import get_log_writer
+
 logger = logging.getLogger(__name__)
 
 _DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 _TUNING_LOG = _DATA_DIR / "tuning_log.jsonl"
 _TUNING_STATE = _DATA_DIR / "tuning_state.json"
+_VALIDATOR_WINDOW = 50  # 검증 이력 진단 대상 (최근 N건)
 
 
 class EvolutionEngine:
@@ -31,6 +44,8 @@ class EvolutionEngine:
     def __init__(self):
         self._state = self._load_state()
         self._generation = self._state.get("generation", 0)
+        self._revision = 0  # 상태 저장마다 증가 (세대 변화 없는 보정·롤백 포함)
+        self._lock = threading.RLock()  # 커서 전진 직렬화 (피드백 핸들러·갱신 스레드)
 
     # ------------------------------------------------------------------
     # 핵심: 자가 진화 실행
@@ -41,8 +56,13 @@ class EvolutionEngine:
         Returns:
             진화 결과 (변경사항, 근거, 세대 번호)
         """
+        with self._lock:
+            return self._evolve()
+
+    def _evolve(self) -> dict[str, Any]:
         diagnosis = self._diagnose()
         if not diagnosis["actionable"]:
+            self._persist()  # 전진한 커서·누적값 보존
             return {
                 "evolved": False,
                 "generation": self._generation,
@@ -99,6 +119,10 @@ class EvolutionEngine:
             if total == 0:
                 return {"has_data": False}
 
+            cursors = self._state.setdefault("cursors", {})
+            new_feedback = max(total - cursors.get("feedback_total", 0), 0)
+            cursors["feedback_total"] = total
+
             inaccuracy_rate = 1.0 - stats.get("helpful_rate", 1.0)
             # 품종별 부정확 비율
             variety_issues: dict[str, float] = {}
@@ -111,6 +135,7 @@ class EvolutionEngine:
             return {
                 "has_data": True,
                 "total_feedback": total,
+                "new_feedback": new_feedback,
                 "inaccuracy_rate": round(inaccuracy_rate, 3),
                 "variety_issues": variety_issues,
             }
@@ -118,37 +143,64 @@ class EvolutionEngine:
             return {"has_data": False}
 
     def _analyze_validator_outcomes(self) -> dict:
-        """검증기 결과 이력에서 보정 빈도를 분석."""
+        """검증기 결과 이력에서 보정 빈도를 분석 (커서 이후 새 줄만 읽음)."""
         outcome_path = _DATA_DIR / "validator_outcomes.jsonl"
-        if not outcome_path.exists():
-            return {"has_data": False}
+        get_log_writer().flush(outcome_path)
+        cursors = self._state.setdefault("cursors", {})
+        diag = self._state.setdefault("diagnostics", {})
+        # 최근 N건 [보정 여부, 경고 필드] — 새 줄이 많아도 창 크기만 유지
+        recent = deque(diag.get("recent_validations", []), maxlen=_VALIDATOR_WINDOW)
+        offset = cursors.get("validator_offset", 0)
+        new = n_refined = 0
 
         try:
-            lines = outcome_path.read_text(encoding="utf-8").strip().split("\n")
-            recent = lines[-50:]  # 최근 50건
-            total = len(recent)
-            refined = sum(1 for l in recent if '"was_refined": true' in l)
-
-            # 자주 발생하는 경고 필드 추출
-            warning_fields: dict[str, int] = {}
-            for line in recent:
-                try:
-                    entry = json.loads(line)
-                    for field in entry.get("warning_fields", []):
-                        warning_fields[field] = warning_fields.get(field, 0) + 1
-                except json.JSONDecodeError:
-                    continue
-
-            return {
-                "has_data": True,
-                "total_validations": total,
-                "adjustment_rate": round(refined / total, 3) if total else 0,
-                "frequent_warnings": dict(sorted(
-                    warning_fields.items(), key=lambda x: -x[1]
-                )[:5]),
-            }
+            with open(outcome_path, "rb") as f:
+                if f.seek(0, 2) < offset:  # 파일 교체·잘림 → 처음부터
+                    offset = 0
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # 기록 중인 줄은 다음 사이클에
+                    offset += len(line)
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    # 검증기는 "refined"/"fields"로 기록 (구버전 키도 허용)
+                    refined = bool(entry.get("refined", entry.get("was_refined", False)))
+                    fields = entry.get("fields", entry.get("warning_fields", []))
+                    recent.append([refined, fields])
+                    new += 1
+                    n_refined += refined
+        except FileNotFoundError:
+            pass
         except OSError:
             return {"has_data": False}
+        cursors["validator_offset"] = offset
+        diag["recent_validations"] = list(recent)
+        diag["validator_total"] = diag.get("validator_total", 0) + new
+        diag["validator_refined"] = diag.get("validator_refined", 0) + n_refined
+
+        total = len(recent)
+        if not total:
+            return {"has_data": False}
+        refined = sum(1 for r, _ in recent if r)
+
+        # 자주 발생하는 경고 필드 추출
+        warning_fields: dict[str, int] = {}
+        for _, fields in recent:
+            for field in fields:
+                warning_fields[field] = warning_fields.get(field, 0) + 1
+
+        return {
+            "has_data": True,
+            "total_validations": total,
+            "new_validations": new,
+            "adjustment_rate": round(refined / total, 3),
+            "frequent_warnings": dict(sorted(
+                warning_fields.items(), key=lambda x: -x[1]
+            )[:5]),
+        }
 
     # ------------------------------------------------------------------
     # Step 5: 이상감지 알림 소비 → 시세 신뢰도 조정
@@ -166,12 +218,24 @@ class EvolutionEngine:
         try:
             from services.anomaly_detector import get_anomaly_detector
             detector = get_anomaly_detector()
-            alerts = detector.get_alerts(limit=50)
         except Exception:
             return {"consumed": False, "reason": "anomaly_detector_unavailable"}
 
-        if not alerts:
-            return {"consumed": False, "reason": "no_alerts"}
+        with self._lock:
+            cursors = self._state.setdefault("cursors", {})
+            if cursors.get("alert_epoch") != detector.epoch:
+                cursors["alert_epoch"], cursors["alert_seq"] = detector.epoch, 0
+            alerts, missed = detector.alerts_since(cursors.get("alert_seq", 0))
+            if not alerts:
+                return {"consumed": False, "reason": "no_alerts"}
+            cursors["alert_seq"] = alerts[-1]["seq"]
+            diag = self._state.setdefault("diagnostics", {})
+            diag["alerts_consumed"] = diag.get("alerts_consumed", 0) + len(alerts)
+            result = self._apply_alerts(alerts)
+            result["alerts_missed"] = missed
+            return result
+
+    def _apply_alerts(self, alerts: list[dict]) -> dict:
 
         modifiers = self._state.setdefault("modifiers", {})
         adjustments_made = []
@@ -206,6 +270,8 @@ class EvolutionEngine:
 
         if adjustments_made:
             self._save_state()
+        else:
+            self._persist()
 
         return {
             "consumed": True,
@@ -287,6 +353,15 @@ class EvolutionEngine:
         """전체 보정 계수."""
         return dict(self._state.get("modifiers", {}))
 
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    @property
+    def revision(self) -> int:
+        """보정 계수 변경 횟수 (프로세스 내). 결과 캐시 무효화 기준."""
+        return self._revision
+
     # ------------------------------------------------------------------
     # 상태: 현재 진화 상태 조회
     # ------------------------------------------------------------------
@@ -298,6 +373,7 @@ class EvolutionEngine:
             "total_evolutions": self._state.get("total_evolutions", 0),
             "last_evolved": self._state.get("last_evolved"),
             "can_rollback": self._generation > 0,
+            "cursors": dict(self._state.get("cursors", {})),
         }
 
     def rollback(self) -> dict:
@@ -326,15 +402,21 @@ class EvolutionEngine:
         return {"generation": 0, "modifiers": {}, "history": []}
 
     def _save_state(self) -> None:
+        self._revision += 1
         self._state["generation"] = self._generation
         self._state["last_evolved"] = datetime.now().isoformat()
         self._state["total_evolutions"] = self._state.get("total_evolutions", 0) + 1
+        self._persist()
 
+    def _persist(self) -> None:
+        """상태 파일 기록 (커서만 전진한 경우 revision·세대 정보는 그대로)."""
         _DATA_DIR.mkdir(parents=True, exist_ok=True)
-        _TUNING_STATE.write_text(
+        tmp = _TUNING_STATE.with_name(_TUNING_STATE.name + ".tmp")
+        tmp.write_text(
             json.dumps(self._state, ensure_ascii=False, indent=2),
             encoding="utf-8",
         )
+        os.replace(tmp, _TUNING_STATE)
 
     def _log_evolution(self, result: dict) -> None:
         # 현재 상태를 히스토리에 보존 (롤백용)
@@ -348,12 +430,7 @@ class EvolutionEngine:
         if len(history) > 20:
             history[:] = history[-20:]
 
-        try:
-            _TUNING_LOG.parent.mkdir(parents=True, exist_ok=True)
-            with open(_TUNING_LOG, "a", encoding="utf-8") as f:
-                f.write(json.dumps(result, ensure_ascii=False) + "\n")
-        except OSError:
-            pass
+        get_log_writer().append(_TUNING_LOG, result)
 
 
 # 전역 싱글턴
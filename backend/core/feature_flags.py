@@ -66,6 +66,11 @@ DEFAULTS: dict[str, dict[str, Any]] = {
         "description": "진화엔진이 이상감지 알림을 소비하여 시세 신뢰도 조정",
         "since": "0.4.0",
     },
+    "simulation_result_cache": {
+        "enabled": True,
+        "description": "동일 요청 시뮬레이션 결과 캐시 (시세·플래그·진화·검증설정 버전 기반 무효화)",
+        "since": "0.5.0",
+    },
 }
 
 
@@ -75,6 +80,7 @@ class FeatureFlags:
     def __init__(self, path: Path | None = None):
         self._path = path or _FLAGS_PATH
         self._flags: dict[str, dict[str, Any]] = {}
+        self._version = 0  # 런타임 변경 시 증가 (결과 캐시 무효화 기준)
         self._load()
 
     def _load(self) -> None:
@@ -108,9 +114,15 @@ class FeatureFlags:
             self._flags[flag] = {"enabled": enabled, "description": "", "since": "custom"}
         else:
             self._flags[flag]["enabled"] = enabled
+        self._version += 1
         self._save()
         logger.info("피처 플래그 변경: %s → %s", flag, enabled)
 
+    @property
+    def version(self) -> int:
+        """플래그 버전 (set_flag 호출마다 증가)."""
+        return self._version
+
     def get_all(self) -> dict[str, dict[str, Any]]:
         """전체 피처 플래그 목록."""
         return {k: dict(v) for k, v in self._flags.items()}
@@ -0,0 +1,220 @@
+"""
+공용 JSONL 로그 기록기 (배치 + 백그라운드 스레드).
+
+분석·검증·이상탐지·갱신 로그·진화·마이그레이션 모듈이 요청 처리 중에
+레코드마다 open/write/close를 반복하던 것을 한 곳으로 모은다.
+
+  - append(path, record): 메모리 버퍼에 넣고 즉시 반환 (직렬화도 기록 스레드에서)
+  - 기록 스레드: max_batch건이 모이거나 max_delay_s가 지나면 파일별로 묶어 한 번에 기록
+  - fsync 정책: "batch"(배치마다, 기본) | "always"(= batch 1건) | "never"(OS 버퍼에 맡김)
+  - flush(path=None): 지금까지 넣은 레코드를 동기적으로 기록 — 파일을 읽기 전에 호출
+  - after(path, fn): 그 전에 넣은 path 레코드가 모두 기록된 직후 기록 스레드에서 fn() 실행
+    (파일 오프셋과 맞물린 체크포인트를 이벤트 루프 밖에서 저장할 때)
+  - close(): 남은 레코드 기록 후 스레드 종료 (lifespan 종료 시)
+  - get_stats(): 대기 건수(큐 깊이), 배치 수, 기록 지연(평균·최대·p99) 등
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+FSYNC_POLICIES = ("batch", "always", "never")
+_BARRIER = object()   # 버퍼 항목의 default 자리에 두는 after() 표식
+
+
+class JsonlWriter:
+    """파일별 버퍼 + 단일 기록 스레드."""
+
+    def __init__(
+        self,
+        max_batch: int = 256,
+        max_delay_s: float = 0.2,
+        fsync: str = "batch",
+    ) -> None:
+        self._max_batch = 1 if fsync == "always" else max_batch
+        self._max_delay = max_delay_s
+        self._fsync = fsync if fsync in FSYNC_POLICIES else "batch"
+        self._pending: dict[Path, list[tuple[Any, Callable | None]]] = {}
+        self._depth = 0
+        self._oldest: float | None = None
+        self._lock = threading.Lock()          # 버퍼 보호
+        self._io_lock = threading.Lock()       # 파일 기록 직렬화
+        self._wake = threading.Condition(self._lock)
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self._latencies: deque[float] = deque(maxlen=512)
+        self._stats = {
+            "enqueued": 0, "written": 0, "batches": 0, "bytes": 0,
+            "fsyncs": 0, "errors": 0, "max_depth": 0,
+        }
+
+    # ── 입력 ──
+
+    def append(self, path: Path, record: Any, default: Callable | None = None) -> None:
+        """레코드 1건 예약. default는 json.dumps(default=...)에 전달."""
+        with self._lock:
+            closed = self._closed
+            if not closed:
+                self._pending.setdefault(Path(path), []).append((record, default))
+                self._depth += 1
+                self._stats["enqueued"] += default is not _BARRIER
+                self._stats["max_depth"] = max(self._stats["max_depth"], self._depth)
+                if self._oldest is None:
+                    self._oldest = time.monotonic()
+                if self._depth >= self._max_batch:
+                    self._wake.notify()
+        if closed:
+            with self._io_lock:
+                self._write({Path(path): [(record, default)]})
+            return
+        self._ensure_thread()
+
+    def after(self, path: Path, fn: Callable[[], None]) -> None:
+        """path에 먼저 넣은 레코드가 파일에 기록된 직후 fn() 실행 (이후 레코드는 아직 미기록).
+
+        fn은 기록 스레드(또는 flush를 호출한 스레드)에서 _io_lock을 쥔 채 실행된다.
+        """
+        self.append(path, fn, default=_BARRIER)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._closed or (self._thread is not None and self._thread.is_alive()):
+                    return
+                self._thread = threading.Thread(target=self._run, name="jsonl-writer", daemon=True)
+                self._thread.start()
+
+    # ── 기록 ──
+
+    def _take(self, path: Path | None = None) -> dict[Path, list]:
+        """버퍼를 꺼낸다 (lock 보유 상태에서 호출)."""
+        if path is None:
+            batch, self._pending = self._pending, {}
+        else:
+            path = Path(path)
+            batch = {path: self._pending.pop(path)} if path in self._pending else {}
+        taken = sum(len(v) for v in batch.values())
+        self._depth -= taken
+        if not self._pending:
+            self._oldest = None
+        return batch
+
+    def _write(self, batch: dict[Path, list]) -> None:
+        """파일별 묶음 기록 (_io_lock 보유 상태에서 호출)."""
+        if not batch:
+            return
+        t0 = time.perf_counter()
+        written = 0
+        for path, items in batch.items():
+            segment: list = []
+            for record, default in items:
+                if default is not _BARRIER:
+                    segment.append((record, default))
+                    continue
+                written += self._write_lines(path, segment)
+                segment = []
+                try:
+                    record()
+                except Exception as exc:
+                    logger.warning("JSONL 기록 후 작업 실패 (%s): %s", path.name, exc)
+            written += self._write_lines(path, segment)
+        self._stats["written"] += written
+        self._stats["batches"] += 1
+        self._latencies.append((time.perf_counter() - t0) * 1000)
+
+    def _write_lines(self, path: Path, items: list) -> int:
+        """한 파일에 레코드 묶음 append → 기록 건수."""
+        if not items:
+            return 0
+        try:
+            data = "".join(
+                json.dumps(record, ensure_ascii=False, default=default) + "\n"
+                for record, default in items
+            )
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(data)
+                if self._fsync != "never":
+                    f.flush()
+                    os.fsync(f.fileno())
+                    self._stats["fsyncs"] += 1
+            self._stats["bytes"] += len(data.encode("utf-8"))
+            return len(items)
+        except Exception as exc:
+            self._stats["errors"] += 1
+            logger.warning("JSONL 기록 실패 (%s, %d건): %s", path.name, len(items), exc)
+            return 0
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._closed and (
+                    self._depth < self._max_batch
+                    and (self._oldest is None or time.monotonic() - self._oldest < self._max_delay)
+                ):
+                    timeout = self._max_delay if self._oldest is None else max(
+                        self._max_delay - (time.monotonic() - self._oldest), 0.001,
+                    )
+                    self._wake.wait(timeout)
+                closed = self._closed
+            self.flush()
+            if closed:
+                return
+
+    def flush(self, path: Path | None = None) -> None:
+        """예약된 레코드를 호출 스레드에서 즉시 기록 (path 지정 시 해당 파일만).
+
+        버퍼 인출과 기록을 같은 _io_lock 구간에서 수행해 파일 내 순서를 보장한다.
+        """
+        with self._io_lock:
+            with self._lock:
+                batch = self._take(path)
+            self._write(batch)
+
+    def close(self) -> None:
+        """남은 레코드 기록 후 기록 스레드 종료. 이후 append는 즉시 기록."""
+        with self._lock:
+            self._closed = True
+            self._wake.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout=5.0)
+        self.flush()
+
+    # ── 관측 ──
+
+    def get_stats(self) -> dict:
+        latencies = sorted(self._latencies)
+        return {
+            "queue_depth": self._depth,
+            "fsync_policy": self._fsync,
+            "max_batch": self._max_batch,
+            "max_delay_s": self._max_delay,
+            **self._stats,
+            "write_latency_ms": {
+                "avg": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+                "p99": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))], 3)
+                if latencies else 0.0,
+                "max": round(latencies[-1], 3) if latencies else 0.0,
+            },
+        }
+
+
+# 싱글턴 인스턴스
+_writer: JsonlWriter | None = None
+
+
+def get_log_writer() -> JsonlWriter:
+    global _writer
+    if _writer is None:
+        _writer = JsonlWriter(fsync=os.getenv("JSONL_FSYNC", "batch"))
+    return _writer
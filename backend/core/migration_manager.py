@@ -18,6 +18,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Callable
 
+from core.log_writer import get_log_writer
+
 logger = logging.getLogger(__name__)
 
 _DATA_DIR = Path(__file__).resolve().parent.parent / "data"
@@ -135,15 +137,21 @@ class MigrationManager:
             "applied": applied,
         }
 
-    def migrate_all(self) -> dict[str, Any]:
-        """data/ 디렉토리의 모든 JSON 파일 마이그레이션."""
+    def migrate_all(self, on_progress: Callable[[float], None] | None = None) -> dict[str, Any]:
+        """data/ 디렉토리의 모든 JSON 파일 마이그레이션.
+
+        on_progress: 파일 1개 처리마다 진행률(0~1) 콜백 (작업 큐 진행률·취소 지점).
+        """
         results = {}
-        for json_file in _DATA_DIR.glob("*.json"):
+        files = sorted(_DATA_DIR.glob("*.json"))
+        for i, json_file in enumerate(files, 1):
             if json_file.name.endswith(".bak"):
                 continue
             result = self.migrate_file(json_file)
             if result.get("migrated") or result.get("reason") != "파일 없음":
                 results[json_file.name] = result
+            if on_progress is not None:
+                on_progress(i / len(files))
         return results
 
     def get_status(self) -> dict:
@@ -169,12 +177,7 @@ class MigrationManager:
             "success": success,
             "error": error,
         }
-        try:
-            _MIGRATION_LOG.parent.mkdir(parents=True, exist_ok=True)
-            with open(_MIGRATION_LOG, "a", encoding="utf-8") as f:
-                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
-        except OSError:
-            pass
+        get_log_writer().append(_MIGRATION_LOG, entry)
 
 
 # 전역 싱글턴
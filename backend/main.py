@@ -10,13 +10,20 @@ from fastapi.middleware.cors import CORSMiddleware
 from core.config import settings
 from core.versioning import VERSION, get_system_info, mark_started
 from core.feature_flags import get_feature_flags
-from api import weather, price, land, statistics, orchard, simulation, variety, trend, forecast, grading
+from api import weather, price, land, statistics, orchard, simulation, variety, trend, forecast, grading, jobs
 from services.data_refresher import data_refresher
 from services.anomaly_detector import get_anomaly_detector
 from services.health_monitor import get_health_monitor
 from services.data_quality import get_data_quality_scorer
 from services.usage_analytics import get_usage_analytics
+from services.simulation import get_scenario_table
+from services.simulation_analytics import get_analytics
+from services.simulation_cube import get_simulation_cube
+from services.critique_queue import get_critique_queue
+from services.job_queue import get_job_queue
+from services.model_registry import get_model_registry
 from core.evolution_engine import get_evolution_engine
+from core.log_writer import get_log_writer
 from core.experiment import get_experiment_manager
 from core.migration_manager import get_migration_manager
 
@@ -27,25 +34,37 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 
 _scheduler_task: asyncio.Task | None = None
+_cube_task: asyncio.Task | None = None
+_model_task: asyncio.Task | None = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """FastAPI lifespan — 시작/종료 시 DataRefresher 스케줄러 관리."""
-    global _scheduler_task
+    global _scheduler_task, _cube_task, _model_task
     mark_started()
+    get_scenario_table()  # 시나리오 테이블 선컴파일 (첫 시뮬레이션 지연 방지)
+    # 시뮬레이션 큐브: 저장 파일 메모리 매핑, 입력이 바뀌었으면 백그라운드 재구성
+    _cube_task = asyncio.create_task(get_simulation_cube().refresh())
+    # 수확량 ML 모델: 전 지역 선로드 (첫 전망 요청의 역직렬화 지연 방지)
+    _model_task = asyncio.create_task(asyncio.to_thread(get_model_registry().warm))
     logger.info("DataRefresher 백그라운드 스케줄러 기동")
     _scheduler_task = asyncio.create_task(data_refresher.run_scheduler())
     yield
     # shutdown
     logger.info("DataRefresher 스케줄러 종료 요청")
     data_refresher.stop()
+    await get_critique_queue().stop()
+    await get_job_queue().stop()
     if _scheduler_task and not _scheduler_task.done():
         _scheduler_task.cancel()
         try:
             await _scheduler_task
         except asyncio.CancelledError:
             pass
+    # 분석 체크포인트(다음 기동은 꼬리만 재생) → 예약된 JSONL 레코드 기록 후 기록 스레드 종료
+    get_analytics().checkpoint()
+    await asyncio.to_thread(get_log_writer().close)
     logger.info("DataRefresher 스케줄러 종료 완료")
 
 
@@ -75,6 +94,7 @@ app.include_router(variety.router)
 app.include_router(trend.router)
 app.include_router(forecast.router)
 app.include_router(grading.router)
+app.include_router(jobs.router)
 
 
 # ---------------------------------------------------------------------------
@@ -138,6 +158,12 @@ async def toggle_flag(flag: str, enabled: bool = True):
     return {"flag": flag, "enabled": enabled}
 
 
+@app.get("/api/system/log-writer")
+async def system_log_writer():
+    """공용 JSONL 기록기 상태 (큐 깊이, 배치 수, 기록 지연)."""
+    return get_log_writer().get_stats()
+
+
 # ---------------------------------------------------------------------------
 # Anomaly Detection (자율성 렌즈: 이상 감지)
 # ---------------------------------------------------------------------------
@@ -195,9 +221,15 @@ async def evolution_status():
 
 
 @app.post("/api/evolution/evolve")
-async def trigger_evolution():
-    """진화 사이클 1회 실행 (피드백 기반 파라미터 자동 보정)."""
-    return get_evolution_engine().evolve()
+async def trigger_evolution(wait: bool = False):
+    """진화 사이클 1회 실행 (피드백 기반 파라미터 자동 보정).
+
+    작업 큐에 제출하고 job 정보를 즉시 반환. wait=true면 진화 결과를 반환.
+
+    응답 형식 변경: 이전에는 항상 진화 결과를 반환했다. 결과 본문이 필요한
+    기존 클라이언트는 ?wait=true를 붙이거나 GET /api/jobs/{job_id}로 조회한다.
+    """
+    return await get_job_queue().dispatch("evolve", wait)
 
 
 @app.post("/api/evolution/rollback")
@@ -238,6 +270,10 @@ async def migration_status():
 
 
 @app.post("/api/migration/run")
-async def run_migration():
-    """전체 데이터 파일 마이그레이션 실행."""
-    return get_migration_manager().migrate_all()
+async def run_migration(wait: bool = False):
+    """전체 데이터 파일 마이그레이션 실행 (작업 큐, wait=true면 결과 반환).
+
+    응답 형식 변경: 이전에는 마이그레이션 결과를, 이제는 기본으로 job 정보를 반환한다.
+    기존 클라이언트는 ?wait=true를 붙이거나 GET /api/jobs/{job_id}로 조회한다.
+    """
+    return await get_job_queue().dispatch("migrate", wait)
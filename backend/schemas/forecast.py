@@ -18,6 +18,7 @@ class BloomPrediction(BaseModel):
     """개화·수확 예측."""
     variety: str
     bloom_date: str | None = None       # ISO date
+    full_bloom_date: str | None = None  # ISO date (만개)
     harvest_date: str | None = None     # ISO date
     gdd_at_bloom: float | None = None
     days_to_harvest: int | None = None
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from pydantic import BaseModel
+from typing import Literal
+
+from pydantic import BaseModel, Field
 
 
 class GradeDistribution(BaseModel):
@@ -90,6 +92,7 @@ class SimulationResponse(BaseModel):
     analytics_context: AnalyticsContext | None = None
     validation_notes: list[ValidationNote] | None = None
     refined: bool = False
+    critique_id: str | None = None  # 크로스모델 비평 조회 키 (GET /api/simulation/critique/{id})
     # Step 2: 시세 출처
     price_source: str | None = None  # "user_input" | "kamis_live" | "scenario_default"
     # Step 3: 설계 컨텍스트
@@ -105,11 +108,20 @@ class SimulationResponse(BaseModel):
 # 다중 시나리오 비교 (워크플로우 렌즈 L4)
 # ---------------------------------------------------------------------------
 
+class ScenarioModifier(BaseModel):
+    """사용자 정의 시나리오 — 기준 수확량·가격에 곱할 보정 계수."""
+    scenario: str
+    label: str
+    yield_factor: float = 1.0
+    price_factor: float = 1.0
+
+
 class CompareRequest(BaseModel):
     """다중 시나리오 비교 요청."""
     variety: str
     area_pyeong: float
     projection_years: int = 10
+    extra_scenarios: list[ScenarioModifier] = []  # 낙관/중립/비관 뒤에 추가
 
 
 class ScenarioResult(BaseModel):
@@ -133,3 +145,292 @@ class CompareResponse(BaseModel):
     area_pyeong: float
     scenarios: list[ScenarioResult]
     recommendation: str  # 종합 추천 메시지
+
+
+# ---------------------------------------------------------------------------
+# 배치 시뮬레이션 (야간 리포트용 다건 실행)
+# ---------------------------------------------------------------------------
+
+class SimulationBatchRequest(BaseModel):
+    """다건 시뮬레이션 요청."""
+    requests: list[SimulationRequest]
+
+
+class BatchCostItem(BaseModel):
+    """배치 응답의 비용 항목 헤더 (cost_amounts 열 순서)."""
+    category: str
+    name: str
+
+
+class BatchYearlyColumns(BaseModel):
+    """연도별 추이 열 — 행마다 projection_years 길이."""
+    yield_ratio: list[list[float]]
+    yield_kg: list[list[float]]
+    revenue: list[list[int]]
+    cost: list[list[int]]
+    profit: list[list[int]]
+
+
+class SimulationBatchResponse(BaseModel):
+    """다건 시뮬레이션 응답 (열 지향).
+
+    각 필드는 요청 순서의 배열이며, i번째 원소들은 requests[i]를 simulate()로
+    돌린 결과와 같다. 자가검증·보정은 적용하지 않는 원시 결과.
+    """
+    count: int
+    duration_ms: float
+    grade_labels: list[str]        # grade_ratios / grade_multipliers 열 순서
+    cost_items: list[BatchCostItem]
+    variety: list[str]
+    area_pyeong: list[float]
+    area_10a: list[float]
+    total_trees: list[int]
+    yield_per_10a: list[float]
+    price_per_kg: list[float]
+    price_source: list[str]
+    grade_ratios: list[list[float]]
+    grade_multipliers: list[list[float]]
+    annual_revenue: list[int]
+    annual_cost: list[int]
+    annual_profit: list[int]
+    income_ratio: list[float]
+    cost_amounts: list[list[int]]
+    yearly: BatchYearlyColumns
+    break_even_year: list[int]
+    roi_10year: list[float]
+    rootstock_id: list[str | None]
+    initial_investment: list[int]
+    seedling_cost: list[int]
+    infra_cost: list[int]
+    seedling_unit: list[int]
+    rootstock_used: list[str]
+    region_grade: list[str | None]
+    grade_impact: list[dict | None]
+
+
+# ---------------------------------------------------------------------------
+# 확률 시뮬레이션 (Monte Carlo)
+# ---------------------------------------------------------------------------
+
+class DistributionSpec(BaseModel):
+    """표본 추출 분포 지정.
+
+    dist: "normal" | "lognormal" | "uniform" | "triangular"
+    normal/lognormal은 center=평균, spread=표준편차.
+    uniform/triangular는 center±spread 구간 (triangular 최빈값 = center).
+    """
+    dist: str = "normal"
+    center: float = 1.0
+    spread: float = 0.1
+
+
+class MonteCarloRequest(SimulationRequest):
+    """Monte Carlo 시뮬레이션 요청 — 기본 입력 + 불확실성 분포."""
+    draws: int = 10000
+    seed: int | None = None
+    yield_dist: DistributionSpec = DistributionSpec(spread=0.15)        # 수확량 배수
+    price_dist: DistributionSpec = DistributionSpec(dist="lognormal", spread=0.20)  # 가격 배수
+    cost_inflation: DistributionSpec = DistributionSpec(center=0.03, spread=0.015)  # 연 비용 상승률
+    grade_concentration: float = 50.0  # 등급비율 Dirichlet 집중도 (0 이하 = 고정)
+
+
+class PercentileBand(BaseModel):
+    """분포 요약 (P10/P50/P90 + 평균)."""
+    p10: float
+    p50: float
+    p90: float
+    mean: float
+
+
+class MonteCarloYearBand(BaseModel):
+    """연차별 백분위 구간."""
+    year: int
+    yield_kg: PercentileBand
+    revenue: PercentileBand
+    cost: PercentileBand
+    profit: PercentileBand
+    cumulative_profit: PercentileBand
+
+
+class MonteCarloResponse(BaseModel):
+    """Monte Carlo 시뮬레이션 응답."""
+    variety: str
+    area_pyeong: float
+    draws: int
+    seed: int | None = None
+    yield_per_10a: float   # 기준값 (분포 중심)
+    price_per_kg: float
+    price_source: str
+    annual_revenue: PercentileBand
+    annual_profit: PercentileBand
+    income_ratio: PercentileBand
+    roi_10year: PercentileBand
+    break_even_year: PercentileBand
+    total_profit: PercentileBand           # 전망 기간 합계 이익
+    break_even_probability: float          # 기간 내 손익분기 도달 확률
+    loss_probability: float                # 기간 말 누적 손실 확률
+    yearly_projections: list[MonteCarloYearBand]
+    duration_ms: float = 0.0
+
+
+# ---------------------------------------------------------------------------
+# 민감도 분석 (토네이도 차트)
+# ---------------------------------------------------------------------------
+
+class SensitivityRequest(SimulationRequest):
+    """민감도 분석 요청 — 각 입력을 ±delta(비율)만큼 흔든다."""
+    delta: float = Field(0.10, gt=0, le=0.9)   # 하향 배수 1 - delta가 양수로 남도록 0.9 상한
+
+
+class TornadoBar(BaseModel):
+    """토네이도 막대 하나 (입력 축 × 지표)."""
+    axis: str            # "yield_per_10a" | "cost:농약 (살균+살충)" ...
+    label: str
+    category: str        # "수확" | "가격" | "면적" | "유통" | "생육" | "초기투자" | 비용 분류
+    base_value: float
+    low_value: float     # 입력 -delta
+    high_value: float    # 입력 +delta
+    low_result: float    # 입력 -delta 일 때 지표값
+    high_result: float
+    swing: float         # |high_result - low_result|
+
+
+class SensitivityBaseline(BaseModel):
+    annual_profit: int
+    roi_10year: float
+    break_even_year: int
+
+
+class SensitivityResponse(BaseModel):
+    """지표별 토네이도 데이터 (swing 내림차순)."""
+    variety: str
+    area_pyeong: float
+    delta: float
+    axes: int
+    baseline: SensitivityBaseline
+    annual_profit: list[TornadoBar]
+    roi_10year: list[TornadoBar]
+    break_even_year: list[TornadoBar]
+    duration_ms: float = 0.0
+
+
+# ---------------------------------------------------------------------------
+# 역산 (목표 지표 → 필요 입력값)
+# ---------------------------------------------------------------------------
+
+class SolveTarget(BaseModel):
+    """역산 목표 하나.
+
+    variable: "price_per_kg" | "yield_per_10a" | "area_pyeong"
+    metric: "annual_profit" | "income_ratio" | "roi_10year" | "total_profit" (>= target)
+            | "break_even_year" (target 연차 이내 손익분기)
+    """
+    variable: str
+    metric: str
+    target: float
+    lower: float | None = None   # 탐색 하한 (기본 0.01)
+    upper: float | None = None   # 탐색 상한 (기본 변수별 기준값 배수)
+
+
+class SolveRequest(SimulationRequest):
+    """역산 요청 — 기준 입력 + 목표 목록 (각 목표는 나머지 입력을 고정하고 변수 하나를 푼다)."""
+    targets: list[SolveTarget]
+
+
+class SolveResult(BaseModel):
+    variable: str
+    metric: str
+    target: float
+    feasible: bool
+    solution: float | None = None   # 목표를 만족하는 최소 변수값 (소수 2자리 올림)
+    achieved: float | None = None   # solution에서의 지표값
+    method: str                     # "closed_form" | "bracketing" | "unsupported"
+    reason: str | None = None
+
+
+class SolveResponse(BaseModel):
+    variety: str
+    area_pyeong: float
+    results: list[SolveResult]
+    kernel_calls: int
+    duration_ms: float = 0.0
+
+
+# ---------------------------------------------------------------------------
+# 식재 포트폴리오 최적화 (품종 × 대목 × 급지, 혼합 식재)
+# ---------------------------------------------------------------------------
+
+class OptimizeRequest(BaseModel):
+    """포트폴리오 최적화 요청."""
+    area_pyeong: float
+    budget: float | None = None            # 초기 투자 상한 (원)
+    region_id: str | None = None           # 지정 시 해당 지역 급지로 고정
+    region_grades: list[str] | None = None # 후보 급지 (기본: S/A/B/C 전체)
+    varieties: list[str] | None = None     # 후보 품종 (기본: SCENARIOS 전체)
+    rootstocks: list[str] | None = None    # 후보 대목 (기본: ROOTSTOCK_COSTS 전체)
+    price_per_kg: float | None = None
+    projection_years: int = Field(10, ge=1)
+    discount_rate: float = 0.04            # NPV 할인율
+    max_varieties: int = Field(2, ge=1, le=3)          # 혼합 식재 최대 품종 수
+    split_step: float = Field(0.25, ge=0.05, le=1.0)   # 면적 분할 단위
+    stress_yield: float = 0.80             # 하방 위험 시나리오 배수 (compare 비관과 동일)
+    stress_price: float = 0.75
+    objective: Literal["npv", "roi", "downside_npv"] = "npv"
+    top_n: int = Field(10, ge=1)
+
+
+class PlanComponent(BaseModel):
+    variety: str
+    rootstock_id: str
+    share: float
+    area_pyeong: float
+
+
+class PortfolioPlan(BaseModel):
+    region_grade: str | None = None
+    components: list[PlanComponent]
+    npv: int
+    downside_npv: int          # 하방 시나리오 NPV (위험 지표)
+    roi_10year: float
+    total_profit: int
+    initial_investment: int
+    break_even_year: int
+
+
+class OptimizeResponse(BaseModel):
+    area_pyeong: float
+    budget: float | None = None
+    objective: str
+    evaluated_plans: int
+    pruned_components: int     # 단독 초기투자가 예산을 넘어 조합 전에 제외된 (급지, 품종, 대목, 면적) 단위
+    feasible_plans: int        # 예산 이내
+    pareto_plans: int          # NPV·ROI·하방NPV 비지배 계획 수
+    plans: list[PortfolioPlan]
+    duration_ms: float = 0.0
+
+
+# ---------------------------------------------------------------------------
+# 슬라이더용 빠른 시뮬레이션 (사전 계산 큐브)
+# ---------------------------------------------------------------------------
+
+
+class QuickSimulationResponse(BaseModel):
+    """UI 슬라이더용 요약 결과. source = "cube"(보간) | "exact"(격자 밖 직접 계산)."""
+    variety: str
+    area_pyeong: float
+    price_per_kg: float
+    price_source: str
+    rootstock_id: str | None = None
+    region_grade: str | None = None
+    source: str
+    total_trees: int
+    annual_revenue: int
+    annual_cost: int
+    annual_profit: int
+    income_ratio: float
+    initial_investment: int
+    break_even_year: int
+    roi_10year: float
+    yearly_profit: list[int]
+    cumulative_profit: list[int]
+    duration_ms: float = 0.0
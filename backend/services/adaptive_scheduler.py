@@ -22,6 +22,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from core.log_writer import get_log_writer
+
 logger = logging.getLogger(__name__)
 
 LOG_PATH = Path(__file__).resolve().parent.parent / "data" / "refresh_log.jsonl"
@@ -42,6 +44,7 @@ RECENT_WINDOW = 10  # 최근 N건 분석
 
 def _load_recent_logs(source: str, window: int = RECENT_WINDOW) -> list[dict]:
     """refresh_log.jsonl에서 특정 source의 최근 N건 로드."""
+    get_log_writer().flush(LOG_PATH)
     if not LOG_PATH.exists():
         return []
     entries: list[dict] = []
@@ -148,12 +151,7 @@ class SchedulerLearner:
             self._outcomes[source] = self._outcomes[source][-20:]
 
         # 파일 기록
-        try:
-            OUTCOME_PATH.parent.mkdir(parents=True, exist_ok=True)
-            with OUTCOME_PATH.open("a", encoding="utf-8") as f:
-                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
-        except Exception:
-            pass
+        get_log_writer().append(OUTCOME_PATH, entry)
 
         # 5건 이상이면 학습
         if len(self._outcomes[source]) >= 5:
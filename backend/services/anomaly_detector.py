@@ -4,16 +4,21 @@
 - 가격: 전일 대비 ±20% 이상 변동
 - 날씨: 극단 기온 (영하 5도 이하, 38도 이상)
 - 날씨: 폭우 (시간당 30mm 이상)
+
+알림마다 프로세스 내 일련번호(seq)를 붙인다. 소비자는 (epoch, 마지막 seq)를
+커서로 보관하고 alerts_since()로 새 알림만 받는다 — 재기동하면 epoch가 바뀐다.
 """
 from __future__ import annotations
 
-import json
 import logging
+import time
 from collections import deque
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from core.log_writer import get_log_writer
+
 logger = logging.getLogger(__name__)
 
 _LOG_PATH = Path(__file__).resolve().parent.parent / "data" / "anomalies.jsonl"
@@ -34,6 +39,8 @@ class AnomalyDetector:
     def __init__(self, max_alerts: int = 200):
         self._alerts: deque[dict] = deque(maxlen=max_alerts)
         self._last_prices: dict[str, float] = {}  # 품종 → 최근 가격
+        self._seq = 0
+        self.epoch = f"{time.time_ns():x}"  # seq 유효 범위 (프로세스 기동 단위)
 
     # ------------------------------------------------------------------
     # 가격 이상 감지
@@ -110,6 +117,23 @@ class AnomalyDetector:
             items = [a for a in items if a["category"] == category]
         return items[-limit:]
 
+    def alerts_since(self, seq: int) -> tuple[list[dict], int]:
+        """seq 이후 알림 → (알림 목록, 링에서 밀려나 놓친 건수)."""
+        if self._seq <= seq:
+            return [], 0
+        new = []
+        for a in reversed(self._alerts):  # 최신부터 — 새 알림 수만큼만 순회
+            if a["seq"] <= seq:
+                break
+            new.append(a)
+        new.reverse()
+        missed = (new[0]["seq"] - seq - 1) if new else self._seq - seq
+        return new, missed
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
     def get_stats(self) -> dict:
         """알림 통계."""
         total = len(self._alerts)
@@ -130,7 +154,9 @@ class AnomalyDetector:
     # ------------------------------------------------------------------
     def _make_alert(self, category: str, severity: str,
                     message: str, data: dict[str, Any]) -> dict:
+        self._seq += 1
         alert = {
+            "seq": self._seq,
             "timestamp": datetime.now().isoformat(),
             "category": category,
             "severity": severity,
@@ -145,12 +171,7 @@ class AnomalyDetector:
         return alert
 
     def _log(self, alert: dict) -> None:
-        try:
-            _LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-            with open(_LOG_PATH, "a", encoding="utf-8") as f:
-                f.write(json.dumps(alert, ensure_ascii=False) + "\n")
-        except OSError:
-            pass
+        get_log_writer().append(_LOG_PATH, alert)
 
 
 # 전역 싱글턴
@@ -16,6 +16,7 @@ from pathlib import Path
 import httpx
 
 from core.config import settings
+from services.gdd_calculator import ClimateSeries
 
 logger = logging.getLogger(__name__)
 
@@ -111,6 +112,18 @@ class ClimateCollector:
 
     def __init__(self) -> None:
         self._client: httpx.AsyncClient | None = None
+        # (region_id, year) → (원본 일별 데이터, 열 단위 시리즈)
+        self._series: dict[tuple[str, int], tuple[list[dict], ClimateSeries]] = {}
+        # (region_id, year) → 기후 데이터 버전 (신규 ASOS 수집·데이터 변경 시 증가)
+        self._versions: dict[tuple[str, int], int] = {}
+
+    def climate_version(self, region_id: str, year: int) -> int:
+        """(지역, 연도) 기후 데이터 버전 — 결과 캐시 키에 사용."""
+        return self._versions.get((region_id, year), 0)
+
+    def _bump_version(self, region_id: str, year: int) -> None:
+        key = (region_id, year)
+        self._versions[key] = self._versions.get(key, 0) + 1
 
     async def _get_client(self) -> httpx.AsyncClient:
         if self._client is None or self._client.is_closed:
@@ -191,6 +204,7 @@ class ClimateCollector:
 
             if result:
                 _save_cache(stn_id, year, result)
+                self._bump_version(region_id, year)
                 return result
 
         except Exception as e:
@@ -198,6 +212,23 @@ class ClimateCollector:
 
         return self._generate_mock_daily(region_id, year)
 
+    async def fetch_climate_series(self, region_id: str, year: int) -> ClimateSeries:
+        """ASOS 일별 데이터의 ClimateSeries — (지역, 연도)당 한 번 생성해 재사용.
+
+        원본 일별 데이터가 바뀌면 (신규 관측일 추가, mock → ASOS 전환) 다시 만들고
+        기후 데이터 버전을 올린다.
+        """
+        daily = await self.fetch_asos_daily(region_id, year)
+        key = (region_id, year)
+        cached = self._series.get(key)
+        if cached is not None:
+            if cached[0] == daily:
+                return cached[1]
+            self._bump_version(region_id, year)
+        series = ClimateSeries.from_daily(daily)
+        self._series[key] = (daily, series)
+        return series
+
     # ------------------------------------------------------------------
     # KOSIS 사과 생산량 데이터
     # ------------------------------------------------------------------
@@ -0,0 +1,311 @@
+"""
+크로스모델 비평 큐 (Generator-Reviewer R62 비동기화).
+
+검증 노트가 있을 때 GPT 리뷰를 받아 붙이던 동기 호출은 /api/simulation/run 핸들러 안에서
+이벤트 루프를 수백 ms 막았다. 비평은 백그라운드 워커 큐에서 처리한다.
+
+  - 워커 수 제한(동시 호출 상한) + 호출별 타임아웃
+  - 캐시 키: 노트(심각도·필드·메시지) + 반올림한 결과 요약의 해시
+  - 캐시 적중 → 응답에 비평 노트를 바로 포함
+  - 미적중 → 큐에 넣고 critique_id만 응답, GET /api/simulation/critique/{id}로 나중에 조회
+
+클라이언트 선택 (환경변수 CRITIQUE_CLIENT):
+  "openai" — OPENAI_API_KEY가 있고 openai 패키지가 설치된 경우 (기본)
+  "stub"   — 오프라인 부하 테스트용 로컬 스텁 (지연·실패율 조절)
+  "off"    — 비평 비활성
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Protocol
+
+from schemas.simulation import SimulationResponse, ValidationNote
+
+logger = logging.getLogger(__name__)
+
+_SYSTEM_PROMPT = (
+    "사과 농장 시뮬레이션 검증 리뷰어. "
+    "비현실적 수치 조합 감지, 도메인 상식 위반 체크. "
+    "한국어, 2문장 이내로 핵심만."
+)
+
+
+class CritiqueClient(Protocol):
+    def critique(self, summary: str, issues: str) -> str | None: ...
+
+
+class OpenAICritiqueClient:
+    """GPT-4o-mini 독립 리뷰 (워커 스레드에서 호출)."""
+
+    def __init__(self, api_key: str, timeout_s: float) -> None:
+        import openai
+        self._client = openai.OpenAI(api_key=api_key, timeout=timeout_s, max_retries=0)
+
+    def critique(self, summary: str, issues: str) -> str | None:
+        resp = self._client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": _SYSTEM_PROMPT},
+                {"role": "user", "content": f"시뮬레이션: {summary}\n검증이슈: {issues}"},
+            ],
+            max_tokens=150,
+            temperature=0.3,
+        )
+        return resp.choices[0].message.content.strip()
+
+
+class StubCritiqueClient:
+    """오프라인 스텁 — 지연·실패율을 흉내 내고 결정적인 문장을 돌려준다."""
+
+    def __init__(self, latency_s: float = 0.2, fail_rate: float = 0.0, seed: int = 0) -> None:
+        self.latency_s = latency_s
+        self.fail_rate = fail_rate
+        self.calls = 0
+        self._rng = random.Random(seed)
+
+    def critique(self, summary: str, issues: str) -> str | None:
+        self.calls += 1
+        time.sleep(self.latency_s)
+        if self._rng.random() < self.fail_rate:
+            raise RuntimeError("stub critique failure")
+        return f"[stub] {issues.count(';') + 1}건 검토 — {summary.split(',')[0]}"
+
+
+def _default_client(timeout_s: float) -> CritiqueClient | None:
+    mode = os.getenv("CRITIQUE_CLIENT", "openai").lower()
+    if mode == "stub":
+        return StubCritiqueClient()
+    if mode != "openai":
+        return None
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        return None
+    try:
+        return OpenAICritiqueClient(api_key, timeout_s)
+    except ImportError:
+        return None
+
+
+def _summary(result: SimulationResponse) -> str:
+    return (
+        f"면적={result.area_pyeong}평, 소득률={result.income_ratio:.1%}, "
+        f"ROI={result.roi_10year:.2f}, 손익분기={result.break_even_year}년, "
+        f"수확량={result.yield_per_10a}kg/10a, 가격={result.price_per_kg}원/kg"
+    )
+
+
+def critique_key(notes: list[ValidationNote], result: SimulationResponse) -> str:
+    """노트 + 반올림 요약 해시. 같은 이슈·비슷한 수치면 같은 비평을 재사용."""
+    parts = [f"{n.severity}|{n.field}|{n.message}" for n in notes]
+    parts.append(
+        f"{round(result.area_pyeong, -1)}|{round(result.income_ratio, 2)}|"
+        f"{round(result.roi_10year, 1)}|{result.break_even_year}|"
+        f"{round(result.yield_per_10a, -1)}|{round(result.price_per_kg, -1)}"
+    )
+    return hashlib.sha1("\n".join(parts).encode()).hexdigest()[:16]
+
+
+class CritiqueQueue:
+    """비평 작업 큐 + 결과 캐시 (LRU, 상태별 TTL)."""
+
+    def __init__(
+        self,
+        client: CritiqueClient | None = None,
+        concurrency: int = 2,
+        timeout_s: float = 5.0,
+        max_pending: int = 100,
+        max_entries: int = 1024,
+        ttl_seconds: float = 3600.0,
+        failure_ttl_seconds: float = 60.0,
+    ) -> None:
+        self._timeout = timeout_s
+        self._client = client if client is not None else _default_client(timeout_s)
+        self._concurrency = concurrency
+        self._max_pending = max_pending
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._failure_ttl = failure_ttl_seconds
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        # submit()은 워커 스레드(what-if 세션 계산)에서도 호출된다 → _entries·통계는 잠금 아래에서만
+        self._lock = threading.Lock()
+        self._queue: asyncio.Queue | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._workers: list[asyncio.Task] = []
+        self._in_flight = 0
+        self._stats = {
+            "submitted": 0, "cache_hits": 0, "completed": 0,
+            "failed": 0, "timeouts": 0, "dropped": 0, "max_in_flight": 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self._client is not None
+
+    # ── 워커 ──
+
+    def _ensure_workers(self) -> bool:
+        """현재 스레드의 이벤트 루프에서 워커 기동. 루프가 없으면 False."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return self._loop is not None and self._loop.is_running()
+        if self._loop is not loop or not self._workers:
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self._max_pending)
+            self._workers = [loop.create_task(self._worker()) for _ in range(self._concurrency)]
+        return True
+
+    async def _worker(self) -> None:
+        while True:
+            key, summary, issues = await self._queue.get()
+            with self._lock:
+                entry = self._entries.get(key)
+            t0 = time.perf_counter()
+            self._in_flight += 1
+            self._stats["max_in_flight"] = max(self._stats["max_in_flight"], self._in_flight)
+            try:
+                text = await asyncio.wait_for(
+                    asyncio.to_thread(self._client.critique, summary, issues), self._timeout,
+                )
+                status = "done" if text else "empty"
+                self._stats["completed"] += 1
+            except asyncio.TimeoutError:
+                text, status = None, "timeout"
+                self._stats["timeouts"] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(f"[cross-model] GPT critique failed: {exc}")
+                text, status = None, "failed"
+                self._stats["failed"] += 1
+            finally:
+                self._in_flight -= 1
+                self._queue.task_done()
+            if entry is not None:
+                with self._lock:
+                    entry.update(
+                        status=status, critique=text, finished=time.monotonic(),
+                        latency_ms=round((time.perf_counter() - t0) * 1000, 1),
+                    )
+
+    async def drain(self) -> None:
+        """대기 중인 작업이 모두 끝날 때까지 대기 (테스트·종료용)."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        for task in self._workers:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._workers = []
+
+    # ── 제출 / 조회 ──
+
+    def _live(self, key: str) -> dict | None:
+        """유효 항목 조회 (호출자가 self._lock 보유)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry["status"] != "pending":
+            ttl = self._ttl if entry["status"] == "done" else self._failure_ttl
+            if time.monotonic() - entry["finished"] > ttl:
+                del self._entries[key]
+                return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def submit(self, notes: list[ValidationNote], result: SimulationResponse) -> tuple[str | None, str | None]:
+        """(critique_id, 캐시된 비평). 비활성·노트 없음이면 (None, None).
+
+        이벤트 루프 밖(워커 스레드)에서 호출되면 기동된 루프로 넘겨 큐에 넣는다.
+        """
+        if not self.enabled or not notes:
+            return None, None
+        key = critique_key(notes, result)
+        with self._lock:
+            entry = self._live(key)
+            if entry is not None:
+                if entry["status"] == "done":
+                    self._stats["cache_hits"] += 1
+                    return key, entry["critique"]
+                return key, None  # 진행 중이거나 최근 실패 (failure TTL 동안 재시도 억제)
+
+            if not self._ensure_workers():
+                return None, None
+            self._entries[key] = {"status": "pending", "critique": None, "created": time.monotonic(),
+                                  "finished": 0.0, "latency_ms": None}
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+            self._stats["submitted"] += 1
+        item = (key, _summary(result), "; ".join(f"[{n.severity}] {n.field}: {n.message}" for n in notes))
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            try:
+                self._queue.put_nowait(item)
+            except asyncio.QueueFull:
+                self._drop(key)
+                return None, None
+        else:
+            self._loop.call_soon_threadsafe(self._put_or_drop, item)
+        return key, None
+
+    def _put_or_drop(self, item: tuple) -> None:
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self._drop(item[0])
+
+    def _drop(self, key: str) -> None:
+        with self._lock:
+            self._stats["dropped"] += 1
+            self._entries.pop(key, None)
+
+    def get(self, critique_id: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._live(critique_id)
+            if entry is None:
+                return None
+            return {
+                "critique_id": critique_id,
+                "status": entry["status"],
+                "critique": entry["critique"],
+                "latency_ms": entry["latency_ms"],
+            }
+
+    def get_stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "client": type(self._client).__name__ if self._client else None,
+            "concurrency": self._concurrency,
+            "timeout_s": self._timeout,
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+            "in_flight": self._in_flight,
+            "entries": len(self._entries),
+            **self._stats,
+        }
+
+
+# 싱글턴 인스턴스
+_queue: CritiqueQueue | None = None
+
+
+def get_critique_queue() -> CritiqueQueue:
+    global _queue
+    if _queue is None:
+        _queue = CritiqueQueue()
+    return _queue
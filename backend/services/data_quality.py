@@ -17,6 +17,8 @@ from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
+from core.log_writer import get_log_writer
+
 logger = logging.getLogger(__name__)
 
 _LOG_PATH = Path(__file__).resolve().parent.parent / "data" / "refresh_log.jsonl"
@@ -168,6 +170,7 @@ class DataQualityScorer:
 
     def _read_log(self, source: str, limit: int = 50) -> list[dict]:
         """refresh_log.jsonl에서 특정 소스 엔트리 읽기."""
+        get_log_writer().flush(_LOG_PATH)
         if not _LOG_PATH.exists():
             return []
         try:
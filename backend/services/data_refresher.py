@@ -21,6 +21,7 @@ from typing import Any
 import httpx
 
 from core.config import settings
+from core.log_writer import get_log_writer
 
 logger = logging.getLogger(__name__)
 
@@ -127,8 +128,7 @@ class DataRefresher:
     def _append_log(self, entry: dict[str, Any]) -> None:
         """refresh_log.jsonl 에 한 줄 추가."""
         try:
-            with LOG_PATH.open("a", encoding="utf-8") as f:
-                f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+            get_log_writer().append(LOG_PATH, entry, default=str)
         except Exception as exc:
             logger.error("refresh_log.jsonl 기록 실패: %s", exc)
 
@@ -551,9 +551,7 @@ class AutonomousRefreshDecisionEngine:
 
     def _log_decision(self, decision: dict[str, Any]) -> None:
         try:
-            self.DECISIONS_PATH.parent.mkdir(parents=True, exist_ok=True)
-            with self.DECISIONS_PATH.open("a", encoding="utf-8") as f:
-                f.write(json.dumps(decision, ensure_ascii=False) + "\n")
+            get_log_writer().append(self.DECISIONS_PATH, decision)
         except Exception as e:
             logger.warning("Failed to log autonomous decision: %s", e)
 
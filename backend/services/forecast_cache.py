@@ -0,0 +1,135 @@
+"""
+작황 전망 결과 캐시 (/api/forecast/annual · /variety-risk · /bloom 공유).
+
+세 엔드포인트는 모두 annual_forecast() 전체 결과(ASOS 조회, 월별 스코어, 개화 예측,
+품종 리스크, ML 예측)에서 일부만 잘라 쓴다. 결과를 (region_id, year, 기후 데이터 버전)
+키로 한 번만 계산해 공유한다.
+
+  - 지난 연도: 관측이 확정됐으므로 만료 없이 보관 (LRU 상한만 적용).
+    단, mock 데이터로 만든 결과(API 키 없음·일시적 ASOS 실패 폴백)는 올해와 같은 TTL을
+    적용해 만료 후 ASOS를 다시 시도한다
+  - 올해: 신규 ASOS 관측일이 수집되면 ClimateCollector 버전이 올라가 새 키로 재계산.
+    새 관측일은 조회 시점에만 들어오므로 TTL이 지나면 재계산해 확인한다
+  - 동시 미스: 같은 키의 계산은 하나만 실행하고 나머지는 그 결과를 기다린다 (single-flight)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import logging
+import time
+from collections import OrderedDict
+from datetime import date
+
+from services.climate_collector import get_climate_collector
+from services.yield_forecaster import annual_forecast
+
+logger = logging.getLogger(__name__)
+
+
+class ForecastCache:
+    """연간 전망 결과 LRU 캐시. 항목 = (생성 시각, 결과)."""
+
+    def __init__(self, max_entries: int = 256, current_year_ttl_seconds: float = 3600.0) -> None:
+        self._max = max_entries
+        self._ttl = current_year_ttl_seconds   # 올해 + mock 기반 결과
+        self._entries: OrderedDict[tuple[str, int, int], tuple[float, dict]] = OrderedDict()
+        self._inflight: dict[tuple[str, int, int], asyncio.Task] = {}
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    def _fresh(self, year: int, created: float, result: dict) -> bool:
+        permanent = year < date.today().year and result.get("data_source") != "mock"
+        return permanent or time.monotonic() - created <= self._ttl
+
+    async def annual(self, region_id: str, year: int | None = None) -> dict:
+        """annual_forecast() 결과 (캐시 적중 시 호출자가 수정해도 안전한 사본)."""
+        if year is None:
+            year = date.today().year
+        collector = get_climate_collector()
+        key = (region_id, year, collector.climate_version(region_id, year))
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if self._fresh(year, *entry):
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return copy.deepcopy(entry[1])
+            del self._entries[key]
+            self._expirations += 1
+
+        task = self._inflight.get(key)
+        if task is None:
+            self._misses += 1
+            task = asyncio.create_task(self._compute(region_id, year))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._inflight.pop(key, None))
+        else:
+            self._coalesced += 1
+        # shield: 한 호출자가 취소돼도 다른 대기자를 위한 계산은 계속한다
+        return copy.deepcopy(await asyncio.shield(task))
+
+    async def _compute(self, region_id: str, year: int) -> dict:
+        result = await annual_forecast(region_id, year)
+        # 계산 중 새 관측일이 수집됐다면 결과는 새 버전 데이터 기준 → 새 버전 키로 저장
+        version = get_climate_collector().climate_version(region_id, year)
+        self._store((region_id, year, version), result)
+        return result
+
+    def _store(self, key: tuple[str, int, int], result: dict) -> None:
+        region_id, year, version = key
+        stale = [k for k in self._entries if k[:2] == (region_id, year) and k[2] != version]
+        for k in stale:
+            del self._entries[k]
+        if stale:
+            self._invalidations += 1
+            logger.info("전망 캐시 무효화: %s %d 기후 데이터 v%d", region_id, year, version)
+        self._entries[key] = (time.monotonic(), result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def invalidate(self, region_id: str | None = None, year: int | None = None) -> int:
+        """조건에 맞는 항목 폐기 (None = 전체). 폐기 건수 반환."""
+        keys = [
+            k for k in self._entries
+            if (region_id is None or k[0] == region_id) and (year is None or k[1] == year)
+        ]
+        for k in keys:
+            del self._entries[k]
+        if keys:
+            self._invalidations += 1
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> dict:
+        lookups = self._hits + self._misses + self._coalesced
+        return {
+            "entries": len(self._entries),
+            "max_entries": self._max,
+            "current_year_ttl_seconds": self._ttl,
+            "inflight": len(self._inflight),
+            "hits": self._hits,
+            "misses": self._misses,
+            "coalesced": self._coalesced,
+            "hit_rate": round((self._hits + self._coalesced) / lookups, 3) if lookups else 0.0,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+            "invalidations": self._invalidations,
+        }
+
+
+# 싱글턴 인스턴스
+_cache = ForecastCache()
+
+
+def get_forecast_cache() -> ForecastCache:
+    return _cache
@@ -1,13 +1,20 @@
 """GDD (Growing Degree Days) 계산 모듈.
 
-순수 계산 함수만 포함 — 외부 의존성 없음.
+순수 계산 함수만 포함 — NumPy 외 외부 의존성 없음.
 사과 기준온도(Tbase) = 5°C.
+
+계산은 열 단위 ClimateSeries(최저·최고·강수 float 배열 + 월·연중일·서수 int 배열)
+위에서 벡터 연산으로 수행한다. 날짜 문자열은 시리즈 생성 시 한 번만 파싱한다.
+list[DailyClimate]를 받는 기존 API는 시리즈로 변환해 위임하는 어댑터다.
 """
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import date, timedelta
-from typing import TypedDict
+from typing import Sequence, TypedDict, Union
+
+import numpy as np
 
 TBASE = 5.0  # 사과 기준온도 (°C)
 
@@ -65,35 +72,161 @@ class DailyClimate(TypedDict):
     rainfall: float # 강수량 (mm)
 
 
+@dataclass(frozen=True, eq=False)
+class ClimateSeries:
+    """일별 기후 데이터의 열 단위 표현 (모든 배열 길이 = 일수, 입력 순서 유지).
+
+    날짜 파싱에 실패한 행은 month = doy = 0, ordinal = -1 — 월·날짜 조건에서는 빠지고
+    GDD 누적·서리일수에는 포함된다 (dict 기반 구현과 동일).
+    """
+    dates: tuple[str, ...]
+    min_ta: np.ndarray     # (D,) float64
+    max_ta: np.ndarray     # (D,) float64
+    rainfall: np.ndarray   # (D,) float64
+    month: np.ndarray      # (D,) int8 — 1~12
+    doy: np.ndarray        # (D,) int16 — 1~366
+    ordinal: np.ndarray    # (D,) int32 — date.toordinal()
+
+    @classmethod
+    def from_daily(cls, daily_data: Sequence[DailyClimate]) -> ClimateSeries:
+        """list[DailyClimate] → ClimateSeries (날짜 문자열 파싱은 여기서 한 번)."""
+        n = len(daily_data)
+        month = np.zeros(n, dtype=np.int8)
+        doy = np.zeros(n, dtype=np.int16)
+        ordinal = np.full(n, -1, dtype=np.int32)
+        for i, d in enumerate(daily_data):
+            try:
+                dd = date.fromisoformat(d["date"])
+            except (ValueError, TypeError):
+                continue
+            month[i] = dd.month
+            doy[i] = dd.timetuple().tm_yday
+            ordinal[i] = dd.toordinal()
+        return cls(
+            dates=tuple(d["date"] for d in daily_data),
+            min_ta=np.array([d["min_ta"] for d in daily_data], dtype=np.float64),
+            max_ta=np.array([d["max_ta"] for d in daily_data], dtype=np.float64),
+            rainfall=np.array([d["rainfall"] for d in daily_data], dtype=np.float64),
+            month=month,
+            doy=doy,
+            ordinal=ordinal,
+        )
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def month_mask(self, months: tuple[int, ...]) -> np.ndarray:
+        """해당 월에 속하는 행 (파싱 실패 행 제외)."""
+        return np.isin(self.month, months)
+
+    def daily_gdd(self, tbase: float = TBASE) -> np.ndarray:
+        """일별 GDD 배열."""
+        return np.maximum((self.max_ta + self.min_ta) / 2.0 - tbase, 0.0)
+
+    def cumulative_gdd(self, tbase: float = TBASE) -> np.ndarray:
+        """미반올림 누적 GDD 배열 (순차 누적 → 파이썬 루프 합계와 비트 단위 일치)."""
+        return np.cumsum(self.daily_gdd(tbase))
+
+
+ClimateData = Union[ClimateSeries, Sequence[DailyClimate]]
+
+
+def as_series(daily_data: ClimateData) -> ClimateSeries:
+    """ClimateSeries는 그대로, list[DailyClimate]는 변환해 반환."""
+    if isinstance(daily_data, ClimateSeries):
+        return daily_data
+    return ClimateSeries.from_daily(daily_data)
+
+
 def calc_daily_gdd(min_ta: float, max_ta: float, tbase: float = TBASE) -> float:
     """일별 GDD 계산: max(0, (max+min)/2 - Tbase)."""
     return max(0.0, (max_ta + min_ta) / 2.0 - tbase)
 
 
-def calc_accumulated_gdd(daily_data: list[DailyClimate], tbase: float = TBASE) -> list[float]:
+def calc_accumulated_gdd(daily_data: ClimateData, tbase: float = TBASE) -> list[float]:
     """누적 GDD 리스트 반환 (daily_data 순서대로)."""
-    accumulated: list[float] = []
-    total = 0.0
-    for d in daily_data:
-        total += calc_daily_gdd(d["min_ta"], d["max_ta"], tbase)
-        accumulated.append(round(total, 1))
-    return accumulated
+    return [round(v, 1) for v in as_series(daily_data).cumulative_gdd(tbase).tolist()]
+
+
+def _bloom_index(series: ClimateSeries, variety: str, tbase: float) -> int | None:
+    """누적 GDD가 품종 개화 임계값에 처음 도달한 행 인덱스 (미도달 None)."""
+    pheno = VARIETY_PHENOLOGY.get(variety, VARIETY_PHENOLOGY["fuji"])
+    idx = int(np.searchsorted(series.cumulative_gdd(tbase), pheno["bloom_gdd"], side="left"))
+    return idx if idx < len(series) else None
 
 
 def predict_bloom_date(
-    daily_data: list[DailyClimate],
+    daily_data: ClimateData,
     variety: str = "fuji",
     tbase: float = TBASE,
 ) -> str | None:
     """GDD 임계값 도달일 예측 → 개화 예상일 (ISO date string)."""
-    pheno = VARIETY_PHENOLOGY.get(variety, VARIETY_PHENOLOGY["fuji"])
-    bloom_threshold = pheno["bloom_gdd"]
-    total = 0.0
-    for d in daily_data:
-        total += calc_daily_gdd(d["min_ta"], d["max_ta"], tbase)
-        if total >= bloom_threshold:
-            return d["date"]
-    return None
+    series = as_series(daily_data)
+    idx = _bloom_index(series, variety, tbase)
+    return series.dates[idx] if idx is not None else None
+
+
+@dataclass(frozen=True, eq=False)
+class PhenologyContext:
+    """한 시리즈에 대한 전 품종 생육 단계 — 누적 GDD 곡선 1회 + searchsorted 1회.
+
+    품종별 개화·만개·수확일, 개화 시점 GDD, 개화기 서리일수를 모두 이 컨텍스트에서 읽는다.
+    비용이 품종 수와 무관하게 곡선 한 번에 묶인다. 개화 미도달 품종은 None / 0.
+    """
+    varieties: tuple[str, ...]
+    bloom_dates: tuple[str | None, ...]
+    full_bloom_dates: tuple[str | None, ...]
+    harvest_dates: tuple[str | None, ...]
+    gdd_at_bloom: tuple[float | None, ...]
+    bloom_frost_days: tuple[int, ...]
+
+    @classmethod
+    def build(
+        cls,
+        daily_data: ClimateData,
+        varieties: Sequence[str] | None = None,
+        tbase: float = TBASE,
+        window_days: int = 14,
+        threshold: float = 0.0,
+    ) -> PhenologyContext:
+        series = as_series(daily_data)
+        names = tuple(VARIETY_PHENOLOGY) if varieties is None else tuple(varieties)
+        phenos = [VARIETY_PHENOLOGY.get(v, VARIETY_PHENOLOGY["fuji"]) for v in names]
+        n_var, n_days = len(names), len(series)
+
+        cum = series.cumulative_gdd(tbase)
+        thresholds = np.array(
+            [p["bloom_gdd"] for p in phenos] + [p["full_bloom_gdd"] for p in phenos],
+            dtype=np.float64,
+        )
+        idx = np.searchsorted(cum, thresholds, side="left")
+        bloom_idx, full_idx = idx[:n_var], idx[n_var:]
+        bloomed = bloom_idx < n_days
+
+        # 개화일 서수 (미도달·날짜 파싱 실패 = -1) → 개화기 서리일수·수확일
+        bloom_ord = np.full(n_var, -1, dtype=np.int64)
+        if n_days:
+            bloom_ord = np.where(bloomed, series.ordinal[np.minimum(bloom_idx, n_days - 1)], -1)
+        in_window = np.abs(series.ordinal[:, None] - bloom_ord[None, :]) <= window_days
+        frosty = (series.ordinal >= 0) & (series.min_ta <= threshold)
+        bloom_frost = (in_window & frosty[:, None] & (bloom_ord >= 0)[None, :]).sum(axis=0)
+
+        def _date_at(i: int) -> str | None:
+            return series.dates[i] if i < n_days else None
+
+        return cls(
+            varieties=names,
+            bloom_dates=tuple(_date_at(i) for i in bloom_idx.tolist()),
+            full_bloom_dates=tuple(_date_at(i) for i in full_idx.tolist()),
+            harvest_dates=tuple(
+                date.fromordinal(o + p["days_bloom_to_harvest"]).isoformat() if o >= 0 else None
+                for o, p in zip(bloom_ord.tolist(), phenos)
+            ),
+            gdd_at_bloom=tuple(
+                round(float(cum[i]), 1) if i < n_days else None for i in bloom_idx.tolist()
+            ),
+            bloom_frost_days=tuple(bloom_frost.tolist()),
+        )
 
 
 def predict_harvest_date(bloom_date_str: str, variety: str = "fuji") -> str | None:
@@ -109,13 +242,13 @@ def predict_harvest_date(bloom_date_str: str, variety: str = "fuji") -> str | No
         return None
 
 
-def count_frost_days(daily_data: list[DailyClimate], threshold: float = 0.0) -> int:
+def count_frost_days(daily_data: ClimateData, threshold: float = 0.0) -> int:
     """최저기온이 threshold 이하인 날 수."""
-    return sum(1 for d in daily_data if d["min_ta"] <= threshold)
+    return int(np.count_nonzero(as_series(daily_data).min_ta <= threshold))
 
 
 def count_bloom_frost_days(
-    daily_data: list[DailyClimate],
+    daily_data: ClimateData,
     bloom_date_str: str | None,
     window_days: int = 14,
     threshold: float = 0.0,
@@ -124,81 +257,181 @@ def count_bloom_frost_days(
     if not bloom_date_str:
         return 0
     try:
-        bloom = date.fromisoformat(bloom_date_str)
+        bloom = date.fromisoformat(bloom_date_str).toordinal()
     except (ValueError, TypeError):
         return 0
 
-    start = bloom - timedelta(days=window_days)
-    end = bloom + timedelta(days=window_days)
-    count = 0
-    for d in daily_data:
-        try:
-            dd = date.fromisoformat(d["date"])
-        except (ValueError, TypeError):
-            continue
-        if start <= dd <= end and d["min_ta"] <= threshold:
-            count += 1
-    return count
+    series = as_series(daily_data)
+    in_window = (
+        (series.ordinal >= bloom - window_days)
+        & (series.ordinal <= bloom + window_days)
+    )
+    return int(np.count_nonzero(in_window & (series.min_ta <= threshold)))
 
 
 def count_heat_stress_days(
-    daily_data: list[DailyClimate],
+    daily_data: ClimateData,
     threshold: float = 33.0,
     months: tuple[int, ...] = (7, 8),
 ) -> int:
     """고온 스트레스 일수 (7~8월 최고기온 > threshold)."""
-    count = 0
-    for d in daily_data:
-        try:
-            dd = date.fromisoformat(d["date"])
-        except (ValueError, TypeError):
-            continue
-        if dd.month in months and d["max_ta"] > threshold:
-            count += 1
-    return count
+    series = as_series(daily_data)
+    return int(np.count_nonzero(series.month_mask(months) & (series.max_ta > threshold)))
+
+
+def _seqsum(values: np.ndarray) -> np.ndarray:
+    """마지막 축 순차 합계 (cumsum 끝값 → 파이썬 루프 합계와 비트 단위 일치, 0 패딩 영향 없음)."""
+    if values.shape[-1] == 0:
+        return np.zeros(values.shape[:-1], dtype=np.float64)
+    return np.cumsum(values, axis=-1)[..., -1]
 
 
 def calc_summer_rain_total(
-    daily_data: list[DailyClimate],
+    daily_data: ClimateData,
     months: tuple[int, ...] = (6, 7, 8),
 ) -> float:
     """여름철(6~8월) 총 강수량."""
-    total = 0.0
-    for d in daily_data:
-        try:
-            dd = date.fromisoformat(d["date"])
-        except (ValueError, TypeError):
-            continue
-        if dd.month in months:
-            total += d["rainfall"]
-    return round(total, 1)
-
-
-def calc_august_night_temp(daily_data: list[DailyClimate]) -> float | None:
+    series = as_series(daily_data)
+    return round(float(_seqsum(series.rainfall[series.month_mask(months)])), 1)
+
+
+def calc_august_night_temp(daily_data: ClimateData) -> float | None:
     """8월 평균 최저기온 (야간 기온 → 착색에 영향)."""
-    temps = []
-    for d in daily_data:
-        try:
-            dd = date.fromisoformat(d["date"])
-        except (ValueError, TypeError):
-            continue
-        if dd.month == 8:
-            temps.append(d["min_ta"])
-    return round(sum(temps) / len(temps), 1) if temps else None
-
-
-def extract_ml_features(daily_data: list[DailyClimate], variety: str = "fuji") -> dict:
-    """ML 학습/예측용 피처 딕셔너리 추출."""
-    bloom = predict_bloom_date(daily_data, variety)
-    gdd_list = calc_accumulated_gdd(daily_data)
-    total_gdd = gdd_list[-1] if gdd_list else 0.0
-
-    return {
-        "total_gdd": total_gdd,
-        "frost_days": count_frost_days(daily_data),
-        "bloom_frost_days": count_bloom_frost_days(daily_data, bloom),
-        "heat_stress_days": count_heat_stress_days(daily_data),
-        "summer_rain_mm": calc_summer_rain_total(daily_data),
-        "aug_night_temp": calc_august_night_temp(daily_data) or 20.0,
-        "bloom_date_doy": date.fromisoformat(bloom).timetuple().tm_yday if bloom else 110,
+    series = as_series(daily_data)
+    temps = series.min_ta[series.month == 8]
+    return round(float(_seqsum(temps)) / len(temps), 1) if len(temps) else None
+
+
+# ──────────────────────────────────────────────────────────────────────
+# ML 피처 커널
+# ──────────────────────────────────────────────────────────────────────
+
+ML_FEATURE_KEYS: tuple[str, ...] = (
+    "total_gdd", "frost_days", "bloom_frost_days",
+    "heat_stress_days", "summer_rain_mm", "aug_night_temp",
+    "bloom_date_doy",
+)
+_INT_FEATURES = frozenset({"frost_days", "bloom_frost_days", "heat_stress_days", "bloom_date_doy"})
+
+
+@dataclass(frozen=True, eq=False)
+class ClimateStack:
+    """연도 × 일 2차원 기후 배열 (Y, D). 짧은 연도는 뒤를 present=False로 채운다 (D ≥ 1)."""
+    min_ta: np.ndarray     # (Y, D) float64
+    max_ta: np.ndarray     # (Y, D) float64
+    rainfall: np.ndarray   # (Y, D) float64
+    month: np.ndarray      # (Y, D) int8 — 패딩·파싱 실패 = 0
+    doy: np.ndarray        # (Y, D) int16
+    ordinal: np.ndarray    # (Y, D) int32 — 패딩·파싱 실패 = -1
+    present: np.ndarray    # (Y, D) bool — 실제 관측 행 여부
+
+    @classmethod
+    def from_series(cls, data: Sequence[ClimateData]) -> ClimateStack:
+        """연도별 ClimateSeries(또는 list[DailyClimate]) 목록 → (Y, D) 스택."""
+        series = [as_series(d) for d in data]
+        width = max([1] + [len(s) for s in series])
+
+        def _pad(column: str, fill, dtype) -> np.ndarray:
+            out = np.full((len(series), width), fill, dtype=dtype)
+            for i, s in enumerate(series):
+                out[i, :len(s)] = getattr(s, column)
+            return out
+
+        present = np.zeros((len(series), width), dtype=bool)
+        for i, s in enumerate(series):
+            present[i, :len(s)] = True
+        return cls(
+            min_ta=_pad("min_ta", 0.0, np.float64),
+            max_ta=_pad("max_ta", 0.0, np.float64),
+            rainfall=_pad("rainfall", 0.0, np.float64),
+            month=_pad("month", 0, np.int8),
+            doy=_pad("doy", 0, np.int16),
+            ordinal=_pad("ordinal", -1, np.int32),
+            present=present,
+        )
+
+
+def ml_feature_tensor(
+    stack: ClimateStack,
+    varieties: Sequence[str] = ("fuji",),
+    tbase: float = TBASE,
+) -> np.ndarray:
+    """7개 ML 피처를 전 연도·전 품종에 대해 한 번에 계산 → (Y, V, 7) float64.
+
+    피처 순서 = ML_FEATURE_KEYS. 품종에 따라 달라지는 것은 개화일(개화기 서리일수,
+    개화 연중일)뿐이므로 누적 GDD 곡선은 연도당 한 번 만들고 품종 임계값을 일괄 비교한다.
+    반올림은 extract_ml_features와 같도록 호출 측에서 파이썬 round()로 한다.
+    """
+    n_years, width = stack.min_ta.shape
+    lengths = stack.present.sum(axis=1)                                    # (Y,)
+    thresholds = np.array(
+        [VARIETY_PHENOLOGY.get(v, VARIETY_PHENOLOGY["fuji"])["bloom_gdd"] for v in varieties],
+        dtype=np.float64,
+    )
+
+    gdd = np.where(stack.present, np.maximum((stack.max_ta + stack.min_ta) / 2.0 - tbase, 0.0), 0.0)
+    cum = np.cumsum(gdd, axis=1)                                           # (Y, D)
+    frost = stack.present & (stack.min_ta <= 0.0)
+
+    # 개화 인덱스 = 누적 GDD < 임계값인 날 수 (searchsorted left와 동일)
+    bloom_idx = (cum[:, :, None] < thresholds[None, None, :]).sum(axis=1)  # (Y, V)
+    rows = np.arange(n_years)[:, None]
+    safe_idx = np.minimum(bloom_idx, width - 1)
+    bloom_ord = stack.ordinal[rows, safe_idx]
+    bloomed = (bloom_idx < lengths[:, None]) & (bloom_ord >= 0)
+
+    window = np.abs(stack.ordinal[:, :, None] - bloom_ord[:, None, :]) <= 14
+    bloom_frost = (
+        window & (stack.ordinal[:, :, None] >= 0) & frost[:, :, None] & bloomed[:, None, :]
+    ).sum(axis=1)
+
+    summer = (stack.month >= 6) & (stack.month <= 8)
+    august = stack.month == 8
+    heat = ((stack.month == 7) | august) & (stack.max_ta > 33.0)
+    aug_days = august.sum(axis=1)
+    aug_sum = _seqsum(np.where(august, stack.min_ta, 0.0))
+
+    out = np.empty((n_years, len(varieties), len(ML_FEATURE_KEYS)), dtype=np.float64)
+    out[:, :, 0] = cum[:, -1][:, None]
+    out[:, :, 1] = frost.sum(axis=1)[:, None]
+    out[:, :, 2] = bloom_frost
+    out[:, :, 3] = heat.sum(axis=1)[:, None]
+    out[:, :, 4] = _seqsum(np.where(summer, stack.rainfall, 0.0))[:, None]
+    out[:, :, 5] = np.divide(
+        aug_sum, aug_days, out=np.full(n_years, np.nan), where=aug_days > 0,
+    )[:, None]
+    out[:, :, 6] = np.where(bloomed, stack.doy[rows, safe_idx], np.nan)
+    return out
+
+
+def _feature_dict(row: np.ndarray) -> dict:
+    """(7,) 피처 벡터 → extract_ml_features 형식 딕셔너리 (반올림·기본값 적용)."""
+    total_gdd, frost, bloom_frost, heat, rain, aug, bloom_doy = row.tolist()
+    values = {
+        "total_gdd": round(total_gdd, 1),
+        "frost_days": frost,
+        "bloom_frost_days": bloom_frost,
+        "heat_stress_days": heat,
+        "summer_rain_mm": round(rain, 1),
+        "aug_night_temp": (round(aug, 1) or 20.0) if aug == aug else 20.0,
+        "bloom_date_doy": bloom_doy if bloom_doy == bloom_doy else 110,
     }
+    return {k: int(v) if k in _INT_FEATURES else v for k, v in values.items()}
+
+
+def extract_ml_features(daily_data: ClimateData, variety: str = "fuji") -> dict:
+    """ML 학습/예측용 피처 딕셔너리 추출."""
+    return _feature_dict(ml_feature_tensor(ClimateStack.from_series([daily_data]), (variety,))[0, 0])
+
+
+def extract_ml_features_bulk(
+    data: Sequence[ClimateData] | ClimateStack,
+    varieties: Sequence[str] = ("fuji",),
+) -> list[dict[str, dict]]:
+    """여러 연도 × 여러 품종 피처를 한 번에 추출 → [{variety: 피처 딕셔너리}, ...] (연도 순)."""
+    stack = data if isinstance(data, ClimateStack) else ClimateStack.from_series(data)
+    tensor = ml_feature_tensor(stack, varieties)
+    return [
+        {v: _feature_dict(tensor[y, i]) for i, v in enumerate(varieties)}
+        for y in range(tensor.shape[0])
+    ]
@@ -16,6 +16,7 @@ from core.enums import OrchardGrade
 from schemas.grading import GradeFactorScore, GradeResult
 from services.climate_collector import get_climate_collector
 from services.gdd_calculator import (
+    ClimateSeries,
     DailyClimate,
     calc_accumulated_gdd,
     count_frost_days,
@@ -119,7 +120,7 @@ class OrchardGrader:
     def grade_region(self, region_id: str) -> GradeResult:
         """단일 지역 급지 평가 (기후 평년값 기반)."""
         normals = self._collector.get_climate_normals(region_id)
-        daily_data = self._normals_to_daily(normals)
+        daily_data = ClimateSeries.from_daily(self._normals_to_daily(normals))
 
         # 1. 연평균기온
         mean_temp = sum((n["min_ta"] + n["max_ta"]) / 2 for n in normals) / 12
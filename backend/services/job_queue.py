@@ -0,0 +1,422 @@
+"""
+백그라운드 작업 큐 (모델 학습·진화·마이그레이션·배치 실행).
+
+무거운 작업을 요청 핸들러 안에서 돌리던 것을 asyncio 워커가 관리하는 작업으로 옮긴다.
+핸들러는 job_id만 받아 즉시 응답하고, 상태·진행률은 GET /api/jobs/{id}로 조회한다.
+
+  - CPU 연산(RandomForest 학습, 배치 커널)은 프로세스 풀(spawn)에서 실행 → 다른 코어 사용
+  - 프로세스 내 싱글턴을 갱신하는 작업(진화, 마이그레이션)은 스레드에서 실행하고
+    종류별 잠금으로 한 번에 하나만 수행
+  - 중복 제거: 같은 종류·같은 파라미터의 작업이 아직 대기(queued) 중이면 새로 만들지 않고
+    그 작업을 돌려준다 (대기 작업은 시작 시점의 데이터를 보므로 병합해도 결과가 같다)
+  - 진행률·취소: JobContext가 파일(<id>.progress / <id>.cancel)로 주고받는다 → 워커 프로세스에도 전달
+    대기 중 취소는 즉시, 실행 중 취소는 다음 진행률 보고 시점에 JobCancelled
+  - 결과 영속화: data/jobs/<id>.json (제출·종료 시 기록, 재기동 후에도 조회)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import dataclasses
+import hashlib
+import importlib
+import json
+import logging
+import multiprocessing
+import os
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+_DATA_DIR = Path(__file__).resolve().parent.parent / "data" / "jobs"
+TERMINAL_STATUSES = ("done", "failed", "cancelled")
+
+
+class JobCancelled(BaseException):
+    """작업 취소. 작업 함수의 `except Exception` 폴백에 삼켜지지 않도록
+    asyncio.CancelledError처럼 BaseException을 상속한다."""
+
+
+@dataclass(frozen=True)
+class JobContext:
+    """진행률 보고 + 취소 확인 핸들 (on_progress 콜백으로 그대로 전달).
+
+    lo~hi: 하위 단계에 넘길 때 진행률 구간 (sub()).
+    """
+    job_id: str
+    directory: Path
+    lo: float = 0.0
+    hi: float = 1.0
+
+    def __call__(self, fraction: float, message: str = "") -> None:
+        self.check()
+        fraction = self.lo + (self.hi - self.lo) * min(max(fraction, 0.0), 1.0)
+        path = self.directory / f"{self.job_id}.progress"
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps({"progress": round(fraction, 4), "message": message},
+                                  ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def sub(self, lo: float, hi: float) -> JobContext:
+        span = self.hi - self.lo
+        return dataclasses.replace(self, lo=self.lo + span * lo, hi=self.lo + span * hi)
+
+    def cancelled(self) -> bool:
+        return (self.directory / f"{self.job_id}.cancel").exists()
+
+    def check(self) -> None:
+        if self.cancelled():
+            raise JobCancelled(self.job_id)
+
+
+@dataclass
+class Job:
+    job_id: str
+    kind: str
+    params: dict
+    key: str                      # 중복 제거 키 (종류 + 파라미터 해시)
+    status: str = "queued"        # queued | running | done | failed | cancelled
+    progress: float = 0.0
+    message: str = ""
+    created: float = field(default_factory=time.time)
+    started: float | None = None
+    finished: float | None = None
+    result: Any = None
+    error: str | None = None
+    cancel_requested: bool = False
+    merged: int = 0               # 병합된 중복 제출 수
+
+    def to_dict(self, include_result: bool = True) -> dict:
+        data = dataclasses.asdict(self)
+        data.pop("key")
+        if not include_result:
+            data.pop("result")
+        data["duration_ms"] = (
+            round((self.finished - self.started) * 1000, 1)
+            if self.started is not None and self.finished is not None else None
+        )
+        return data
+
+
+def _call(target: str, args: tuple) -> Any:
+    """프로세스 풀 진입점 — "모듈:함수"를 워커 프로세스에서 import해 호출."""
+    module, name = target.split(":")
+    return getattr(importlib.import_module(module), name)(*args)
+
+
+# ── 작업 종류 ──
+# runner(queue, ctx, **params) → 결과 (JSON 직렬화 가능). exclusive면 종류별로 하나씩 실행.
+
+async def _run_forecast_train(queue: JobQueue, ctx: JobContext,
+                              region_id: str, start_year: int, end_year: int) -> dict:
+    from services.climate_collector import get_climate_collector
+    from services.gdd_calculator import extract_ml_features_bulk
+
+    collector = get_climate_collector()
+    kosis_data = await collector.fetch_kosis_yield(start_year, end_year)
+    collect = ctx.sub(0.0, 0.2)
+    years = []
+    for i, record in enumerate(kosis_data, 1):
+        years.append(await collector.fetch_climate_series(region_id, record["year"]))
+        collect(i / len(kosis_data), "기상·수확량 데이터 수집")
+    # 전 연도 피처 행렬을 한 번에 계산
+    historical = [
+        {"features": features["fuji"], "yield_kg_per_10a": record["yield_kg_per_10a"]}
+        for record, features in zip(kosis_data, extract_ml_features_bulk(years))
+    ]
+    result = await queue.run_in_process(
+        "services.yield_forecaster:train_model", region_id, historical, ctx.sub(0.2, 1.0),
+    )
+    if result.get("success"):
+        # 새 모델 → 레지스트리 재로드 + 해당 지역 전망(ML 예측 포함) 재계산
+        from services.forecast_cache import get_forecast_cache
+        from services.model_registry import get_model_registry
+        get_model_registry().invalidate(region_id)
+        get_forecast_cache().invalidate(region_id)
+    return result
+
+
+async def _run_evolve(queue: JobQueue, ctx: JobContext) -> dict:
+    from core.evolution_engine import get_evolution_engine
+    return await asyncio.to_thread(get_evolution_engine().evolve)
+
+
+async def _run_migrate(queue: JobQueue, ctx: JobContext) -> dict:
+    from core.migration_manager import get_migration_manager
+    return await asyncio.to_thread(get_migration_manager().migrate_all, ctx)
+
+
+async def _run_simulation_batch(queue: JobQueue, ctx: JobContext, requests: list[dict]) -> dict:
+    from schemas.simulation import SimulationRequest
+    from services.simulation import prepare_batch
+
+    reqs = [SimulationRequest(**r) for r in requests]
+    inputs = await asyncio.to_thread(prepare_batch, reqs)
+    ctx(0.2, "입력 해석 완료")
+    return await queue.run_in_process("services.simulation:evaluate_batch", reqs, inputs)
+
+
+JOB_KINDS: dict[str, tuple[Callable, bool]] = {
+    "forecast_train": (_run_forecast_train, False),
+    "evolve": (_run_evolve, True),
+    "migrate": (_run_migrate, True),
+    "simulation_batch": (_run_simulation_batch, False),
+}
+
+
+class JobQueue:
+    """asyncio 워커 + 프로세스 풀 작업 큐 (이력은 최근 max_jobs건 보관)."""
+
+    def __init__(
+        self,
+        data_dir: Path | None = None,
+        concurrency: int | None = None,
+        process_workers: int | None = None,
+        max_jobs: int = 200,
+    ) -> None:
+        self._dir = data_dir or _DATA_DIR
+        self._concurrency = concurrency or max(2, os.cpu_count() or 1)
+        self._process_workers = process_workers or os.cpu_count() or 1
+        self._max_jobs = max_jobs
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._queued_keys: dict[str, str] = {}      # 중복 제거 키 → 대기 중 job_id
+        self._done_events: dict[str, asyncio.Event] = {}
+        self._kind_locks: dict[str, asyncio.Lock] = {}
+        self._queue: asyncio.Queue | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._workers: list[asyncio.Task] = []
+        self._pool: ProcessPoolExecutor | None = None
+        self._stats = {
+            "submitted": 0, "merged": 0, "done": 0, "failed": 0, "cancelled": 0,
+            "process_tasks": 0,
+        }
+        self._load()
+
+    # ── 적재 / 영속화 ──
+
+    def _load(self) -> None:
+        """이전 기동의 작업 기록 복원. 종료되지 못한 작업은 실패로 마감."""
+        if not self._dir.exists():
+            return
+        files = sorted(self._dir.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        for path in files[-self._max_jobs:]:
+            try:
+                job = Job(**json.loads(path.read_text(encoding="utf-8")))
+            except (json.JSONDecodeError, OSError, TypeError):
+                continue
+            if job.status not in TERMINAL_STATUSES:
+                job.status, job.error = "failed", "서버 재시작으로 중단"
+                job.finished = time.time()
+                self._save(job)
+            self._jobs[job.job_id] = job
+
+    def _save(self, job: Job) -> None:
+        self._dir.mkdir(parents=True, exist_ok=True)
+        path = self._dir / f"{job.job_id}.json"
+        tmp = path.with_name(path.name + ".tmp")
+        try:
+            tmp.write_text(json.dumps(dataclasses.asdict(job), ensure_ascii=False, default=str),
+                           encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError as exc:
+            logger.warning("작업 기록 저장 실패 (%s): %s", job.job_id, exc)
+
+    def _prune(self) -> None:
+        """보관 한도 초과분 중 종료된 오래된 작업부터 삭제."""
+        excess = len(self._jobs) - self._max_jobs
+        for job_id in [j for j, job in self._jobs.items() if job.status in TERMINAL_STATUSES][:max(excess, 0)]:
+            del self._jobs[job_id]
+            (self._dir / f"{job_id}.json").unlink(missing_ok=True)
+
+    # ── 워커 ──
+
+    def _ensure_workers(self) -> None:
+        loop = asyncio.get_running_loop()  # 이벤트 루프 밖 호출은 RuntimeError
+        if self._loop is not loop or not self._workers:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._done_events = {}
+            self._kind_locks = {}
+            self._workers = [loop.create_task(self._worker()) for _ in range(self._concurrency)]
+            for job in self._jobs.values():   # 다른 루프에서 대기하던 작업 재투입
+                if job.status == "queued":
+                    self._queue.put_nowait(job.job_id)
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = self._jobs.get(job_id)
+                if job is not None and job.status == "queued":
+                    await self._execute(job)
+            finally:
+                self._queue.task_done()
+
+    async def _execute(self, job: Job) -> None:
+        runner, exclusive = JOB_KINDS[job.kind]
+        lock = self._kind_locks.setdefault(job.kind, asyncio.Lock()) if exclusive else None
+        async with lock or contextlib.nullcontext():
+            if job.status != "queued":   # 잠금 대기 중 취소됨
+                return
+            if self._queued_keys.get(job.key) == job.job_id:
+                del self._queued_keys[job.key]
+            job.status, job.started = "running", time.time()
+            ctx = JobContext(job.job_id, self._dir)
+            try:
+                job.result = await runner(self, ctx, **job.params)
+                job.status = "done"
+            except JobCancelled:
+                job.status = "cancelled"
+            except asyncio.CancelledError:
+                job.status, job.error = "cancelled", "작업 큐 종료"
+                self._finish(job)
+                raise
+            except Exception as exc:
+                logger.warning("작업 실패 (%s %s): %s", job.kind, job.job_id, exc)
+                job.status, job.error = "failed", f"{type(exc).__name__}: {exc}"
+            self._finish(job)
+
+    def _finish(self, job: Job) -> None:
+        job.finished = time.time()
+        if job.status == "done":
+            job.progress = 1.0
+        self._stats[job.status] += 1
+        for suffix in (".progress", ".cancel"):
+            (self._dir / f"{job.job_id}{suffix}").unlink(missing_ok=True)
+        self._save(job)
+        event = self._done_events.pop(job.job_id, None)
+        if event is not None:
+            event.set()
+        self._prune()
+
+    async def run_in_process(self, target: str, *args: Any) -> Any:
+        """"모듈:함수"를 프로세스 풀에서 실행 (인자·결과는 pickle 가능해야 함)."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self._process_workers,
+                mp_context=multiprocessing.get_context("spawn"),  # 스레드 보유 프로세스 fork 회피
+            )
+        self._stats["process_tasks"] += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._pool, _call, target, args)
+        except BrokenProcessPool:
+            self._pool = None   # 워커 비정상 종료 → 다음 작업에서 새 풀
+            raise
+
+    async def stop(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        for task in self._workers:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._workers = []
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    # ── 제출 / 조회 / 취소 ──
+
+    def submit(self, kind: str, **params: Any) -> Job:
+        """작업 제출 (이벤트 루프 안에서 호출). 같은 작업이 대기 중이면 그 작업을 반환."""
+        if kind not in JOB_KINDS:
+            raise ValueError(f"알 수 없는 작업 종류: {kind}")
+        self._ensure_workers()
+        key = hashlib.sha1(
+            json.dumps([kind, params], sort_keys=True, ensure_ascii=False, default=str).encode()
+        ).hexdigest()
+        queued = self._jobs.get(self._queued_keys.get(key, ""))
+        if queued is not None and queued.status == "queued":
+            queued.merged += 1
+            self._stats["merged"] += 1
+            return queued
+
+        job = Job(job_id=uuid.uuid4().hex[:12], kind=kind, params=params, key=key)
+        self._jobs[job.job_id] = job
+        self._queued_keys[key] = job.job_id
+        self._stats["submitted"] += 1
+        self._save(job)
+        self._queue.put_nowait(job.job_id)
+        return job
+
+    async def dispatch(self, kind: str, wait: bool = False, **params: Any) -> dict:
+        """API 핸들러용 — 기본은 작업 정보를 즉시 반환, wait면 종료까지 기다려 결과를 반환.
+
+        wait인데 실패·취소로 끝나면 결과 대신 작업 정보(error 포함)를 반환한다.
+        """
+        job = self.submit(kind, **params)
+        if not wait:
+            return job.to_dict(include_result=False)
+        job = await self.wait(job.job_id)
+        return job.result if job.status == "done" else job.to_dict(include_result=False)
+
+    async def wait(self, job_id: str, timeout: float | None = None) -> Job | None:
+        """작업 종료까지 대기 (동기 응답이 필요한 호출용)."""
+        job = self._jobs.get(job_id)
+        if job is None or job.status in TERMINAL_STATUSES:
+            return job
+        event = self._done_events.setdefault(job_id, asyncio.Event())
+        await asyncio.wait_for(event.wait(), timeout)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        job = self._jobs.get(job_id)
+        if job is not None and job.status == "running":
+            with contextlib.suppress(OSError, json.JSONDecodeError):
+                data = json.loads((self._dir / f"{job_id}.progress").read_text(encoding="utf-8"))
+                job.progress, job.message = data["progress"], data["message"]
+        return job
+
+    def cancel(self, job_id: str) -> Job | None:
+        job = self._jobs.get(job_id)
+        if job is None or job.status in TERMINAL_STATUSES:
+            return job
+        job.cancel_requested = True
+        if job.status == "queued":
+            job.status = "cancelled"
+            if self._queued_keys.get(job.key) == job_id:
+                del self._queued_keys[job.key]
+            self._finish(job)
+        else:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            (self._dir / f"{job_id}.cancel").touch()
+        return job
+
+    def list_jobs(self, status: str | None = None, kind: str | None = None, limit: int = 20) -> list[dict]:
+        jobs = [
+            self.get(j.job_id) for j in reversed(self._jobs.values())
+            if (status is None or j.status == status) and (kind is None or j.kind == kind)
+        ]
+        return [j.to_dict(include_result=False) for j in jobs[:max(limit, 0)]]
+
+    def get_stats(self) -> dict:
+        by_status: dict[str, int] = {}
+        for job in self._jobs.values():
+            by_status[job.status] = by_status.get(job.status, 0) + 1
+        return {
+            "concurrency": self._concurrency,
+            "process_workers": self._process_workers,
+            "pool_started": self._pool is not None,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "kinds": list(JOB_KINDS),
+            "by_status": by_status,
+            **self._stats,
+        }
+
+
+# 싱글턴 인스턴스
+_queue: JobQueue | None = None
+
+
+def get_job_queue() -> JobQueue:
+    global _queue
+    if _queue is None:
+        _queue = JobQueue()
+    return _queue
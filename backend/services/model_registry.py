@@ -0,0 +1,209 @@
+"""
+수확량 RandomForest 모델 레지스트리 (Lv3 ML 예측).
+
+annual_forecast() 호출마다 yield_rf_{region_id}.pkl을 디스크에서 pickle.load하면
+100그루 포레스트를 매번 역직렬화한다. 모델은 지역별로 한 번만 로드해 LRU로 보관한다.
+
+무효화:
+  - 파일 (mtime, 크기)가 바뀌면 다시 로드 — stat은 recheck_seconds 간격으로만 확인
+  - invalidate(region_id): 학습 작업이 새 모델을 저장한 직후 호출 (버전 증가 → 즉시 재로드)
+
+서버 기동 시 warm()으로 전 지역 모델을 백그라운드 로드하고, 지역별 로드 시간·예측 지연·
+모델 크기를 기록한다 (GET /api/forecast/models).
+"""
+
+from __future__ import annotations
+
+import logging
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+MODEL_DIR = Path(__file__).parent.parent / "data" / "models"
+_PREFIX = "yield_rf_"
+
+
+@dataclass
+class _Entry:
+    model: Any
+    mtime_ns: int
+    size_bytes: int
+    version: int
+    checked: float          # 마지막 파일 stat 시각 (monotonic)
+
+
+@dataclass
+class _RegionStats:
+    loads: int = 0
+    last_load_ms: float = 0.0
+    total_load_ms: float = 0.0
+    predicts: int = 0
+    total_predict_ms: float = 0.0
+    max_predict_ms: float = 0.0
+    size_bytes: int = 0
+    n_estimators: int | None = None
+    tree_nodes: int | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "loads": self.loads,
+            "last_load_ms": round(self.last_load_ms, 2),
+            "avg_load_ms": round(self.total_load_ms / self.loads, 2) if self.loads else 0.0,
+            "predicts": self.predicts,
+            "avg_predict_ms": round(self.total_predict_ms / self.predicts, 3) if self.predicts else 0.0,
+            "max_predict_ms": round(self.max_predict_ms, 3),
+            "size_bytes": self.size_bytes,
+            "n_estimators": self.n_estimators,
+            "tree_nodes": self.tree_nodes,
+        }
+
+
+class ModelRegistry:
+    """지역별 모델 LRU 캐시 (스레드 안전 — warm()은 워커 스레드에서 실행)."""
+
+    def __init__(
+        self,
+        model_dir: Path = MODEL_DIR,
+        max_models: int = 16,
+        recheck_seconds: float = 30.0,
+    ) -> None:
+        self._dir = model_dir
+        self._max = max_models
+        self._recheck = recheck_seconds
+        self._lock = threading.Lock()
+        self._load_locks: dict[str, threading.Lock] = {}
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._versions: dict[str, int] = {}
+        self._stats: dict[str, _RegionStats] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def path(self, region_id: str) -> Path:
+        return self._dir / f"{_PREFIX}{region_id}.pkl"
+
+    def get(self, region_id: str) -> Any | None:
+        """지역 모델 (없으면 None). 캐시된 모델은 파일이 바뀌었을 때만 다시 로드."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(region_id)
+            version = self._versions.get(region_id, 0)
+            if entry is not None and entry.version == version and now - entry.checked < self._recheck:
+                self._entries.move_to_end(region_id)
+                self._hits += 1
+                return entry.model
+
+        path = self.path(region_id)
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            with self._lock:
+                self._entries.pop(region_id, None)
+            return None
+
+        # 같은 지역 동시 미스(기동 선로드 + 첫 요청)는 한 번만 로드
+        with self._lock:
+            load_lock = self._load_locks.setdefault(region_id, threading.Lock())
+        with load_lock:
+            with self._lock:
+                entry = self._entries.get(region_id)
+                if (
+                    entry is not None and entry.version == version
+                    and (entry.mtime_ns, entry.size_bytes) == (st.st_mtime_ns, st.st_size)
+                ):
+                    entry.checked = now
+                    self._entries.move_to_end(region_id)
+                    self._hits += 1
+                    return entry.model
+                self._misses += 1
+
+            # 로드는 전역 잠금 밖에서 (다른 지역 조회가 막히지 않도록)
+            started = time.perf_counter()
+            with open(path, "rb") as f:
+                model = pickle.load(f)
+            load_ms = (time.perf_counter() - started) * 1000
+
+            with self._lock:
+                self._entries[region_id] = _Entry(model, st.st_mtime_ns, st.st_size, version, now)
+                self._entries.move_to_end(region_id)
+                while len(self._entries) > self._max:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+                stats = self._stats.setdefault(region_id, _RegionStats())
+                stats.loads += 1
+                stats.last_load_ms = load_ms
+                stats.total_load_ms += load_ms
+                stats.size_bytes = st.st_size
+                estimators = getattr(model, "estimators_", None)
+                if estimators is not None:
+                    stats.n_estimators = len(estimators)
+                    stats.tree_nodes = sum(int(e.tree_.node_count) for e in estimators)
+        logger.info("모델 로드: %s (%.1f ms, %d bytes)", region_id, load_ms, st.st_size)
+        return model
+
+    def predict(self, region_id: str, X) -> float | None:
+        """단일 행 예측 (모델 없으면 None). 예측 지연을 지역별로 기록."""
+        model = self.get(region_id)
+        if model is None:
+            return None
+        started = time.perf_counter()
+        predicted = float(model.predict(X)[0])
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            stats = self._stats.setdefault(region_id, _RegionStats())
+            stats.predicts += 1
+            stats.total_predict_ms += elapsed_ms
+            stats.max_predict_ms = max(stats.max_predict_ms, elapsed_ms)
+        return predicted
+
+    def invalidate(self, region_id: str | None = None) -> None:
+        """모델 교체 알림 — 다음 조회에서 파일을 다시 로드한다 (None = 전체)."""
+        with self._lock:
+            regions = list(self._entries) if region_id is None else [region_id]
+            for r in regions:
+                self._versions[r] = self._versions.get(r, 0) + 1
+                self._entries.pop(r, None)
+
+    def warm(self) -> dict:
+        """모델 디렉터리의 전 지역 모델 선로드 (기동 시 백그라운드)."""
+        if not self._dir.exists():
+            return {"loaded": [], "failed": []}
+        regions = sorted(p.stem[len(_PREFIX):] for p in self._dir.glob(f"{_PREFIX}*.pkl"))
+        loaded, failed = [], []
+        for region_id in regions[:self._max]:
+            try:
+                if self.get(region_id) is not None:
+                    loaded.append(region_id)
+            except Exception as e:
+                logger.warning("모델 선로드 실패 (%s): %s", region_id, e)
+                failed.append(region_id)
+        logger.info("모델 선로드 완료: %d개 (실패 %d)", len(loaded), len(failed))
+        return {"loaded": loaded, "failed": failed}
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "loaded": list(self._entries),
+                "max_models": self._max,
+                "recheck_seconds": self._recheck,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "evictions": self._evictions,
+                "regions": {r: s.to_dict() for r, s in sorted(self._stats.items())},
+            }
+
+
+# 싱글턴 인스턴스
+_registry = ModelRegistry()
+
+
+def get_model_registry() -> ModelRegistry:
+    return _registry
@@ -21,6 +21,7 @@ class PriceCache:
         self._apple_price: float | None = None
         self._updated_at: datetime | None = None
         self._raw_items: list[dict] = []
+        self._version = 0  # 가격 변경 시 증가 (시뮬레이션 결과 캐시 무효화 기준)
 
     def update(self, items: list[dict]) -> int:
         """KAMIS 응답 아이템 목록으로 캐시 갱신.
@@ -49,7 +50,10 @@ class PriceCache:
             # 중앙값 사용 (이상치 영향 최소화)
             prices.sort()
             mid = len(prices) // 2
-            self._apple_price = prices[mid] if len(prices) % 2 else (prices[mid - 1] + prices[mid]) / 2
+            price = prices[mid] if len(prices) % 2 else (prices[mid - 1] + prices[mid]) / 2
+            if price != self._apple_price:
+                self._version += 1
+            self._apple_price = price
             self._updated_at = datetime.now(timezone.utc)
             logger.info("PriceCache 갱신: %.0f원/kg (%d건)", self._apple_price, len(prices))
 
@@ -59,12 +63,18 @@ class PriceCache:
         """현재 캐시된 사과 kg당 가격. 없으면 None."""
         return self._apple_price
 
+    @property
+    def version(self) -> int:
+        """가격 버전 (캐시된 가격이 바뀔 때마다 증가)."""
+        return self._version
+
     def get_status(self) -> dict[str, Any]:
         """캐시 상태 조회."""
         return {
             "apple_price": self._apple_price,
             "updated_at": self._updated_at.isoformat() if self._updated_at else None,
             "raw_count": len(self._raw_items),
+            "version": self._version,
         }
 
 
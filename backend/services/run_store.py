@@ -0,0 +1,425 @@
+"""
+시뮬레이션 실행 이력 컬럼 저장소 (NumPy 구조화 배열, 청크 단위 append-only).
+
+SimulationRunRecord 데이터클래스 링(최근 500건)은 고정 집계 몇 개만 답할 수 있었다.
+전체 실행 이력을 실행당 50바이트 고정 폭으로 보관하고 임의 그룹 집계를 벡터 연산으로 처리한다.
+
+  - 청크: 필드마다 (CHUNK_ROWS,) 하위 배열을 갖는 구조화 스칼라 1개 → 컬럼이 연속 메모리
+    (행 단위 구조화 배열은 컬럼을 읽을 때 50바이트 간격 복사가 필요)
+  - 가득 찬 청크는 불변 (저장 후 메모리 매핑으로 재사용)
+  - 품종은 코드(u2)로 저장, 코드표는 varieties
+  - 영속화: 체크포인트 시 save(dir) — 새로 가득 찬 청크는 한 번만, 작성 중 청크는 매번 기록
+  - query(): 품종·면적 구간·시간 구간·ROI 구간 그룹별 건수·평균·분위수
+    청크별로 그룹 키를 정렬해 두고(가득 찬 청크는 그룹 구성별로 캐시), 조회마다 작성 중
+    청크만 다시 묶은 뒤 청크 간 같은 그룹을 합친다
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+RUN_DTYPE = np.dtype([
+    ("timestamp", "f8"),
+    ("variety", "u2"),
+    ("area_pyeong", "f8"),
+    ("total_trees", "i4"),
+    ("projection_years", "i2"),
+    ("annual_profit", "i8"),
+    ("roi_10year", "f8"),
+    ("break_even_year", "i2"),
+    ("duration_ms", "f8"),
+])
+CHUNK_ROWS = 1 << 16
+
+
+def _chunk_dtype(rows: int) -> np.dtype:
+    return np.dtype([(name, RUN_DTYPE[name], (rows,)) for name in RUN_DTYPE.names])
+
+
+GROUP_KEYS = ("variety", "area", "time", "roi")
+METRICS = ("roi_10year", "area_pyeong", "break_even_year", "annual_profit", "duration_ms", "total_trees")
+AREA_EDGES = (300.0, 1000.0, 3000.0, 10000.0)   # 평
+ROI_EDGES = (0.0, 1.0, 2.0, 3.0)
+TIME_BUCKETS = {"hour": 3600, "day": 86400, "week": 7 * 86400, "month": None}
+_VARIETY_RADIX = 1 << 16       # 그룹 키 = 고정 기수 조합 (품종 u2, 시간 = 에포크 기준 버킷 번호)
+_TIME_RADIX = 1 << 32
+_GROUP_CACHE_SPECS = 4         # 청크별 그룹 인덱스를 캐시할 그룹 구성 수 (구성당 행마다 2바이트)
+
+
+def _band_labels(edges: tuple[float, ...]) -> list[str]:
+    fmt = [f"{e:g}" for e in edges]
+    return [f"<{fmt[0]}"] + [f"{a}-{b}" for a, b in zip(fmt, fmt[1:])] + [f"≥{fmt[-1]}"]
+
+
+def _time_label(bucket: int, kind: str) -> str:
+    if TIME_BUCKETS[kind] is None:
+        return str(np.datetime64(bucket, "M"))
+    fmt = "%Y-%m-%dT%H:00" if kind == "hour" else "%Y-%m-%d"
+    return datetime.fromtimestamp(bucket * TIME_BUCKETS[kind], tz=timezone.utc).strftime(fmt)
+
+
+def _time_codes(ts: np.ndarray, kind: str) -> np.ndarray:
+    """타임스탬프 → 에포크 기준 버킷 번호 (월은 일 → 월 변환표, 날짜 범위만큼만 datetime64 변환)."""
+    secs = np.maximum(ts, 0).astype(np.int64)
+    if TIME_BUCKETS[kind] is not None:
+        return secs // TIME_BUCKETS[kind]
+    days = secs // 86400
+    if not days.size:
+        return days
+    d0 = int(days.min())
+    span = np.arange(d0, int(days.max()) + 1)
+    return span.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)[days - d0]
+
+
+def _quantiles(values: np.ndarray, qs: list[float]) -> list[float]:
+    """np.quantile(method="linear")과 같은 값 — 필요한 순위만 partition (그룹별 호출 오버헤드 절감)."""
+    pos = [q * (values.shape[0] - 1) for q in qs]
+    ranks = sorted({int(p) for p in pos} | {min(int(p) + 1, values.shape[0] - 1) for p in pos})
+    part = np.partition(values, ranks)
+    out = []
+    for p in pos:
+        lo = int(p)
+        hi = min(lo + 1, values.shape[0] - 1)
+        out.append(float(part[lo] + (part[hi] - part[lo]) * (p - lo)))
+    return out
+
+
+class RunStore:
+    """청크 구조화 배열 저장소 (단일 기록자, 조회는 다른 스레드에서도 가능)."""
+
+    def __init__(self, chunk_rows: int = CHUNK_ROWS) -> None:
+        self._chunk_rows = chunk_rows
+        self._chunk_dtype = _chunk_dtype(chunk_rows)
+        self._chunks: list[np.ndarray] = []   # 0-d 구조화 배열 (필드 = 컬럼)
+        self._size = 0
+        self.varieties: list[str] = []
+        self._variety_codes: dict[str, int] = {}
+        self._saved_full = 0   # 파일로 저장된 가득 찬 청크 수
+        # 그룹 구성 → {청크 번호: (그룹 키, 건수, 그룹 순 행 인덱스)} — 가득 찬 청크만 (불변)
+        self._group_cache: OrderedDict[tuple, dict[int, tuple]] = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    # ── 기록 ──
+
+    def variety_code(self, variety: str) -> int:
+        code = self._variety_codes.get(variety)
+        if code is None:
+            code = self._variety_codes[variety] = len(self.varieties)
+            self.varieties.append(variety)
+        return code
+
+    def _slot(self) -> tuple[np.ndarray, int]:
+        i = self._size % self._chunk_rows
+        if i == 0:
+            self._chunks.append(np.zeros((), dtype=self._chunk_dtype))
+        return self._chunks[-1], i
+
+    def append(self, record) -> int:
+        """SimulationRunRecord 1건 → 행 인덱스."""
+        chunk, i = self._slot()
+        for name in RUN_DTYPE.names:
+            value = getattr(record, name)
+            chunk[name][i] = self.variety_code(value) if name == "variety" else value
+        self._size += 1
+        return self._size - 1
+
+    def extend(self, rows: np.ndarray) -> None:
+        """RUN_DTYPE 배열 일괄 추가 (variety는 variety_code()로 받은 코드)."""
+        rows = np.asarray(rows, dtype=RUN_DTYPE)
+        pos = 0
+        while pos < rows.shape[0]:
+            chunk, i = self._slot()
+            take = min(self._chunk_rows - i, rows.shape[0] - pos)
+            for name in RUN_DTYPE.names:
+                chunk[name][i:i + take] = rows[name][pos:pos + take]
+            self._size += take
+            pos += take
+
+    # ── 조회 ──
+
+    def value(self, name: str, index: int):
+        return self._chunks[index // self._chunk_rows][name][index % self._chunk_rows]
+
+    def column(self, name: str, start: int = 0, stop: int | None = None) -> np.ndarray:
+        """[start, stop) 구간 컬럼 (청크 경계를 넘으면 복사·연결)."""
+        stop = self._size if stop is None else min(stop, self._size)
+        if start >= stop:
+            return np.zeros(0, dtype=RUN_DTYPE[name])
+        c = self._chunk_rows
+        parts = [
+            self._chunks[k][name][max(start - k * c, 0):min(stop - k * c, c)]
+            for k in range(start // c, (stop - 1) // c + 1)
+        ]
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def tail(self, n: int) -> list[dict]:
+        """최근 n행 (품종 이름 복원)."""
+        start = max(self._size - n, 0)
+        cols = {name: self.column(name, start).tolist() for name in RUN_DTYPE.names}
+        cols["variety"] = [self.varieties[v] for v in cols["variety"]]
+        return [dict(zip(cols, values)) for values in zip(*cols.values())]
+
+    @property
+    def nbytes(self) -> int:
+        return self._size * RUN_DTYPE.itemsize
+
+    def get_stats(self) -> dict:
+        return {
+            "rows": self._size,
+            "chunks": len(self._chunks),
+            "chunk_rows": self._chunk_rows,
+            "bytes_per_run": RUN_DTYPE.itemsize,
+            "bytes": self.nbytes,
+            "varieties": len(self.varieties),
+        }
+
+    # ── 영속화 ──
+
+    def save(self, directory: Path, rows: int | None = None) -> dict:
+        """새로 가득 찬 청크 + 작성 중 청크 저장 → 체크포인트에 넣을 메타.
+
+        rows: 앞 rows행까지의 상태로 저장 (기본 전체). 기록자가 계속 append하는 동안
+        다른 스레드에서 저장할 때 — rows 이후 행은 메타에 들어가지 않아 load()가 무시한다.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        rows = self._size if rows is None else rows
+        n_full = rows // self._chunk_rows
+        pending = list(range(self._saved_full, n_full))
+        if rows % self._chunk_rows:
+            pending.append(n_full)
+        for k in pending:
+            path = directory / f"chunk_{k:05d}.npy"
+            tmp = path.with_name(path.name + ".tmp")
+            with open(tmp, "wb") as f:
+                np.save(f, self._chunks[k])
+            os.replace(tmp, path)
+        self._saved_full = n_full
+        return {"rows": rows, "chunk_rows": self._chunk_rows, "varieties": list(self.varieties)}
+
+    @classmethod
+    def load(cls, directory: Path, meta: dict) -> RunStore | None:
+        """저장된 청크 복원. 가득 찬 청크는 읽기 전용 메모리 매핑, 작성 중 청크는 복사.
+
+        작성 중 청크 파일에 메타 이후 행이 더 있으면(체크포인트 기록 도중 중단)
+        다음 append가 덮어쓴다.
+        """
+        store = cls(meta["chunk_rows"])
+        rows, c = meta["rows"], store._chunk_rows
+        try:
+            for k in range(-(-rows // c)):
+                full = rows - k * c >= c
+                data = np.load(directory / f"chunk_{k:05d}.npy", mmap_mode="r" if full else None)
+                if data.dtype != store._chunk_dtype or data.shape != ():
+                    return None
+                store._chunks.append(data)
+        except (OSError, ValueError):
+            return None
+        store._size = rows
+        store._saved_full = rows // c
+        for name in meta["varieties"]:
+            store.variety_code(name)
+        return store
+
+    # ── 그룹 집계 ──
+
+    def query(
+        self,
+        group_by: tuple[str, ...] = ("variety",),
+        metric: str = "roi_10year",
+        quantiles: tuple[float, ...] = (0.5, 0.9),
+        time_bucket: str = "day",
+        since: float | None = None,
+        until: float | None = None,
+        area_edges: tuple[float, ...] = AREA_EDGES,
+        roi_edges: tuple[float, ...] = ROI_EDGES,
+        limit: int = 1000,
+    ) -> dict:
+        """그룹별 건수·평균·분위수. 알 수 없는 키·지표·버킷, 범위 밖 분위수·limit은 ValueError."""
+        t0 = time.perf_counter()
+        unknown = [k for k in group_by if k not in GROUP_KEYS]
+        if unknown:
+            raise ValueError(f"알 수 없는 group_by: {', '.join(unknown)} (허용: {', '.join(GROUP_KEYS)})")
+        if metric not in METRICS:
+            raise ValueError(f"알 수 없는 metric: {metric} (허용: {', '.join(METRICS)})")
+        if time_bucket not in TIME_BUCKETS:
+            raise ValueError(f"알 수 없는 time_bucket: {time_bucket} (허용: {', '.join(TIME_BUCKETS)})")
+        if not quantiles or any(not 0.0 <= q <= 1.0 for q in quantiles):
+            raise ValueError("quantiles는 0~1 사이 값 1개 이상")
+        if limit < 1:
+            raise ValueError("limit은 1 이상")
+        keys = list(dict.fromkeys(group_by))
+        qs = sorted({float(q) for q in quantiles})
+        n = self._size
+        spec = (
+            tuple(keys),
+            time_bucket if "time" in keys else None,
+            tuple(area_edges) if "area" in keys else None,
+            tuple(roi_edges) if "roi" in keys else None,
+        )
+
+        # 청크별 (정렬된 그룹 키, 건수, 그룹 순 지표 값) — 가득 찬 청크의 그룹 인덱스는 캐시
+        key_parts, count_parts, value_parts = [], [], []
+        c = self._chunk_rows
+        for k in range(-(-n // c)):
+            stop = min(c, n - k * c)
+            chunk = self._chunks[k]
+            mask = None
+            if since is not None or until is not None:
+                ts = chunk["timestamp"][:stop]
+                mask = np.ones(stop, dtype=bool)
+                if since is not None:
+                    mask &= ts >= since
+                if until is not None:
+                    mask &= ts < until
+                if not mask.any():
+                    continue
+                if mask.all():
+                    mask = None
+            sealed = stop == c and mask is None
+            groups = self._cached_groups(spec, k) if sealed else None
+            if groups is None:
+                groups = self._chunk_groups(k, stop, mask, spec)
+                if sealed:
+                    self._cache_groups(spec, k, groups)
+            gkeys, counts, order = groups
+            column = chunk[metric][:stop]
+            key_parts.append(gkeys)
+            count_parts.append(counts)
+            value_parts.append(column if order is None else column[order])
+
+        values = (
+            np.concatenate(value_parts).astype(np.float64, copy=False)
+            if value_parts else np.zeros(0)
+        )
+        seg_keys = np.concatenate(key_parts) if key_parts else np.zeros(0, dtype=np.int64)
+        seg_counts = np.concatenate(count_parts) if count_parts else np.zeros(0, dtype=np.int64)
+
+        # 청크 간 같은 그룹 합치기: 구간(청크 × 그룹) → 그룹
+        present, seg_gid = np.unique(seg_keys, return_inverse=True)
+        n_groups = present.shape[0]
+        counts = np.bincount(seg_gid, weights=seg_counts, minlength=n_groups).astype(np.int64)
+        seg_start = np.cumsum(seg_counts) - seg_counts
+        seg_sums = np.add.reduceat(values, seg_start) if values.size else np.zeros(0)
+        sums = np.bincount(seg_gid, weights=seg_sums, minlength=n_groups)
+
+        # 분위수는 출력할 그룹만 (구간 1개면 그대로, 여러 청크에 걸치면 연결)
+        shown = min(limit, n_groups)
+        seg_order = np.argsort(seg_gid, kind="stable")
+        seg_bounds = np.concatenate([[0], np.cumsum(np.bincount(seg_gid, minlength=n_groups))]).tolist()
+        seg_start, seg_counts = seg_start.tolist(), seg_counts.tolist()
+        q_values = np.zeros((shown, len(qs)))
+        for j in range(shown):
+            segs = seg_order[seg_bounds[j]:seg_bounds[j + 1]].tolist()
+            if len(segs) == 1:
+                part = values[seg_start[segs[0]]:seg_start[segs[0]] + seg_counts[segs[0]]]
+            else:
+                part = np.concatenate([values[seg_start[i]:seg_start[i] + seg_counts[i]] for i in segs])
+            q_values[j] = _quantiles(part, qs)
+
+        radices, labels = self._key_codecs(spec)
+        groups = []
+        for j, g in enumerate(present[:shown].tolist()):
+            key, rest = {}, int(g)
+            for name, label, radix in zip(reversed(keys), reversed(labels), reversed(radices)):
+                rest, code = divmod(rest, radix)
+                key[name] = label(code)
+            groups.append({
+                "key": {name: key[name] for name in keys},
+                "count": int(counts[j]),
+                "mean": round(float(sums[j] / counts[j]), 4),
+                "quantiles": {f"p{round(q * 100, 1):g}": round(float(v), 4) for q, v in zip(qs, q_values[j])},
+            })
+
+        return {
+            "total_rows": n,
+            "matched_rows": int(values.shape[0]),
+            "group_by": keys,
+            "metric": metric,
+            "time_bucket": time_bucket if "time" in keys else None,
+            "group_count": int(n_groups),
+            "groups": groups,
+            "duration_ms": round((time.perf_counter() - t0) * 1000, 1),
+        }
+
+    def _key_codecs(self, spec: tuple) -> tuple[list[int], list]:
+        """그룹 구성 → 키별 (기수, 코드 → 라벨)."""
+        keys, time_bucket, area_edges, roi_edges = spec
+        radices, labels = [], []
+        for key in keys:
+            if key == "variety":
+                radices.append(_VARIETY_RADIX)
+                labels.append(self.varieties.__getitem__)
+            elif key in ("area", "roi"):
+                edges = area_edges if key == "area" else roi_edges
+                radices.append(len(edges) + 1)
+                labels.append(_band_labels(edges).__getitem__)
+            else:
+                radices.append(_TIME_RADIX)
+                labels.append(lambda c: _time_label(c, time_bucket))
+        return radices, labels
+
+    def _chunk_groups(self, k: int, stop: int, mask: np.ndarray | None, spec: tuple) -> tuple:
+        """청크 k의 [0, stop) 행 중 mask 선택 행 → (정렬된 그룹 키, 그룹별 건수, 그룹 순 행 인덱스).
+
+        행 인덱스는 이미 그룹 순이면 None(마스크 없을 때), 청크가 2^16행 이하면 uint16.
+        """
+        keys, time_bucket, area_edges, roi_edges = spec
+        chunk = self._chunks[k]
+        rows = None if mask is None else np.flatnonzero(mask)
+
+        def col(name: str) -> np.ndarray:
+            values = chunk[name][:stop]
+            return values if rows is None else values[rows]
+
+        size = stop if rows is None else rows.shape[0]
+        gid = np.zeros(size, dtype=np.int64)
+        for key, radix in zip(keys, self._key_codecs(spec)[0]):
+            if key == "variety":
+                code = col("variety")
+            elif key in ("area", "roi"):
+                source = col("area_pyeong" if key == "area" else "roi_10year")
+                code = np.zeros(size, dtype=np.int64)
+                for edge in (area_edges if key == "area" else roi_edges):
+                    code += source >= edge   # 구간 수가 적어 비교 누적이 searchsorted보다 빠름
+            else:
+                code = _time_codes(col("timestamp"), time_bucket)
+            gid *= radix
+            gid += code
+
+        # 시간만으로 묶으면 append 순서가 곧 그룹 순서 — 정렬 생략
+        if size < 2 or bool(np.all(gid[1:] >= gid[:-1])):
+            order = rows
+        else:
+            perm = np.argsort(gid, kind="stable")
+            gid = gid[perm]
+            order = perm if rows is None else rows[perm]
+        if order is not None and stop <= 1 << 16:
+            order = order.astype(np.uint16)
+        starts = np.flatnonzero(gid[1:] != gid[:-1]) + 1
+        bounds = np.concatenate([[0], starts, [size]]) if size else np.zeros(1, dtype=np.int64)
+        return gid[bounds[:-1]], np.diff(bounds), order
+
+    def _cached_groups(self, spec: tuple, k: int) -> tuple | None:
+        with self._cache_lock:
+            per_chunk = self._group_cache.get(spec)
+            if per_chunk is None:
+                return None
+            self._group_cache.move_to_end(spec)
+            return per_chunk.get(k)
+
+    def _cache_groups(self, spec: tuple, k: int, groups: tuple) -> None:
+        with self._cache_lock:
+            self._group_cache.setdefault(spec, {})[k] = groups
+            self._group_cache.move_to_end(spec)
+            while len(self._group_cache) > _GROUP_CACHE_SPECS:
+                self._group_cache.popitem(last=False)
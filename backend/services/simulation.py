@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from dataclasses import dataclass, replace
+
 from core.enums import CostCategory, AppleGrade, grade_tracker, cost_cat_tracker
 from schemas.simulation import (
     SimulationRequest,
@@ -137,6 +139,14 @@ YIELD_CURVE: dict[int, float] = {
     10: 1.0,
 }
 
+# 대목별 묘목비 + 인프라비 (원/그루, 원/10a)
+ROOTSTOCK_COSTS: dict[str, dict[str, int]] = {
+    "M9":      {"seedling": 25_000, "infra_per_10a": 2_000_000},
+    "M26":     {"seedling": 15_000, "infra_per_10a": 1_200_000},
+    "MM106":   {"seedling": 12_000, "infra_per_10a":   800_000},
+    "seedling": {"seedling": 8_000, "infra_per_10a":   500_000},
+}
+
 
 # ---------------------------------------------------------------------------
 # 급지 → 시뮬레이션 보정 (Step 4: Grade → Simulation)
@@ -195,70 +205,182 @@ def _apply_grade_adjustment(
 
 
 # ---------------------------------------------------------------------------
-# Public API
+# 컴파일된 시나리오 테이블 (simulate / simulate_batch 공용)
 # ---------------------------------------------------------------------------
 
 
-def simulate(req: SimulationRequest) -> SimulationResponse:
-    """수익 시뮬레이션을 계산한다.
+@dataclass
+class ScenarioTable:
+    """상수(SCENARIOS·COST_ITEMS·GRADE_MODIFIERS·ROOTSTOCK_COSTS)를 미리 펼친 배열.
 
-    품종/면적/수확량/가격을 입력받아 등급별 매출, 비용 내역,
-    연도별 추이(유목기 고려), 손익분기 연차를 산출한다.
+    축: V = 품종(SCENARIOS 키 순), R = 급지(0번 = 보정 없음, 이후 GRADE_MODIFIERS 키 순),
+    G = 과실 등급, K = 대목.
     """
-    scenario = SCENARIOS.get(req.variety, SCENARIOS["후지"])
+    varieties: dict[str, int]
+    region_grades: dict[str, int]
+    grade_labels: list[str]
+    grade_lists: list[list[list[dict]]]   # [v][r] 보정된 등급 dict (응답 조립용)
+    grade_ratios: np.ndarray             # (V, R, G)
+    grade_multipliers: np.ndarray        # (V, G)
+    grade_weights: np.ndarray            # (V, R, G) ratio × multiplier (합산은 가격을 곱한 뒤)
+    yield_factor: np.ndarray             # (R,)
+    cost_amounts: np.ndarray             # (C,) 10a당 항목별 비용
+    cost_total: int                        # 10a당 비용 합계
+    rootstocks: dict[str, int]
+    rootstock_costs: np.ndarray          # (K, 2) [묘목 단가, 10a당 인프라비]
+    default_rootstock: int                 # M26
+    version: tuple
 
-    # Yield SSOT: orchard.compute_yield_per_10a 사용 (사용자 오버라이드 > SSOT > 시나리오 폴백)
-    variety_id = VARIETY_NAME_TO_ID.get(req.variety, "fuji")
-    rootstock_id = getattr(req, "rootstock_id", None)
+
+_table: ScenarioTable | None = None
+_table_rebuilds = 0  # 명시적 재구성 요청 횟수 (상수 변경 시 rebuild_scenario_table 호출)
+
+
+def _table_version() -> tuple:
+    """테이블 유효성 기준: 명시적 재구성 횟수 + 진화 엔진 세대/리비전."""
+    try:
+        from core.evolution_engine import get_evolution_engine
+        engine = get_evolution_engine()
+        return (_table_rebuilds, engine.generation, engine.revision)
+    except Exception:
+        return (_table_rebuilds, 0, 0)
+
+
+def _compile_scenario_table(version: tuple) -> ScenarioTable:
+    import numpy as np
+
+    region_keys = [""] + list(GRADE_MODIFIERS)
+    grade_lists: list[list[list[dict]]] = []
+    weights: list[list[list[float]]] = []
+    for scenario in SCENARIOS.values():
+        rows = [scenario["grades"]]
+        for rg in GRADE_MODIFIERS:
+            _, adjusted, _ = _apply_grade_adjustment(scenario["yield_per_10a"], scenario["grades"], rg)
+            rows.append(adjusted)
+        grade_lists.append(rows)
+        weights.append([[g["ratio"] * g["multiplier"] for g in gl] for gl in rows])
+
+    return ScenarioTable(
+        varieties={name: i for i, name in enumerate(SCENARIOS)},
+        region_grades={rg: i for i, rg in enumerate(region_keys)},
+        grade_labels=[g["grade"] for g in SCENARIOS["후지"]["grades"]],
+        grade_lists=grade_lists,
+        grade_ratios=np.array(
+            [[[g["ratio"] for g in gl] for gl in rows] for rows in grade_lists], dtype=np.float64,
+        ),
+        grade_multipliers=np.array(
+            [[g["multiplier"] for g in rows[0]] for rows in grade_lists], dtype=np.float64,
+        ),
+        grade_weights=np.array(weights, dtype=np.float64),
+        yield_factor=np.array(
+            [1.0] + [m["yield_factor"] for m in GRADE_MODIFIERS.values()], dtype=np.float64,
+        ),
+        cost_amounts=np.array([c["amount"] for c in COST_ITEMS], dtype=np.int64),
+        cost_total=sum(c["amount"] for c in COST_ITEMS),
+        rootstocks={rs: i for i, rs in enumerate(ROOTSTOCK_COSTS)},
+        rootstock_costs=np.array(
+            [[c["seedling"], c["infra_per_10a"]] for c in ROOTSTOCK_COSTS.values()], dtype=np.int64,
+        ),
+        default_rootstock=list(ROOTSTOCK_COSTS).index("M26"),
+        version=version,
+    )
+
+
+def get_scenario_table() -> ScenarioTable:
+    """컴파일된 시나리오 테이블. 버전이 바뀐 경우에만 재구성."""
+    global _table
+    version = _table_version()
+    if _table is None or _table.version != version:
+        _table = _compile_scenario_table(version)
+    return _table
+
+
+def rebuild_scenario_table() -> ScenarioTable:
+    """상수 변경 후 호출 — 다음 조회 전에 테이블을 다시 만든다."""
+    global _table_rebuilds
+    _table_rebuilds += 1
+    return get_scenario_table()
+
+
+def _table_indices(table: ScenarioTable, variety: str, region_grade: str | None) -> tuple[int, int]:
+    """품종·급지 → 테이블 (v, r) 인덱스. 미등록 품종은 후지, 미정의 급지는 보정 없음."""
+    v = table.varieties.get(variety, table.varieties["후지"])
+    r = table.region_grades.get(region_grade or "", 0)
+    return v, r
+
+
+def _grade_adjusted_yield(
+    table: ScenarioTable, yield_per_10a: float, region_grade: str | None, r: int,
+) -> tuple[float, dict | None]:
+    """급지 수확량 보정 + grade_impact (_apply_grade_adjustment와 동일 산식)."""
+    if not r:
+        return yield_per_10a, None
+    mod = GRADE_MODIFIERS[region_grade]
+    adjusted_yield = round(yield_per_10a * mod["yield_factor"])
+    return adjusted_yield, {
+        "grade": region_grade,
+        "yield_factor": mod["yield_factor"],
+        "premium_shift": mod["premium_shift"],
+        "yield_before": yield_per_10a,
+        "yield_after": adjusted_yield,
+    }
+
+
+# ---------------------------------------------------------------------------
+# 입력 해석 (simulate / simulate_batch 공용)
+# ---------------------------------------------------------------------------
+
+
+def _resolve_base_yield(
+    req: SimulationRequest, scenario: dict, variety_id: str, rootstock_id: str | None,
+) -> float:
+    """수확량 결정: 사용자 오버라이드 > SSOT(orchard.compute_yield_per_10a) > 시나리오 폴백."""
     if req.yield_per_10a:
-        yield_per_10a = req.yield_per_10a
-    else:
-        try:
-            yield_per_10a = compute_yield_per_10a(variety_id, rootstock_id=rootstock_id)
-        except Exception:
-            yield_per_10a = scenario["yield_per_10a"]
+        return req.yield_per_10a
+    try:
+        return compute_yield_per_10a(variety_id, rootstock_id=rootstock_id)
+    except Exception:
+        return scenario["yield_per_10a"]
 
-    # 시세 우선순위: 사용자 입력 > KAMIS 실시간 > 시나리오 기본값
+
+def _resolve_price(
+    req: SimulationRequest, scenario: dict, live_price: float | None,
+) -> tuple[float, str]:
+    """시세 결정: 사용자 입력 > KAMIS 실시간 > 시나리오 기본값."""
     if req.price_per_kg:
-        price_per_kg = req.price_per_kg
-        price_source = "user_input"
-    else:
-        from services.price_cache import get_price_cache
-        live_price = get_price_cache().get_apple_price()
-        if live_price is not None:
-            price_per_kg = live_price
-            price_source = "kamis_live"
-        else:
-            price_per_kg = scenario["price_per_kg"]
-            price_source = "scenario_default"
-    area_m2 = req.area_pyeong * PYEONG_TO_M2
-    area_10a = area_m2 / 1000
+        return req.price_per_kg, "user_input"
+    if live_price is not None:
+        return live_price, "kamis_live"
+    return scenario["price_per_kg"], "scenario_default"
 
-    # 급지 보정 (Step 4): region_id → grade → 수확량·등급비율 조정
-    region_id = getattr(req, "region_id", None)
-    region_grade: str | None = None
-    grade_impact: dict | None = None
-
-    if region_id:
-        from core.feature_flags import get_feature_flags
-        if get_feature_flags().is_enabled("simulation_grade_adjustment"):
-            try:
-                from services.grading import get_orchard_grader
-                grade_result = get_orchard_grader().grade_region(region_id)
-                region_grade = grade_result.grade
-                yield_per_10a, adjusted_scenario_grades, grade_impact = (
-                    _apply_grade_adjustment(
-                        yield_per_10a, scenario["grades"], region_grade,
-                    )
-                )
-                if adjusted_scenario_grades:
-                    scenario = {**scenario, "grades": adjusted_scenario_grades}
-            except Exception:
-                pass  # 급지 조회 실패 시 기본값 유지
 
-    # 등급별 분포
+def _get_live_price() -> float | None:
+    from services.price_cache import get_price_cache
+    return get_price_cache().get_apple_price()
+
+
+def _lookup_region_grade(region_id: str | None) -> str | None:
+    """region_id → 급지 등급. 플래그 비활성·조회 실패 시 None."""
+    if not region_id:
+        return None
+    from core.feature_flags import get_feature_flags
+    if not get_feature_flags().is_enabled("simulation_grade_adjustment"):
+        return None
+    try:
+        from services.grading import get_orchard_grader
+        return get_orchard_grader().grade_region(region_id).grade
+    except Exception:
+        return None  # 급지 조회 실패 시 기본값 유지
+
+
+# ---------------------------------------------------------------------------
+# 산출 단계 (simulate / what-if 세션 공용)
+# ---------------------------------------------------------------------------
+
+
+def _grade_distribution(table: ScenarioTable, v: int, r: int) -> list[GradeDistribution]:
     grades = []
-    for g in scenario["grades"]:
+    for g in table.grade_lists[v][r]:
         # L4=5: 등급 사용 기록
         grade_tracker.record(g["grade"])
         grades.append(GradeDistribution(
@@ -266,16 +388,22 @@ def simulate(req: SimulationRequest) -> SimulationResponse:
             ratio=g["ratio"],
             price_multiplier=g["multiplier"],
         ))
+    return grades
 
-    # 연간 매출 (성목 기준, 농가 수취가 적용)
+
+def _revenue_stage(
+    table: ScenarioTable, v: int, r: int, yield_per_10a: float, price_per_kg: float, area_10a: float,
+) -> tuple[float, float, int]:
+    """(총수확량, 농가 수취 가중 단가, 연간 매출)."""
     total_yield = yield_per_10a * area_10a
     weighted_price = sum(
-        g["ratio"] * g["multiplier"] * price_per_kg
-        for g in scenario["grades"]
-    ) * FARM_GATE_RATIO  # 경매가 → 농가 수취가
-    annual_revenue = int(total_yield * weighted_price)
+        w * price_per_kg for w in table.grade_weights[v, r].tolist()
+    ) * FARM_GATE_RATIO  # 경매가 → 농가 수취가 (등급별 합산 후 비율 적용, 정수 절사 경계 유지)
+    return total_yield, weighted_price, int(total_yield * weighted_price)
 
-    # 연간 비용
+
+def _cost_stage(table: ScenarioTable, area_10a: float) -> tuple[list[CostBreakdown], int]:
+    """(항목별 비용, 연간 비용)."""
     cost_breakdown = []
     for c in COST_ITEMS:
         # L4=5: 비용 분류 사용 기록
@@ -285,37 +413,42 @@ def simulate(req: SimulationRequest) -> SimulationResponse:
             name=c["name"],
             amount=int(c["amount"] * area_10a),
         ))
-    annual_cost = int(sum(c["amount"] for c in COST_ITEMS) * area_10a)
-    annual_profit = annual_revenue - annual_cost
-    income_ratio = annual_profit / annual_revenue if annual_revenue > 0 else 0
+    return cost_breakdown, int(table.cost_total * area_10a)
+
 
+def _investment_stage(
+    table: ScenarioTable, total_trees: int | None, area_m2: float, area_10a: float,
+    rootstock_id: str | None,
+) -> tuple[int, int, dict]:
+    """(나무 수, 초기 투자, 투자 내역)."""
     # 나무 수 추정 (간격 5m x 3m 기준, 유효면적 85%)
-    total_trees = req.total_trees or int(area_m2 * 0.85 / (5.0 * 3.0))
-
-    # 대목별 묘목비 + 인프라비 (원/그루, 원/10a)
-    ROOTSTOCK_COSTS: dict[str, dict[str, int]] = {
-        "M9":      {"seedling": 25_000, "infra_per_10a": 2_000_000},
-        "M26":     {"seedling": 15_000, "infra_per_10a": 1_200_000},
-        "MM106":   {"seedling": 12_000, "infra_per_10a":   800_000},
-        "seedling": {"seedling": 8_000, "infra_per_10a":   500_000},
-    }
-    rs_cost = ROOTSTOCK_COSTS.get(rootstock_id or "", ROOTSTOCK_COSTS["M26"])
+    total_trees = total_trees or int(area_m2 * 0.85 / (5.0 * 3.0))
+
+    seedling_unit, infra_per_10a = table.rootstock_costs[
+        table.rootstocks.get(rootstock_id or "", table.default_rootstock)
+    ].tolist()
     initial_investment = int(
-        total_trees * rs_cost["seedling"] + area_10a * rs_cost["infra_per_10a"]
+        total_trees * seedling_unit + area_10a * infra_per_10a
     )
     investment_breakdown = {
-        "seedling_cost": int(total_trees * rs_cost["seedling"]),
-        "infra_cost": int(area_10a * rs_cost["infra_per_10a"]),
-        "seedling_unit": rs_cost["seedling"],
+        "seedling_cost": int(total_trees * seedling_unit),
+        "infra_cost": int(area_10a * infra_per_10a),
+        "seedling_unit": seedling_unit,
         "rootstock_used": rootstock_id or "M26",
     }
+    return total_trees, initial_investment, investment_breakdown
 
-    # 연도별 추이
+
+def _projection_stage(
+    total_yield: float, weighted_price: float, annual_cost: int, initial_investment: int,
+    projection_years: int,
+) -> tuple[list[YearlyProjection], int, float]:
+    """(연도별 추이, 손익분기 연차, 기간 ROI)."""
     projections: list[YearlyProjection] = []
     cumulative_profit = -initial_investment
-    break_even_year = req.projection_years  # default: never within period
+    break_even_year = projection_years  # default: never within period
 
-    for year in range(1, req.projection_years + 1):
+    for year in range(1, projection_years + 1):
         ratio = YIELD_CURVE.get(year, 1.0)
         year_yield = total_yield * ratio
         year_revenue = int(year_yield * weighted_price)
@@ -338,36 +471,489 @@ def simulate(req: SimulationRequest) -> SimulationResponse:
             )
         )
 
-        if cumulative_profit >= 0 and break_even_year == req.projection_years:
+        if cumulative_profit >= 0 and break_even_year == projection_years:
             break_even_year = year
 
-    roi_10year = cumulative_profit / initial_investment if initial_investment > 0 else 0
+    roi = cumulative_profit / initial_investment if initial_investment > 0 else 0
+    return projections, break_even_year, roi
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class SimulationState:
+    """simulate()의 중간 산출물. 보정(refine) 단계가 영향받는 단계만 다시 계산하는 데 쓴다."""
+    req: SimulationRequest
+    table: ScenarioTable
+    scenario: dict
+    variety_id: str
+    v: int
+    r: int
+    region_grade: str | None
+    live_price: float | None
+    area_m2: float
+    area_10a: float
+    yield_per_10a: float
+    grade_impact: dict | None
+    price_per_kg: float
+    price_source: str
+    grades: list[GradeDistribution]
+    total_yield: float
+    weighted_price: float
+    annual_revenue: int
+    cost_breakdown: list[CostBreakdown]
+    annual_cost: int
+    total_trees: int
+    initial_investment: int
+    investment_breakdown: dict
+    projections: list[YearlyProjection]
+    break_even_year: int
+    roi: float
+
+    @property
+    def annual_profit(self) -> int:
+        return self.annual_revenue - self.annual_cost
 
+    @property
+    def income_ratio(self) -> float:
+        return self.annual_profit / self.annual_revenue if self.annual_revenue > 0 else 0
+
+
+def simulate_state(req: SimulationRequest) -> SimulationState:
+    """simulate()의 계산부 — 응답 조립 전 중간 산출물."""
+    scenario = SCENARIOS.get(req.variety, SCENARIOS["후지"])
+
+    # Yield SSOT: orchard.compute_yield_per_10a 사용 (사용자 오버라이드 > SSOT > 시나리오 폴백)
+    variety_id = VARIETY_NAME_TO_ID.get(req.variety, "fuji")
+    rootstock_id = getattr(req, "rootstock_id", None)
+    yield_per_10a = _resolve_base_yield(req, scenario, variety_id, rootstock_id)
+
+    # 시세 우선순위: 사용자 입력 > KAMIS 실시간 > 시나리오 기본값
+    live_price = None if req.price_per_kg else _get_live_price()
+    price_per_kg, price_source = _resolve_price(req, scenario, live_price)
+    area_m2 = req.area_pyeong * PYEONG_TO_M2
+    area_10a = area_m2 / 1000
+
+    # 급지 보정 (Step 4): region_id → grade → 수확량·등급비율 조정 (컴파일된 테이블 사용)
+    table = get_scenario_table()
+    region_grade = _lookup_region_grade(getattr(req, "region_id", None))
+    v, r = _table_indices(table, req.variety, region_grade)
+    yield_per_10a, grade_impact = _grade_adjusted_yield(table, yield_per_10a, region_grade, r)
+
+    # 등급별 분포
+    grades = _grade_distribution(table, v, r)
+
+    # 연간 매출 (성목 기준, 농가 수취가 적용)
+    total_yield, weighted_price, annual_revenue = _revenue_stage(
+        table, v, r, yield_per_10a, price_per_kg, area_10a,
+    )
+
+    # 연간 비용
+    cost_breakdown, annual_cost = _cost_stage(table, area_10a)
+
+    # 나무 수 + 초기 투자
+    total_trees, initial_investment, investment_breakdown = _investment_stage(
+        table, req.total_trees, area_m2, area_10a, rootstock_id,
+    )
+
+    # 연도별 추이
+    projections, break_even_year, roi = _projection_stage(
+        total_yield, weighted_price, annual_cost, initial_investment, req.projection_years,
+    )
+
+    return SimulationState(
+        req=req, table=table, scenario=scenario, variety_id=variety_id,
+        v=v, r=r, region_grade=region_grade, live_price=live_price,
+        area_m2=area_m2, area_10a=area_10a,
+        yield_per_10a=yield_per_10a, grade_impact=grade_impact,
+        price_per_kg=price_per_kg, price_source=price_source,
+        grades=grades,
+        total_yield=total_yield, weighted_price=weighted_price, annual_revenue=annual_revenue,
+        cost_breakdown=cost_breakdown, annual_cost=annual_cost,
+        total_trees=total_trees, initial_investment=initial_investment,
+        investment_breakdown=investment_breakdown,
+        projections=projections, break_even_year=break_even_year, roi=roi,
+    )
+
+
+def refine_state(state: SimulationState, changes: dict) -> SimulationState:
+    """수확량·가격 보정값을 중간 산출물에 적용 (simulate(보정 요청)과 같은 결과).
+
+    등급 분포·비용·초기투자는 수확량·가격과 무관하므로 재사용하고,
+    수확량 해석 → 급지 보정 → 매출 → 연도별 추이만 다시 계산한다.
+    """
+    req = state.req.model_copy(update=changes)
+    yield_per_10a, grade_impact = state.yield_per_10a, state.grade_impact
+    if "yield_per_10a" in changes:
+        base = _resolve_base_yield(req, state.scenario, state.variety_id, req.rootstock_id)
+        yield_per_10a, grade_impact = _grade_adjusted_yield(
+            state.table, base, state.region_grade, state.r,
+        )
+    price_per_kg, price_source = state.price_per_kg, state.price_source
+    if "price_per_kg" in changes:
+        live_price = None if req.price_per_kg else (state.live_price or _get_live_price())
+        price_per_kg, price_source = _resolve_price(req, state.scenario, live_price)
+
+    total_yield, weighted_price, annual_revenue = _revenue_stage(
+        state.table, state.v, state.r, yield_per_10a, price_per_kg, state.area_10a,
+    )
+    projections, break_even_year, roi = _projection_stage(
+        total_yield, weighted_price, state.annual_cost, state.initial_investment,
+        req.projection_years,
+    )
+    return replace(
+        state, req=req,
+        yield_per_10a=yield_per_10a, grade_impact=grade_impact,
+        price_per_kg=price_per_kg, price_source=price_source,
+        total_yield=total_yield, weighted_price=weighted_price, annual_revenue=annual_revenue,
+        projections=projections, break_even_year=break_even_year, roi=roi,
+    )
+
+
+def build_response(state: SimulationState) -> SimulationResponse:
+    """중간 산출물 → SimulationResponse."""
+    req = state.req
     return SimulationResponse(
         variety=req.variety,
         area_pyeong=req.area_pyeong,
-        area_10a=round(area_10a, 2),
-        total_trees=total_trees,
-        yield_per_10a=yield_per_10a,
-        price_per_kg=price_per_kg,
-        grade_distribution=grades,
-        annual_revenue=annual_revenue,
-        annual_cost=annual_cost,
-        annual_profit=annual_profit,
-        income_ratio=round(income_ratio, 3),
-        cost_breakdown=cost_breakdown,
-        yearly_projections=projections,
-        break_even_year=break_even_year,
-        roi_10year=round(roi_10year, 2),
+        area_10a=round(state.area_10a, 2),
+        total_trees=state.total_trees,
+        yield_per_10a=state.yield_per_10a,
+        price_per_kg=state.price_per_kg,
+        grade_distribution=state.grades,
+        annual_revenue=state.annual_revenue,
+        annual_cost=state.annual_cost,
+        annual_profit=state.annual_profit,
+        income_ratio=round(state.income_ratio, 3),
+        cost_breakdown=state.cost_breakdown,
+        yearly_projections=state.projections,
+        break_even_year=state.break_even_year,
+        roi_10year=round(state.roi, 2),
         # Step 2: 시세 출처
-        price_source=price_source,
+        price_source=state.price_source,
         # Step 3: 설계 컨텍스트
-        rootstock_id=rootstock_id,
-        initial_investment=initial_investment,
-        investment_breakdown=investment_breakdown,
+        rootstock_id=getattr(req, "rootstock_id", None),
+        initial_investment=state.initial_investment,
+        investment_breakdown=state.investment_breakdown,
         # Step 4: 급지 연동
-        region_grade=region_grade,
-        grade_impact=grade_impact,
+        region_grade=state.region_grade,
+        grade_impact=state.grade_impact,
+    )
+
+
+def simulate(req: SimulationRequest) -> SimulationResponse:
+    """수익 시뮬레이션을 계산한다.
+
+    품종/면적/수확량/가격을 입력받아 등급별 매출, 비용 내역,
+    연도별 추이(유목기 고려), 손익분기 연차를 산출한다.
+    """
+    return build_response(simulate_state(req))
+
+
+# ---------------------------------------------------------------------------
+# 배치 시뮬레이션 (NumPy 커널)
+# ---------------------------------------------------------------------------
+
+
+def resolve_kernel_inputs(reqs: list[SimulationRequest]) -> dict:
+    """요청 N건의 입력 해석 → 커널 입력 배열.
+
+    수확량 SSOT, 시세, 급지 보정은 simulate()와 같은 규칙을 따르되
+    고유 조합별로 1회만 수행하고, 등급·대목 값은 컴파일된 시나리오 테이블에서
+    인덱스로 가져온다. 반환 딕셔너리의 kernel_args는
+    simulation_kernel.evaluate()에 그대로 전달할 수 있다.
+    """
+    import numpy as np
+    from services.simulation_kernel import yield_curve_array
+
+    n = len(reqs)
+    table = get_scenario_table()
+    live_price = _get_live_price() if any(not r.price_per_kg for r in reqs) else None
+    ssot_yields: dict[tuple[str, str | None], float] = {}
+    region_grades: dict[str, str | None] = {}
+    adjusted: dict[tuple[int, float], tuple[float, dict | None]] = {}
+
+    v_idx: list[int] = []
+    r_idx: list[int] = []
+    k_idx: list[int] = []
+    yield_col: list[float] = []
+    price_col: list[float] = []
+    price_sources: list[str] = []
+    grade_col: list[str | None] = []
+    impact_col: list[dict | None] = []
+
+    for req in reqs:
+        scenario = SCENARIOS.get(req.variety, SCENARIOS["후지"])
+        variety_id = VARIETY_NAME_TO_ID.get(req.variety, "fuji")
+        rootstock_id = req.rootstock_id
+
+        if req.yield_per_10a:
+            yield_per_10a = req.yield_per_10a
+        else:
+            key = (variety_id, rootstock_id)
+            if key not in ssot_yields:
+                ssot_yields[key] = _resolve_base_yield(req, scenario, variety_id, rootstock_id)
+            yield_per_10a = ssot_yields[key]
+        price_per_kg, price_source = _resolve_price(req, scenario, live_price)
+
+        region_grade = None
+        if req.region_id:
+            if req.region_id not in region_grades:
+                region_grades[req.region_id] = _lookup_region_grade(req.region_id)
+            region_grade = region_grades[req.region_id]
+        v, r = _table_indices(table, req.variety, region_grade)
+        grade_impact = None
+        if r:
+            adj_key = (r, yield_per_10a)
+            if adj_key not in adjusted:
+                adjusted[adj_key] = _grade_adjusted_yield(table, yield_per_10a, region_grade, r)
+            yield_per_10a, grade_impact = adjusted[adj_key]
+
+        v_idx.append(v)
+        r_idx.append(r)
+        k_idx.append(table.rootstocks.get(rootstock_id or "", table.default_rootstock))
+        yield_col.append(yield_per_10a)
+        price_col.append(price_per_kg)
+        price_sources.append(price_source)
+        grade_col.append(region_grade)
+        impact_col.append(grade_impact)
+
+    v_arr = np.array(v_idx, dtype=np.intp)
+    r_arr = np.array(r_idx, dtype=np.intp)
+    rs = table.rootstock_costs[np.array(k_idx, dtype=np.intp)].reshape(n, 2)
+    years = np.array([r.projection_years for r in reqs], dtype=np.int64)
+    max_years = max(int(years.max()), 0) if n else 0
+    return {
+        "grade_labels": table.grade_labels,
+        "grade_ratios": table.grade_ratios[v_arr, r_arr],
+        "grade_multipliers": table.grade_multipliers[v_arr],
+        "yield_col": yield_col,
+        "price_col": price_col,
+        "price_sources": price_sources,
+        "grade_col": grade_col,
+        "impact_col": impact_col,
+        "kernel_args": {
+            "yield_per_10a": np.array(yield_col, dtype=np.float64),
+            "price_per_kg": np.array(price_col, dtype=np.float64),
+            "grade_weights": table.grade_weights[v_arr, r_arr],
+            "area_pyeong": np.array([r.area_pyeong for r in reqs], dtype=np.float64),
+            "total_trees": np.array([r.total_trees or 0 for r in reqs], dtype=np.int64),
+            "seedling_unit": rs[:, 0],
+            "infra_per_10a": rs[:, 1],
+            "projection_years": years,
+            "cost_items": table.cost_amounts,
+            "yield_curve": yield_curve_array(YIELD_CURVE, max_years),
+            "farm_gate_ratio": FARM_GATE_RATIO,
+            "pyeong_to_m2": PYEONG_TO_M2,
+        },
+    }
+
+
+def simulate_batch(reqs: list[SimulationRequest]) -> dict:
+    """N건 시뮬레이션을 벡터 커널로 한 번에 계산한다.
+
+    요청별 simulate() 결과와 값이 동일하다. 입력 해석(수확량 SSOT, 시세, 급지)은
+    고유 조합별로 1회만 수행하고, 매출·비용·연도별 추이·손익분기는
+    services.simulation_kernel.evaluate()로 일괄 산출한다.
+
+    Returns: SimulationBatchResponse 호환 딕셔너리 (열 지향 — 필드별 요청 순서 배열).
+        행 단위 pydantic 객체를 만들지 않아 대량 실행 시 직렬화 비용이 작다.
+    """
+    return evaluate_batch(reqs, prepare_batch(reqs))
+
+
+def prepare_batch(reqs: list[SimulationRequest]) -> dict:
+    """배치 입력 해석 + 분류 사용 기록 (시세 캐시·급지 등 프로세스 상태 의존 단계)."""
+    n = len(reqs)
+    inputs = resolve_kernel_inputs(reqs)
+
+    # L4=5: 등급·비용 분류 사용 기록 (건수만큼 일괄)
+    for g in inputs["grade_labels"]:
+        grade_tracker.record(g, count=n)
+    for c in COST_ITEMS:
+        cost_cat_tracker.record(c["category"], count=n)
+    return inputs
+
+
+def evaluate_batch(reqs: list[SimulationRequest], inputs: dict) -> dict:
+    """resolve_kernel_inputs() 결과 → 열 지향 배치 응답 (커널 계산 + 반올림·조립).
+
+    입력 해석(시세 캐시·급지 조회)에 의존하지 않아 작업 큐의 프로세스 풀에서도 실행된다.
+    """
+    import numpy as np
+    from services.simulation_kernel import evaluate
+
+    n = len(reqs)
+    args = inputs["kernel_args"]
+    grade_labels = inputs["grade_labels"]
+    k = evaluate(**args)
+    years = args["projection_years"]
+
+    # 반올림: 소수 자릿수 지정분은 simulate()와 같은 파이썬 round(),
+    # 정수 반올림(yield_kg)은 np.rint (round(x, 0)과 동일한 half-even)
+    spans = [max(p, 0) for p in years.tolist()]
+
+    def _ragged(arr) -> list[list]:
+        return [row[:p] for row, p in zip(arr.tolist(), spans)]
+
+    return {
+        "count": n,
+        "grade_labels": grade_labels,
+        "cost_items": [{"category": c["category"], "name": c["name"]} for c in COST_ITEMS],
+        "variety": [r.variety for r in reqs],
+        "area_pyeong": [r.area_pyeong for r in reqs],
+        "area_10a": [round(v, 2) for v in k.area_10a.tolist()],
+        "total_trees": k.total_trees.tolist(),
+        "yield_per_10a": inputs["yield_col"],
+        "price_per_kg": inputs["price_col"],
+        "price_source": inputs["price_sources"],
+        "grade_ratios": inputs["grade_ratios"].tolist(),
+        "grade_multipliers": inputs["grade_multipliers"].tolist(),
+        "annual_revenue": k.annual_revenue.tolist(),
+        "annual_cost": k.annual_cost.tolist(),
+        "annual_profit": k.annual_profit.tolist(),
+        "income_ratio": [round(v, 3) for v in k.income_ratio.tolist()],
+        "cost_amounts": k.cost_amounts.tolist(),
+        "yearly": {
+            "yield_ratio": _ragged(k.yield_ratio),
+            "yield_kg": _ragged(np.rint(k.year_yield)),
+            "revenue": _ragged(k.year_revenue),
+            "cost": _ragged(k.year_cost),
+            "profit": _ragged(k.year_profit),
+        },
+        "break_even_year": k.break_even_year.tolist(),
+        "roi_10year": [round(v, 2) for v in k.roi.tolist()],
+        "rootstock_id": [r.rootstock_id for r in reqs],
+        "initial_investment": k.initial_investment.tolist(),
+        "seedling_cost": k.seedling_cost.tolist(),
+        "infra_cost": k.infra_cost.tolist(),
+        "seedling_unit": args["seedling_unit"].tolist(),
+        "rootstock_used": [r.rootstock_id or "M26" for r in reqs],
+        "region_grade": inputs["grade_col"],
+        "grade_impact": inputs["impact_col"],
+    }
+
+
+# ---------------------------------------------------------------------------
+# 확률 시뮬레이션 (Monte Carlo)
+# ---------------------------------------------------------------------------
+
+MC_MIN_DRAWS = 100
+MC_MAX_DRAWS = 100_000
+_MC_PERCENTILES = (10, 50, 90)
+
+
+def _sample_distribution(rng, spec, n: int):
+    """DistributionSpec → n개 표본. 알 수 없는 dist는 정규분포로 처리."""
+    import numpy as np
+
+    center, spread = float(spec.center), abs(float(spec.spread))
+    if spec.dist == "lognormal" and center > 0:
+        sigma2 = np.log1p((spread / center) ** 2)
+        return rng.lognormal(np.log(center) - sigma2 / 2, np.sqrt(sigma2), n)
+    if spec.dist == "uniform":
+        return rng.uniform(center - spread, center + spread, n)
+    if spec.dist == "triangular" and spread > 0:
+        return rng.triangular(center - spread, center, center + spread, n)
+    return rng.normal(center, spread, n)
+
+
+def _percentile_bands(values, ndigits: int = 0) -> list[dict]:
+    """(N, K) 표본 → K개 {p10, p50, p90, mean} (열마다 한 번의 분위수 계산)."""
+    import numpy as np
+
+    pct = np.percentile(values, _MC_PERCENTILES, axis=0)
+    mean = values.mean(axis=0)
+    return [
+        {"p10": round(p10, ndigits), "p50": round(p50, ndigits),
+         "p90": round(p90, ndigits), "mean": round(m, ndigits)}
+        for p10, p50, p90, m in zip(*pct.tolist(), mean.tolist())
+    ]
+
+
+def simulate_monte_carlo(req: "MonteCarloRequest") -> "MonteCarloResponse":
+    """Monte Carlo 시뮬레이션 — 수확량·가격·등급비율·비용상승률 불확실성 반영.
+
+    기준 입력은 simulate()와 같은 규칙(SSOT 수확량, 시세 우선순위, 급지 보정)으로
+    해석하고, draws개의 표본을 벡터 커널 한 번으로 평가해 P10/P50/P90 구간을 낸다.
+    """
+    import numpy as np
+    from schemas.simulation import MonteCarloResponse, MonteCarloYearBand, PercentileBand
+    from services.simulation_kernel import evaluate
+
+    n = min(max(req.draws, MC_MIN_DRAWS), MC_MAX_DRAWS)
+    rng = np.random.default_rng(req.seed)
+    inputs = resolve_kernel_inputs([req])
+    args = dict(inputs["kernel_args"])
+
+    # 기준값 × 표본 배수 (음수 배수는 0으로 절단)
+    yield_mult = np.maximum(_sample_distribution(rng, req.yield_dist, n), 0.0)
+    price_mult = np.maximum(_sample_distribution(rng, req.price_dist, n), 0.0)
+    inflation = np.maximum(_sample_distribution(rng, req.cost_inflation, n), -0.5)
+    if req.grade_concentration > 0:
+        alpha = np.maximum(inputs["grade_ratios"][0], 1e-3) * req.grade_concentration
+        ratios = rng.dirichlet(alpha, n)
+        args["grade_weights"] = ratios * inputs["grade_multipliers"][0]
+    else:
+        args["grade_weights"] = np.broadcast_to(args["grade_weights"], (n, len(inputs["grade_labels"])))
+
+    args["yield_per_10a"] = args["yield_per_10a"][0] * yield_mult
+    args["price_per_kg"] = args["price_per_kg"][0] * price_mult
+    for key in ("area_pyeong", "total_trees", "seedling_unit", "infra_per_10a", "projection_years"):
+        args[key] = np.broadcast_to(args[key], (n,))
+    k = evaluate(**args, cost_growth=inflation)
+
+    for g in inputs["grade_labels"]:
+        grade_tracker.record(g)
+    for c in COST_ITEMS:
+        cost_cat_tracker.record(c["category"])
+
+    # 요약 지표 6종 + 연차별 5종을 각각 한 번의 분위수 계산으로
+    years = max(req.projection_years, 0)
+    summary = _percentile_bands(np.column_stack([
+        k.annual_revenue, k.annual_profit, k.break_even_year,
+        k.year_profit.sum(axis=1),
+    ]).astype(np.float64))
+    ratio_bands = _percentile_bands(np.column_stack([k.income_ratio, k.roi]), ndigits=3)
+    yearly_values = np.concatenate([
+        k.year_yield[:, :years], k.year_revenue[:, :years], k.year_cost[:, :years],
+        k.year_profit[:, :years], k.cumulative_profit[:, :years],
+    ], axis=1).astype(np.float64)
+    yearly_bands = _percentile_bands(yearly_values) if years else []
+
+    projections = [
+        MonteCarloYearBand(
+            year=y + 1,
+            yield_kg=PercentileBand(**yearly_bands[y]),
+            revenue=PercentileBand(**yearly_bands[years + y]),
+            cost=PercentileBand(**yearly_bands[2 * years + y]),
+            profit=PercentileBand(**yearly_bands[3 * years + y]),
+            cumulative_profit=PercentileBand(**yearly_bands[4 * years + y]),
+        )
+        for y in range(years)
+    ]
+    reached = ((k.cumulative_profit >= 0) & k.year_mask).any(axis=1)
+
+    return MonteCarloResponse(
+        variety=req.variety,
+        area_pyeong=req.area_pyeong,
+        draws=n,
+        seed=req.seed,
+        yield_per_10a=inputs["yield_col"][0],
+        price_per_kg=inputs["price_col"][0],
+        price_source=inputs["price_sources"][0],
+        annual_revenue=PercentileBand(**summary[0]),
+        annual_profit=PercentileBand(**summary[1]),
+        income_ratio=PercentileBand(**ratio_bands[0]),
+        roi_10year=PercentileBand(**ratio_bands[1]),
+        break_even_year=PercentileBand(**summary[2]),
+        total_profit=PercentileBand(**summary[3]),
+        break_even_probability=round(float(reached.mean()), 3),
+        loss_probability=round(float((k.final_cumulative < 0).mean()), 3),
+        yearly_projections=projections,
     )
 
 
@@ -387,44 +973,88 @@ def compare_scenarios(
     variety: str,
     area_pyeong: float,
     projection_years: int = 10,
+    extra_modifiers: list[dict] | None = None,
 ) -> dict:
-    """낙관/중립/비관 3시나리오 비교.
+    """낙관/중립/비관 3시나리오 (+ 사용자 추가 시나리오) 비교.
 
-    각 시나리오별로 수확량·가격을 보정하여 시뮬레이션을 돌리고,
-    결과를 요약·비교하여 종합 추천을 생성한다.
+    시나리오별 수확량·가격 보정값을 한 배열로 묶어 벡터 커널 한 번으로
+    시나리오 × 연차 2-D 평가를 수행하고 ScenarioResult 행을 바로 만든다.
+    결과는 시나리오마다 simulate()를 돌린 값과 같다.
+
+    Args:
+        extra_modifiers: [{"scenario", "label", "yield", "price"}, ...] 추가 보정 계수.
+            프리셋 3종 뒤에 이어 붙는다.
     """
+    import numpy as np
     from schemas.simulation import CompareResponse, ScenarioResult
+    from services.simulation_kernel import evaluate, yield_curve_array
 
     scenario_data = SCENARIOS.get(variety, SCENARIOS["후지"])
     base_yield = scenario_data["yield_per_10a"]
     base_price = scenario_data["price_per_kg"]
 
-    results: list[ScenarioResult] = []
+    modifiers = [{"scenario": key, **mod} for key, mod in _SCENARIO_MODIFIERS.items()]
+    modifiers += list(extra_modifiers or [])
+    n = len(modifiers)
+    yields = [base_yield * mod["yield"] for mod in modifiers]
+    prices = [base_price * mod["price"] for mod in modifiers]
 
-    for key, mod in _SCENARIO_MODIFIERS.items():
-        req = SimulationRequest(
-            variety=variety,
-            area_pyeong=area_pyeong,
-            yield_per_10a=base_yield * mod["yield"],
-            price_per_kg=base_price * mod["price"],
-            projection_years=projection_years,
-        )
-        res = simulate(req)
-        total_10y = sum(p.profit for p in res.yearly_projections)
+    # 보정 결과가 0인 시나리오는 simulate()와 같이 SSOT 수확량 / 시세 폴백
+    if not all(yields) or not all(prices):
+        fallback_req = SimulationRequest(variety=variety, area_pyeong=area_pyeong)
+        variety_id = VARIETY_NAME_TO_ID.get(variety, "fuji")
+        if not all(yields):
+            ssot = _resolve_base_yield(fallback_req, scenario_data, variety_id, None)
+            yields = [y or ssot for y in yields]
+        if not all(prices):
+            fallback_price, _ = _resolve_price(fallback_req, scenario_data, _get_live_price())
+            prices = [p or fallback_price for p in prices]
+
+    table = get_scenario_table()
+    v, r = _table_indices(table, variety, None)
+    seedling_unit, infra_per_10a = table.rootstock_costs[table.default_rootstock]
+    k = evaluate(
+        yield_per_10a=np.array(yields, dtype=np.float64),
+        price_per_kg=np.array(prices, dtype=np.float64),
+        grade_weights=np.broadcast_to(table.grade_weights[v, r], (n, len(table.grade_labels))),
+        area_pyeong=np.full(n, float(area_pyeong)),
+        total_trees=np.zeros(n, dtype=np.int64),
+        seedling_unit=np.full(n, seedling_unit),
+        infra_per_10a=np.full(n, infra_per_10a),
+        projection_years=np.full(n, projection_years, dtype=np.int64),
+        cost_items=table.cost_amounts,
+        yield_curve=yield_curve_array(YIELD_CURVE, max(projection_years, 0)),
+        farm_gate_ratio=FARM_GATE_RATIO,
+        pyeong_to_m2=PYEONG_TO_M2,
+    )
+
+    # L4=5: 등급·비용 분류 사용 기록 (시나리오 수만큼 일괄)
+    for g in table.grade_labels:
+        grade_tracker.record(g, count=n)
+    for c in COST_ITEMS:
+        cost_cat_tracker.record(c["category"], count=n)
 
-        results.append(ScenarioResult(
-            scenario=key,
+    results = [
+        ScenarioResult(
+            scenario=mod["scenario"],
             label=mod["label"],
-            yield_per_10a=res.yield_per_10a,
-            price_per_kg=res.price_per_kg,
-            annual_revenue=res.annual_revenue,
-            annual_cost=res.annual_cost,
-            annual_profit=res.annual_profit,
-            income_ratio=res.income_ratio,
-            break_even_year=res.break_even_year,
-            roi_10year=res.roi_10year,
-            total_10year_profit=total_10y,
-        ))
+            yield_per_10a=y,
+            price_per_kg=p,
+            annual_revenue=rev,
+            annual_cost=cost,
+            annual_profit=profit,
+            income_ratio=round(ir, 3),
+            break_even_year=be,
+            roi_10year=round(roi, 2),
+            total_10year_profit=total,
+        )
+        for mod, y, p, rev, cost, profit, ir, be, roi, total in zip(
+            modifiers, yields, prices,
+            k.annual_revenue.tolist(), k.annual_cost.tolist(), k.annual_profit.tolist(),
+            k.income_ratio.tolist(), k.break_even_year.tolist(), k.roi.tolist(),
+            k.year_profit.sum(axis=1).tolist(),
+        )
+    ]
 
     # 종합 추천 메시지 생성
     neutral = results[1]
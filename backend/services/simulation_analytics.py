@@ -1,23 +1,44 @@
 """
 시뮬레이션 실행 분석 모듈
-인메모리 링버퍼 + JSONL 영속화로 실행 추적 + 품종별/면적별 통계 집계
+컬럼 저장소(전체 이력) + JSONL 영속화로 실행 추적 + 품종별/면적별 통계 집계
+스냅샷·트렌드는 최근 max_records건(링) 기준, 임의 그룹 집계는 query() — services/run_store.py
 L6(학습순환): 실행 기록 → 축적 → 트렌드 분석 → 개선 피드백
 
+집계는 기록 시점에 증분 갱신한다 (/run 요청마다 스냅샷을 읽으므로 O(1) 유지):
+  - 링 전체 합계(면적·ROI·손익분기·소요시간): 추가 시 더하고, 링에서 밀려난 기록은 뺀다
+  - 최대 면적: 단조 감소 덱 (슬라이딩 윈도 최대값)
+  - 최다 품종: 카운트가 늘어난 품종만 현재 1위와 비교
+  - 임의 창 평균(get_trends): ROI·면적 누적합(prefix sum) 원형 버퍼의 차
+
+기동 복원은 체크포인트 + 꼬리 재생으로 한다 (누적 실행 수와 무관한 기동 시간):
+  - 체크포인트(simulation_runs.checkpoint.json): 총 실행 수, 품종별 카운트, 컬럼 저장소 메타
+    (청크 파일은 simulation_runs.store/), 그리고 이 상태가 반영한 JSONL 바이트 오프셋
+  - CHECKPOINT_EVERY건마다, 긴 꼬리를 재생한 직후, 서버 종료 시 갱신
+  - 주기 체크포인트는 이벤트 루프를 막지 않도록 JSONL 기록 스레드에서 저장한다: 기록 시점
+    상태(행 수·카운트)를 잡아 두고, 그 전 줄이 모두 기록된 직후(log_writer.after) 오프셋과 함께 저장
+  - 기동 시 체크포인트를 읽고 오프셋 이후 줄만 재생. 파일이 줄었거나 오프셋 직전 바이트
+    지문이 다르면(파일 교체) 처음부터 재생
+
 L6=5 (R113): TrendAccuracyLearner
   - 트렌드 예측 정확도 추적 (예측 방향 vs 실제 ROI 변화)
   - 정확도 개선 시 트렌드 감지 임계값 강화, 저하 시 완화
   - 학습 사이클이 자기 감지 기준을 자동 최적화
 """
 
+import hashlib
 import json
 import logging
+import os
 import time
 from collections import deque, defaultdict
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from core.log_writer import get_log_writer
+from services.run_store import RunStore
+
 logger = logging.getLogger("pj18.analytics")
 
 
@@ -117,56 +138,246 @@ class SimulationAnalyticsSnapshot:
         }
 
 
+_SUM_FIELDS = ("area_pyeong", "roi_10year", "break_even_year", "duration_ms")
+_RECORD_FIELDS = tuple(f.name for f in fields(SimulationRunRecord))
+
+CHECKPOINT_FORMAT = 2
+CHECKPOINT_EVERY = 1000      # 실행 N건마다 체크포인트 갱신
+_TAIL_PROBE = 256            # 오프셋 직전 지문 바이트 수
+
+
+def _record_from(d: dict) -> SimulationRunRecord:
+    return SimulationRunRecord(**{name: d[name] for name in _RECORD_FIELDS})
+
+
+def _tail_digest(f, offset: int) -> str:
+    """오프셋 직전 _TAIL_PROBE 바이트의 해시 (파일 교체 감지)."""
+    start = max(offset - _TAIL_PROBE, 0)
+    f.seek(start)
+    return hashlib.sha1(f.read(offset - start)).hexdigest()[:16]
+
+
 class SimulationAnalytics:
-    """시뮬레이션 실행 분석기 (인메모리 링버퍼 + JSONL 영속화)"""
+    """시뮬레이션 실행 분석기 (컬럼 저장소 + JSONL 영속화)"""
 
     _JSONL_DIR = Path(__file__).resolve().parent.parent / "data"
     _JSONL_FILE = _JSONL_DIR / "simulation_runs.jsonl"
 
     def __init__(self, max_records: int = 500):
-        self._records: deque[SimulationRunRecord] = deque(maxlen=max_records)
+        self._store = RunStore()
+        self._max_records = max_records
         self._total_runs: int = 0
         self._variety_counts: Dict[str, int] = defaultdict(int)
+        # 증분 집계 상태
+        self._appended: int = 0                                   # 집계에 넣은 누적 건수 (저장소 행 인덱스 + 1)
+        self._tracked_from: int = 0                               # 집계를 시작한 행 (체크포인트 복원 시 링 시작)
+        self._sums: Dict[str, float] = dict.fromkeys(_SUM_FIELDS, 0.0)
+        self._area_max: deque = deque()                           # (절대 인덱스, 면적) 단조 감소
+        self._prefix_size = max_records + 1
+        self._prefix_roi: List[float] = [0.0] * self._prefix_size  # [k % size] = 처음 k건 누적합
+        self._prefix_area: List[float] = [0.0] * self._prefix_size
+        self._variety_order: Dict[str, int] = {}
+        self._top_variety: str = ""
         self._trend_learner = TrendAccuracyLearner()  # L6=5
         self._last_trend: Optional[str] = None
         self._last_avg_roi: Optional[float] = None
+        self._since_checkpoint: int = 0
+        self._checkpoint_seq: int = 0                             # 최신 예약 체크포인트 (이전 예약은 건너뜀)
+        self._restore_stats: Dict[str, float] = {}
         self._load_history()
 
+    @property
+    def _checkpoint_file(self) -> Path:
+        return self._JSONL_FILE.with_name(self._JSONL_FILE.stem + ".checkpoint.json")
+
+    @property
+    def _store_dir(self) -> Path:
+        return self._JSONL_FILE.with_name(self._JSONL_FILE.stem + ".store")
+
+    @property
+    def _ring_len(self) -> int:
+        return min(len(self._store), self._max_records)
+
+    def recent_records(self) -> List[SimulationRunRecord]:
+        """최근 max_records건 (스냅샷·트렌드 기준 링)."""
+        return [_record_from(d) for d in self._store.tail(self._ring_len)]
+
+    def _load_checkpoint(self, f, size: int) -> int:
+        """유효한 체크포인트면 상태 복원 후 오프셋 반환, 아니면 0."""
+        try:
+            cp = json.loads(self._checkpoint_file.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return 0
+        offset = cp.get("offset", 0)
+        if cp.get("format") != CHECKPOINT_FORMAT or not 0 < offset <= size:
+            return 0
+        if _tail_digest(f, offset) != cp.get("tail_digest"):
+            logger.info("[ANALYTICS] 체크포인트 지문 불일치 — 전체 재생")
+            return 0
+        store = RunStore.load(self._store_dir, cp["store"])
+        if store is None:
+            logger.info("[ANALYTICS] 컬럼 저장소 청크 누락 — 전체 재생")
+            return 0
+        self._store = store
+        n = len(store)
+        self._appended = self._tracked_from = n - self._ring_len
+        for k in range(self._tracked_from, n):
+            self._track(k, *(float(store.value(f, k)) for f in _SUM_FIELDS))
+        self._variety_counts.update(cp["variety_counts"])
+        self._variety_order = {v: i for i, v in enumerate(self._variety_counts)}
+        if self._variety_counts:
+            self._top_variety = max(self._variety_counts, key=self._variety_counts.get)
+        self._total_runs = cp["total_runs"]
+        return offset
+
     def _load_history(self):
-        """기존 JSONL 로그에서 기록 복원 (재시작 시 연속성 유지)"""
+        """기존 JSONL 로그에서 기록 복원 (재시작 시 연속성 유지) — 체크포인트 + 꼬리 재생"""
+        get_log_writer().flush(self._JSONL_FILE)
         if not self._JSONL_FILE.exists():
             return
+        t0 = time.perf_counter()
+        replayed = 0
         try:
-            with open(self._JSONL_FILE, "r", encoding="utf-8") as f:
+            with open(self._JSONL_FILE, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                offset = self._load_checkpoint(f, size)
+                f.seek(offset)
                 for line in f:
-                    line = line.strip()
-                    if not line:
+                    if not line.endswith(b"\n"):
+                        break  # 기록 중인 마지막 줄 — 다음 기동에서 재생
+                    offset += len(line)
+                    if not line.strip():
                         continue
-                    d = json.loads(line)
-                    record = SimulationRunRecord(
-                        timestamp=d["timestamp"],
-                        variety=d["variety"],
-                        area_pyeong=d["area_pyeong"],
-                        total_trees=d["total_trees"],
-                        projection_years=d["projection_years"],
-                        annual_profit=d["annual_profit"],
-                        roi_10year=d["roi_10year"],
-                        break_even_year=d["break_even_year"],
-                        duration_ms=d["duration_ms"],
-                    )
-                    self._records.append(record)
-                    self._total_runs += 1
-                    self._variety_counts[record.variety] += 1
-            logger.info(f"[ANALYTICS] {self._total_runs}건 기록 복원 완료")
+                    try:
+                        self._push(_record_from(json.loads(line)))
+                    except (json.JSONDecodeError, KeyError, TypeError):
+                        continue
+                    replayed += 1
+            self._restore_stats = {
+                "checkpoint_runs": self._total_runs - replayed,
+                "replayed_lines": replayed,
+                "restore_ms": round((time.perf_counter() - t0) * 1000, 1),
+            }
+            logger.info(
+                f"[ANALYTICS] {self._total_runs}건 기록 복원 완료 "
+                f"(꼬리 재생 {replayed}건, {self._restore_stats['restore_ms']}ms)"
+            )
+            if replayed >= CHECKPOINT_EVERY:
+                self._write_checkpoint(offset)
         except Exception as e:
             logger.warning(f"[ANALYTICS] 기록 복원 실패 (무시): {e}")
 
+    def _checkpoint_state(self) -> dict:
+        """체크포인트에 넣을 현재 상태 (기록 스레드에서 저장해도 이후 append와 섞이지 않게 복사)."""
+        return {
+            "total_runs": self._total_runs,
+            "variety_counts": dict(self._variety_counts),
+            "rows": len(self._store),
+        }
+
+    def _write_checkpoint(self, offset: int, state: Optional[dict] = None) -> None:
+        """오프셋까지 반영된 상태(기본: 현재 상태)를 체크포인트로 원자적 교체 저장."""
+        state = state or self._checkpoint_state()
+        with open(self._JSONL_FILE, "rb") as f:
+            digest = _tail_digest(f, offset)
+        payload = {
+            "format": CHECKPOINT_FORMAT,
+            "offset": offset,
+            "tail_digest": digest,
+            "total_runs": state["total_runs"],
+            "variety_counts": state["variety_counts"],
+            "store": self._store.save(self._store_dir, state["rows"]),
+            "written_at": datetime.now().isoformat(),
+        }
+        path = self._checkpoint_file
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def checkpoint(self) -> None:
+        """JSONL 기록을 flush한 뒤 현재 상태를 체크포인트로 동기 저장 (서버 종료 시)."""
+        try:
+            get_log_writer().flush(self._JSONL_FILE)
+            if self._JSONL_FILE.exists():
+                self._write_checkpoint(self._JSONL_FILE.stat().st_size)
+            self._since_checkpoint = 0
+        except Exception as e:
+            logger.warning(f"[ANALYTICS] 체크포인트 저장 실패 (무시): {e}")
+
+    def _schedule_checkpoint(self) -> None:
+        """주기 체크포인트 예약 — 지금까지의 JSONL 줄이 기록된 직후 기록 스레드에서 저장.
+
+        그 사이 더 새로운 예약이 생기면 이전 예약은 건너뛴다 (청크 저장은 최신 것 한 번).
+        """
+        self._since_checkpoint = 0
+        self._checkpoint_seq += 1
+        seq, state = self._checkpoint_seq, self._checkpoint_state()
+
+        def write() -> None:
+            if seq != self._checkpoint_seq:
+                return
+            try:
+                self._write_checkpoint(self._JSONL_FILE.stat().st_size, state)
+            except Exception as e:
+                logger.warning(f"[ANALYTICS] 체크포인트 저장 실패 (무시): {e}")
+
+        get_log_writer().after(self._JSONL_FILE, write)
+
+    def _push(self, record: SimulationRunRecord) -> None:
+        """링 추가 + 총계·품종 카운트 증분 갱신."""
+        self._push_ring(record)
+        self._total_runs += 1
+        counts = self._variety_counts
+        counts[record.variety] += 1
+        order = self._variety_order.setdefault(record.variety, len(self._variety_order))
+        top = self._top_variety
+        # max(dict, key=count)와 같은 결과: 동률이면 먼저 등장한 품종
+        if (
+            not top
+            or counts[record.variety] > counts[top]
+            or (counts[record.variety] == counts[top] and order < self._variety_order[top])
+        ):
+            self._top_variety = record.variety
+
+    def _push_ring(self, record: SimulationRunRecord) -> None:
+        """저장소 추가 + 링 증분 집계 갱신."""
+        k = self._store.append(record)
+        self._track(k, *(getattr(record, f) for f in _SUM_FIELDS))
+
+    def _track(self, k: int, area: float, roi: float, break_even: float, duration: float) -> None:
+        """행 k를 링 집계에 반영 (링에서 밀려나는 행 k - max_records는 합계에서 제외)."""
+        sums = self._sums
+        evicted = k - self._max_records
+        if evicted >= self._tracked_from:
+            for f in _SUM_FIELDS:
+                sums[f] -= float(self._store.value(f, evicted))
+        sums["area_pyeong"] += area
+        sums["roi_10year"] += roi
+        sums["break_even_year"] += break_even
+        sums["duration_ms"] += duration
+
+        size = self._prefix_size
+        self._prefix_roi[(k + 1) % size] = self._prefix_roi[k % size] + roi
+        self._prefix_area[(k + 1) % size] = self._prefix_area[k % size] + area
+        self._appended = k + 1
+
+        area_max = self._area_max
+        while area_max and area_max[-1][1] <= area:
+            area_max.pop()
+        area_max.append((k, area))
+        start = self._appended - self._ring_len
+        while area_max[0][0] < start:
+            area_max.popleft()
+
+    def _window_sum(self, prefix: List[float], w: int) -> float:
+        """최근 w건 합 (w ≤ 링 길이)."""
+        k, size = self._appended, self._prefix_size
+        return prefix[k % size] - prefix[(k - w) % size]
+
     def _persist(self, record: SimulationRunRecord):
-        """JSONL 파일에 1건 append"""
+        """JSONL 파일에 1건 append (공용 기록기에 예약 — 배치 기록)"""
         try:
-            self._JSONL_DIR.mkdir(parents=True, exist_ok=True)
-            with open(self._JSONL_FILE, "a", encoding="utf-8") as f:
-                f.write(json.dumps(asdict(record), ensure_ascii=False) + "\n")
+            get_log_writer().append(self._JSONL_FILE, asdict(record))
         except Exception as e:
             logger.warning(f"[ANALYTICS] 영속화 실패 (무시): {e}")
 
@@ -193,44 +404,47 @@ class SimulationAnalytics:
             break_even_year=break_even_year,
             duration_ms=duration_ms,
         )
-        self._records.append(record)
-        self._total_runs += 1
-        self._variety_counts[variety] += 1
+        self._push(record)
         self._persist(record)
+        self._since_checkpoint += 1
+        if self._since_checkpoint >= CHECKPOINT_EVERY:
+            self._schedule_checkpoint()
 
         # L6=5: 이전 트렌드 예측 정확도 추적
         if self._last_trend and self._last_avg_roi is not None:
-            records = list(self._records)
-            if len(records) >= 2:
-                current_avg = sum(r.roi_10year for r in records[-5:]) / min(5, len(records))
+            n = self._ring_len
+            if n >= 2:
+                current_avg = self._window_sum(self._prefix_roi, min(5, n)) / min(5, n)
                 roi_change = current_avg - self._last_avg_roi
                 self._trend_learner.record(self._last_trend, roi_change)
                 self._trend_learner.maybe_tune()
 
     def get_trends(self, window: int = 50) -> dict:
         """최근 N건 기반 트렌드 분석 (L6 학습순환)"""
-        records = list(self._records)
-        if len(records) < 2:
-            return {"status": "insufficient_data", "total": len(records)}
+        n = self._ring_len
+        if n < 2:
+            return {"status": "insufficient_data", "total": n}
 
-        recent = records[-min(window, len(records)):]
-        older = records[:-len(recent)] if len(records) > len(recent) else []
+        # records[-min(window, n):]와 같은 꼬리 길이 (window ≤ 0 포함)
+        w = len(range(n)[-min(window, n):]) or n
+        n_older = n - w
 
-        avg_roi_recent = sum(r.roi_10year for r in recent) / len(recent)
-        avg_area_recent = sum(r.area_pyeong for r in recent) / len(recent)
+        recent_roi = self._window_sum(self._prefix_roi, w)
+        avg_roi_recent = recent_roi / w
+        avg_area_recent = self._window_sum(self._prefix_area, w) / w
 
         result = {
             "status": "ok",
             "total": self._total_runs,
-            "window": len(recent),
+            "window": w,
             "avg_roi_recent": round(avg_roi_recent, 2),
             "avg_area_recent": round(avg_area_recent, 1),
             "variety_distribution": dict(self._variety_counts),
             "recommendations": [],
         }
 
-        if older:
-            avg_roi_older = sum(r.roi_10year for r in older) / len(older)
+        if n_older:
+            avg_roi_older = (self._window_sum(self._prefix_roi, n) - recent_roi) / n_older
             roi_change = avg_roi_recent - avg_roi_older
             # L6=5: 동적 임계값 사용 (TrendAccuracyLearner)
             threshold = self._trend_learner.threshold
@@ -246,8 +460,8 @@ class SimulationAnalytics:
 
         # 인기 품종 편중 경고
         if self._variety_counts:
-            total = sum(self._variety_counts.values())
-            top_variety = max(self._variety_counts, key=self._variety_counts.get)
+            total = self._total_runs  # = 품종별 카운트 합
+            top_variety = self._top_variety
             top_pct = self._variety_counts[top_variety] / total * 100
             if top_pct > 70:
                 result["recommendations"].append(
@@ -256,10 +470,15 @@ class SimulationAnalytics:
 
         return result
 
+    def query(self, **params) -> dict:
+        """전체 실행 이력 그룹 집계 (RunStore.query 인자 그대로) + 저장소 통계."""
+        result = self._store.query(**params)
+        result["store"] = self._store.get_stats()
+        return result
+
     def get_snapshot(self) -> SimulationAnalyticsSnapshot:
         """현재 집계 스냅샷 반환"""
-        records = list(self._records)
-        n = len(records)
+        n = self._ring_len
 
         if n == 0:
             return SimulationAnalyticsSnapshot(
@@ -269,12 +488,13 @@ class SimulationAnalytics:
                 most_popular_variety="", largest_area=0,
             )
 
-        avg_area = sum(r.area_pyeong for r in records) / n
-        avg_roi = sum(r.roi_10year for r in records) / n
-        avg_be = sum(r.break_even_year for r in records) / n
-        avg_dur = sum(r.duration_ms for r in records) / n
-        most_pop = max(self._variety_counts, key=self._variety_counts.get)
-        largest = max(r.area_pyeong for r in records)
+        sums = self._sums
+        avg_area = sums["area_pyeong"] / n
+        avg_roi = sums["roi_10year"] / n
+        avg_be = sums["break_even_year"] / n
+        avg_dur = sums["duration_ms"] / n
+        most_pop = self._top_variety
+        largest = self._area_max[0][1]
 
         return SimulationAnalyticsSnapshot(
             total_runs=self._total_runs,
@@ -0,0 +1,135 @@
+"""
+시뮬레이션 결과 캐시 (simulate → validate → refine 파이프라인 앞단).
+
+/api/simulation/run 요청은 소수의 (품종, 면적, 대목, 지역) 조합에 몰린다.
+동일 요청은 정규화 키로 묶어 최종 결과(검증 노트·보정 포함)를 재사용한다.
+
+무효화 기준 — 결과를 바꿀 수 있는 입력의 버전 스탬프:
+  - PriceCache.version        (KAMIS 실시간 시세)
+  - FeatureFlags.version      (급지 보정 등 기능 토글)
+  - EvolutionEngine 세대/리비전 (보정 계수)
+  - 검증기 CONFIG 지문         (reflexion 조정·자동 롤백)
+스탬프가 바뀌면 이전 스탬프로 만든 항목은 모두 폐기한다.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from schemas.simulation import SimulationRequest, SimulationResponse
+
+logger = logging.getLogger(__name__)
+
+
+def current_version_stamp() -> tuple:
+    """결과에 영향을 주는 데이터 버전 묶음."""
+    from core.evolution_engine import get_evolution_engine
+    from core.feature_flags import get_feature_flags
+    from services.price_cache import get_price_cache
+    from services.simulation_validator import get_config_version
+
+    engine = get_evolution_engine()
+    return (
+        get_price_cache().version,
+        get_feature_flags().version,
+        engine.generation,
+        engine.revision,
+        get_config_version(),
+    )
+
+
+def canonical_key(req: SimulationRequest) -> tuple:
+    """요청 정규화 — 결과가 같은 입력은 같은 키.
+
+    simulate()는 0과 None을 동일하게 취급(`or` 폴백)하므로 0은 None으로 접고,
+    결과에 영향 없는 machine_id는 제외한다.
+    """
+    return (
+        req.variety,
+        float(req.area_pyeong),
+        req.total_trees or None,
+        float(req.yield_per_10a) if req.yield_per_10a else None,
+        float(req.price_per_kg) if req.price_per_kg else None,
+        req.projection_years,
+        req.rootstock_id,
+        req.region_id,
+    )
+
+
+class SimulationResultCache:
+    """LRU + TTL 결과 캐시. 항목은 생성 시점의 버전 스탬프와 함께 저장."""
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 600.0) -> None:
+        self._max = max_entries
+        self._ttl = ttl_seconds
+        self._entries: OrderedDict[tuple, tuple[float, SimulationResponse]] = OrderedDict()
+        self._stamp: tuple | None = None
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    def _sync_stamp(self) -> tuple:
+        stamp = current_version_stamp()
+        if stamp != self._stamp:
+            if self._entries:
+                self._invalidations += 1
+                logger.info("결과 캐시 무효화: 버전 변경 (%d건 폐기)", len(self._entries))
+            self._entries.clear()
+            self._stamp = stamp
+        return stamp
+
+    def get(self, req: SimulationRequest) -> Optional[SimulationResponse]:
+        """캐시 조회. 적중 시 호출자가 수정해도 안전한 사본을 반환."""
+        self._sync_stamp()
+        key = canonical_key(req)
+        entry = self._entries.get(key)
+        if entry is not None:
+            created, result = entry
+            if time.monotonic() - created <= self._ttl:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return result.model_copy()
+            del self._entries[key]
+            self._expirations += 1
+        self._misses += 1
+        return None
+
+    def put(self, req: SimulationRequest, result: SimulationResponse) -> None:
+        """파이프라인 완료 결과 저장. 검증 중 CONFIG가 바뀌었을 수 있어 스탬프 재확인."""
+        self._sync_stamp()
+        key = canonical_key(req)
+        self._entries[key] = (time.monotonic(), result.model_copy())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> dict:
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self._max,
+            "ttl_seconds": self._ttl,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+            "invalidations": self._invalidations,
+        }
+
+
+# 싱글턴 인스턴스
+_cache = SimulationResultCache()
+
+
+def get_result_cache() -> SimulationResultCache:
+    return _cache
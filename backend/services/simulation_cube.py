@@ -0,0 +1,428 @@
+"""
+사전 계산 시뮬레이션 큐브 (UI 슬라이더 즉시 응답).
+
+시뮬레이션 화면은 슬라이더를 움직일 때마다 시뮬레이션을 다시 요청한다.
+품종 × 대목 × 급지 × 면적 구간 × 가격 구간 격자의 결과를 백그라운드에서 미리 계산해
+바이너리 배열 파일(.npy)로 저장하고, 기동 시 메모리 매핑해 다선형 보간으로 응답한다.
+
+큐브 값 — 보간 가능한 '절사 전' 1차 산출량만 저장한다:
+  revenue_raw = 총수확량 × 가중 단가   (면적 × 가격에 쌍선형)
+  cost_raw    = 10a당 비용 합계 × 면적  (면적에 선형)
+  trees_raw   = 식재 가능 나무 수        (면적에 선형)
+  infra_raw   = 인프라비               (면적에 선형)
+격자 내 쌍선형 보간이 위 값을 그대로 재현하므로, 절사·연차별 추이·손익분기·ROI는
+보간된 1차 값에서 simulate()와 같은 규칙으로 조립한다 (손익분기 같은 이산 지표를
+직접 보간하지 않는다).
+
+격자 밖 요청(면적·가격 범위 밖, 수확량·나무 수 직접 입력, 미등록 품종·대목)과
+큐브가 최신이 아닐 때는 벡터 커널로 정확히 계산한다.
+
+재구성 기준: PriceCache 버전(가격 축이 현재 시세를 중심으로 잡힘) + 시나리오 테이블 버전
+(진화 엔진 세대/리비전 포함). 파일 재사용 여부는 입력 지문(fingerprint)으로 판단한다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from schemas.simulation import QuickSimulationResponse, SimulationRequest
+from services.simulation import (
+    FARM_GATE_RATIO,
+    PYEONG_TO_M2,
+    ROOTSTOCK_COSTS,
+    SCENARIOS,
+    VARIETY_NAME_TO_ID,
+    YIELD_CURVE,
+    _get_live_price,
+    _grade_adjusted_yield,
+    _lookup_region_grade,
+    _resolve_base_yield,
+    _resolve_price,
+    get_scenario_table,
+    resolve_kernel_inputs,
+)
+from services.simulation_kernel import evaluate, weighted_price, yield_curve_array
+
+logger = logging.getLogger(__name__)
+
+_DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+_CUBE_FILE = "simulation_cube.npy"
+_META_FILE = "simulation_cube.json"
+CUBE_FORMAT = 2
+FIELDS = ("revenue_raw", "cost_raw", "trees_raw", "infra_raw")
+
+# 격자 정의
+AREA_RANGE = (100.0, 30_000.0)   # 평
+AREA_BUCKETS = 24                # 로그 간격
+PRICE_BUCKETS = 24               # 선형 간격
+PRICE_SPAN = (0.25, 3.0)         # 기준 시세(시나리오 기본값 + KAMIS) 최솟값·최댓값 대비 배수
+
+
+def _current_stamp() -> tuple:
+    """프로세스 내 신선도 기준: 시세 버전 + 시나리오 테이블 버전."""
+    from services.price_cache import get_price_cache
+    return (get_price_cache().version, get_scenario_table().version)
+
+
+def _cube_inputs() -> dict:
+    """큐브를 결정하는 입력 전체 (축 + 품종·대목·급지별 수확량·등급 배수)."""
+    table = get_scenario_table()
+    live_price = _get_live_price()
+    varieties = list(SCENARIOS)
+    rootstocks = [""] + list(ROOTSTOCK_COSTS)   # "" = 대목 미지정 (SSOT 기본 간격, M26 비용)
+    region_grades = list(table.region_grades)   # "" = 급지 보정 없음
+
+    yields = np.zeros((len(varieties), len(rootstocks), len(region_grades)), dtype=np.float64)
+    for vi, variety in enumerate(varieties):
+        scenario = SCENARIOS[variety]
+        variety_id = VARIETY_NAME_TO_ID.get(variety, "fuji")
+        for ki, rootstock in enumerate(rootstocks):
+            req = SimulationRequest(variety=variety, area_pyeong=1.0, rootstock_id=rootstock or None)
+            base = _resolve_base_yield(req, scenario, variety_id, rootstock or None)
+            for ri, grade in enumerate(region_grades):
+                yields[vi, ki, ri] = _grade_adjusted_yield(table, base, grade or None, ri)[0]
+
+    refs = [s["price_per_kg"] for s in SCENARIOS.values()]
+    if live_price is not None:
+        refs.append(live_price)
+    area = np.geomspace(*AREA_RANGE, AREA_BUCKETS)
+    price = np.linspace(min(refs) * PRICE_SPAN[0], max(refs) * PRICE_SPAN[1], PRICE_BUCKETS)
+
+    k_costs = table.rootstock_costs[
+        [table.rootstocks.get(rs, table.default_rootstock) for rs in rootstocks]
+    ]
+    return {
+        "varieties": varieties,
+        "rootstocks": rootstocks,
+        "region_grades": region_grades,
+        "area": area,
+        "price": price,
+        "yields": yields,
+        "grade_weights": table.grade_weights[[table.varieties[v] for v in varieties]],
+        "cost_total": float(table.cost_total),
+        "rootstock_costs": k_costs,
+        "live_price": live_price,
+    }
+
+
+def _fingerprint(inputs: dict) -> str:
+    payload = {
+        "format": CUBE_FORMAT,
+        "farm_gate": FARM_GATE_RATIO,
+        "pyeong_to_m2": PYEONG_TO_M2,
+        **{
+            k: (v.tolist() if isinstance(v, np.ndarray) else v)
+            for k, v in inputs.items()
+        },
+    }
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True).encode()
+    return hashlib.sha1(raw).hexdigest()[:16]
+
+
+def _build_cube(inputs: dict) -> np.ndarray:
+    """(V, K, R, A, P, 4) 큐브. 연산 순서는 simulation_kernel.evaluate()와 동일."""
+    area_m2 = inputs["area"] * PYEONG_TO_M2
+    area_10a = area_m2 / 1000
+    yields = inputs["yields"]                                          # (V, K, R)
+    weighted = weighted_price(                                          # (V, R, P)
+        inputs["price"][None, None, :], inputs["grade_weights"][:, :, None, :], FARM_GATE_RATIO,
+    )
+    total_yield = yields[..., None] * area_10a                          # (V, K, R, A)
+    revenue = total_yield[..., None] * weighted[:, None, :, None, :]    # (V, K, R, A, P)
+
+    shape = revenue.shape
+    cost = np.broadcast_to((inputs["cost_total"] * area_10a)[:, None], shape)
+    trees = np.broadcast_to((area_m2 * 0.85 / (5.0 * 3.0))[:, None], shape)
+    infra = np.broadcast_to(
+        (area_10a[None, :] * inputs["rootstock_costs"][:, 1:2])[None, :, None, :, None], shape,
+    )
+    return np.ascontiguousarray(np.stack([revenue, cost, trees, infra], axis=-1))
+
+
+def _assemble(
+    revenue_raw: float, cost_raw: float, trees_raw: float, infra_raw: float,
+    seedling_unit: int, years: int,
+) -> dict:
+    """보간된 1차 값 → simulate()와 같은 절사·연차 규칙으로 결과 조립."""
+    curve = yield_curve_array(YIELD_CURVE, years)
+    annual_revenue = int(revenue_raw)
+    annual_cost = int(cost_raw)
+    trees = int(trees_raw)
+    initial_investment = int(trees * seedling_unit + infra_raw)
+    year_revenue = np.trunc(revenue_raw * curve).astype(np.int64)
+    year_cost = np.trunc(annual_cost * (0.70 + 0.30 * np.minimum(curve, 1.0))).astype(np.int64)
+    year_profit = year_revenue - year_cost
+    cumulative = np.cumsum(year_profit) - initial_investment
+    reached = np.nonzero(cumulative >= 0)[0]
+    annual_profit = annual_revenue - annual_cost
+    return {
+        "total_trees": trees,
+        "annual_revenue": annual_revenue,
+        "annual_cost": annual_cost,
+        "annual_profit": annual_profit,
+        "income_ratio": annual_profit / annual_revenue if annual_revenue > 0 else 0.0,
+        "initial_investment": initial_investment,
+        "break_even_year": int(reached[0]) + 1 if reached.size else years,
+        "roi": int(cumulative[-1]) / initial_investment if initial_investment > 0 else 0.0,
+        "yearly_profit": year_profit.tolist(),
+        "cumulative_profit": cumulative.tolist(),
+    }
+
+
+def _bracket(axis: np.ndarray, x: float) -> tuple[int, float]:
+    """x를 감싸는 격자 구간 시작 인덱스와 보간 가중치."""
+    i = int(np.searchsorted(axis, x, side="right")) - 1
+    i = min(max(i, 0), axis.shape[0] - 2)
+    return i, (x - axis[i]) / (axis[i + 1] - axis[i])
+
+
+class SimulationCube:
+    """메모리 매핑 큐브 + 백그라운드 재구성 관리."""
+
+    def __init__(self, data_dir: Path | None = None) -> None:
+        self._dir = data_dir or _DATA_DIR
+        self._data: np.ndarray | None = None
+        self._meta: dict | None = None
+        self._index: dict[str, dict[str, int]] = {}
+        self._area = np.zeros(0)
+        self._price = np.zeros(0)
+        self._stamp: tuple | None = None
+        self._building = False
+        self._task: asyncio.Task | None = None
+        self._builds = 0
+        self._loads = 0
+        self._last_build_ms = 0.0
+        self._hits = 0
+        self._fallbacks: dict[str, int] = {}
+
+    # ── 신선도 / 재구성 ──
+
+    def is_fresh(self) -> bool:
+        return self._data is not None and self._stamp == _current_stamp()
+
+    def _attach(self, meta: dict, stamp: tuple) -> None:
+        path = self._dir / _CUBE_FILE
+        # 메타는 큐브 교체 후 기록한 .npy mtime을 담는다 — 다르면 두 교체 사이에서 중단된 파일
+        if path.stat().st_mtime_ns != meta.get("cube_mtime_ns"):
+            raise ValueError("큐브 파일이 메타와 다른 빌드")
+        self._data = np.load(path, mmap_mode="r")
+        self._meta = meta
+        self._index = {
+            axis: {name: i for i, name in enumerate(meta[axis])}
+            for axis in ("varieties", "rootstocks", "region_grades")
+        }
+        self._area = np.asarray(meta["area"], dtype=np.float64)
+        self._price = np.asarray(meta["price"], dtype=np.float64)
+        self._stamp = stamp
+
+    def load(self) -> bool:
+        """저장된 큐브 파일이 현재 입력과 같으면 메모리 매핑으로 연결."""
+        stamp = _current_stamp()
+        try:
+            meta = json.loads((self._dir / _META_FILE).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return False
+        if meta.get("fingerprint") != _fingerprint(_cube_inputs()):
+            return False
+        try:
+            self._attach(meta, stamp)
+        except (OSError, ValueError):
+            return False
+        self._loads += 1
+        logger.info("시뮬레이션 큐브 로드: %s (지문 %s)", self._dir / _CUBE_FILE, meta["fingerprint"])
+        return True
+
+    def rebuild(self) -> dict:
+        """큐브 재계산 → 파일 교체(원자적) → 메모리 매핑."""
+        t0 = time.perf_counter()
+        stamp = _current_stamp()
+        inputs = _cube_inputs()
+        cube = _build_cube(inputs)
+        meta = {
+            "format": CUBE_FORMAT,
+            "fingerprint": _fingerprint(inputs),
+            "fields": list(FIELDS),
+            "shape": list(cube.shape),
+            "varieties": inputs["varieties"],
+            "rootstocks": inputs["rootstocks"],
+            "region_grades": inputs["region_grades"],
+            "area": inputs["area"].tolist(),
+            "price": inputs["price"].tolist(),
+            "seedling_unit": inputs["rootstock_costs"][:, 0].tolist(),
+            "live_price": inputs["live_price"],
+            "built_at": datetime.now(timezone.utc).isoformat(),
+        }
+        self._dir.mkdir(parents=True, exist_ok=True)
+        tmp = self._dir / (_CUBE_FILE + ".tmp")
+        meta_tmp = self._dir / (_META_FILE + ".tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, cube)
+        # 큐브 → 메타 순서로 교체 (메타가 커밋 지점). 사이에서 중단되면 이전 메타의
+        # cube_mtime_ns가 새 .npy와 달라 load()가 거부하고 재구성한다
+        os.replace(tmp, self._dir / _CUBE_FILE)
+        meta["cube_mtime_ns"] = (self._dir / _CUBE_FILE).stat().st_mtime_ns
+        meta_tmp.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+        os.replace(meta_tmp, self._dir / _META_FILE)
+        self._attach(meta, stamp)
+        self._builds += 1
+        self._last_build_ms = round((time.perf_counter() - t0) * 1000, 1)
+        logger.info("시뮬레이션 큐브 재구성: %s셀, %.1fms", cube.shape[:-1], self._last_build_ms)
+        return self.get_status()
+
+    def _refresh_sync(self) -> None:
+        if not self.is_fresh() and not self.load():
+            self.rebuild()
+
+    async def refresh(self) -> None:
+        """백그라운드 갱신 — 최신이 아니면 파일 로드, 지문이 다르면 재구성."""
+        if self._building:
+            return
+        self._building = True
+        try:
+            await asyncio.to_thread(self._refresh_sync)
+        except Exception as exc:
+            logger.warning("시뮬레이션 큐브 갱신 실패: %s", exc)
+        finally:
+            self._building = False
+
+    def schedule_refresh(self) -> None:
+        """요청 경로에서 호출 — 이벤트 루프가 있으면 갱신 작업을 띄우고 즉시 반환."""
+        if self._building or (self._task is not None and not self._task.done()):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._task = loop.create_task(self.refresh())
+
+    # ── 조회 ──
+
+    def _fallback(self, reason: str) -> None:
+        self._fallbacks[reason] = self._fallbacks.get(reason, 0) + 1
+
+    def lookup(
+        self, variety: str, rootstock_id: str | None, region_grade: str | None,
+        area_pyeong: float, price_per_kg: float, years: int,
+    ) -> dict | None:
+        """격자 내 요청이면 보간 결과, 아니면 None (호출자가 정확 계산)."""
+        if not self.is_fresh():
+            self.schedule_refresh()
+            self._fallback("stale")
+            return None
+        meta = self._meta
+        v = self._index["varieties"].get(variety)
+        k = self._index["rootstocks"].get(rootstock_id or "")
+        r = self._index["region_grades"].get(region_grade or "")
+        if v is None or k is None or r is None:
+            self._fallback("axis")
+            return None
+        area, price = self._area, self._price
+        if not (area[0] <= area_pyeong <= area[-1] and price[0] <= price_per_kg <= price[-1]):
+            self._fallback("range")
+            return None
+        if years < 1:
+            self._fallback("years")
+            return None
+
+        ia, wa = _bracket(area, area_pyeong)
+        ip, wp = _bracket(price, price_per_kg)
+        block = np.asarray(self._data[v, k, r, ia:ia + 2, ip:ip + 2])   # (2, 2, F)
+        weights = np.array([[(1 - wa) * (1 - wp), (1 - wa) * wp], [wa * (1 - wp), wa * wp]])
+        values = np.tensordot(weights, block, axes=([0, 1], [0, 1]))
+        self._hits += 1
+        return _assemble(*values.tolist(), int(meta["seedling_unit"][k]), years)
+
+    def get_status(self) -> dict:
+        meta = self._meta or {}
+        return {
+            "ready": self._data is not None,
+            "fresh": self.is_fresh(),
+            "building": self._building,
+            "path": str(self._dir / _CUBE_FILE),
+            "shape": meta.get("shape"),
+            "bytes": int(self._data.nbytes) if self._data is not None else 0,
+            "fingerprint": meta.get("fingerprint"),
+            "built_at": meta.get("built_at"),
+            "area_range": [meta["area"][0], meta["area"][-1]] if meta else None,
+            "price_range": [meta["price"][0], meta["price"][-1]] if meta else None,
+            "builds": self._builds,
+            "loads": self._loads,
+            "last_build_ms": self._last_build_ms,
+            "hits": self._hits,
+            "fallbacks": dict(self._fallbacks),
+        }
+
+
+def _exact(req: SimulationRequest) -> tuple[dict, dict]:
+    """격자 밖 요청: 벡터 커널 1행 계산."""
+    inputs = resolve_kernel_inputs([req])
+    k = evaluate(**inputs["kernel_args"])
+    years = max(req.projection_years, 0)
+    return {
+        "total_trees": int(k.total_trees[0]),
+        "annual_revenue": int(k.annual_revenue[0]),
+        "annual_cost": int(k.annual_cost[0]),
+        "annual_profit": int(k.annual_profit[0]),
+        "income_ratio": float(k.income_ratio[0]),
+        "initial_investment": int(k.initial_investment[0]),
+        "break_even_year": int(k.break_even_year[0]),
+        "roi": float(k.roi[0]),
+        "yearly_profit": k.year_profit[0, :years].tolist(),
+        "cumulative_profit": k.cumulative_profit[0, :years].tolist(),
+    }, {
+        "price_per_kg": inputs["price_col"][0],
+        "price_source": inputs["price_sources"][0],
+        "region_grade": inputs["grade_col"][0],
+    }
+
+
+def quick_simulate(req: SimulationRequest) -> QuickSimulationResponse:
+    """슬라이더용 요약 시뮬레이션 — 큐브 보간 우선, 격자 밖이면 정확 계산."""
+    cube = get_simulation_cube()
+    result = None
+    context: dict = {}
+    if not req.yield_per_10a and not req.total_trees and req.variety in SCENARIOS:
+        scenario = SCENARIOS[req.variety]
+        live_price = None if req.price_per_kg else _get_live_price()
+        price_per_kg, price_source = _resolve_price(req, scenario, live_price)
+        region_grade = _lookup_region_grade(req.region_id)
+        context = {"price_per_kg": price_per_kg, "price_source": price_source, "region_grade": region_grade}
+        result = cube.lookup(
+            req.variety, req.rootstock_id, region_grade, req.area_pyeong, price_per_kg,
+            req.projection_years,
+        )
+    else:
+        cube._fallback("override")
+    source = "cube"
+    if result is None:
+        result, context = _exact(req)
+        source = "exact"
+
+    roi = result.pop("roi")
+    result["income_ratio"] = round(result["income_ratio"], 3)
+    return QuickSimulationResponse(
+        variety=req.variety,
+        area_pyeong=req.area_pyeong,
+        rootstock_id=req.rootstock_id,
+        source=source,
+        roi_10year=round(roi, 2),
+        **result,
+        **context,
+    )
+
+
+# 싱글턴 인스턴스
+_cube = SimulationCube()
+
+
+def get_simulation_cube() -> SimulationCube:
+    return _cube
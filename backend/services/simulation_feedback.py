@@ -1,40 +1,98 @@
 """
 시뮬레이션 피드백 수집 서비스 (feedback-system R48).
 
-JSON 파일 기반 영속화. DB 마이그레이션 없이 즉시 사용 가능.
+추가 전용 JSONL 로그(simulation_feedback.jsonl) + 메모리 증분 통계.
+제출은 한 줄 append, 통계(품종별 카운트·helpful 비율·최근 이슈 링)는 기록 시점에 갱신한다.
+기존 JSON 배열 파일(simulation_feedback.json)은 첫 기동 때 한 번 로그로 옮기고
+simulation_feedback.json.migrated로 보존한다.
 """
 
 import json
-from collections import defaultdict
+import logging
+import os
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Optional
 
+from core.log_writer import get_log_writer
+
+logger = logging.getLogger(__name__)
 
 _DATA_DIR = Path(__file__).resolve().parent.parent / "data" / "feedback"
+RECENT_WINDOW = 10  # 최근 이슈 판단 대상 (마지막 N건)
 
 
 class SimulationFeedbackCollector:
-    """JSON 파일 기반 시뮬레이션 피드백 수집기."""
+    """JSONL 추가 전용 로그 기반 시뮬레이션 피드백 수집기."""
 
     def __init__(self, data_dir: Optional[Path] = None):
         self._dir = data_dir or _DATA_DIR
         self._dir.mkdir(parents=True, exist_ok=True)
-        self._file = self._dir / "simulation_feedback.json"
-
-    def _load(self) -> List[dict]:
-        if self._file.exists():
-            try:
-                return json.loads(self._file.read_text(encoding="utf-8"))
-            except (json.JSONDecodeError, OSError):
-                return []
-        return []
-
-    def _save(self, data: List[dict]) -> None:
-        self._file.write_text(
-            json.dumps(data, ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
+        self._file = self._dir / "simulation_feedback.jsonl"
+        self._legacy_file = self._dir / "simulation_feedback.json"
+        self._total = 0
+        self._helpful = 0
+        self._variety_counts: Dict[str, Dict[str, int]] = {}
+        self._recent: deque = deque(maxlen=RECENT_WINDOW)  # (rating, comment)
+        self._migrate_legacy()
+        self._replay()
+
+    # ── 적재 ──
+
+    def _migrate_legacy(self) -> None:
+        """JSON 배열 → JSONL 일회성 이전 (기존 로그가 있으면 그 앞에 붙임)."""
+        if not self._legacy_file.exists():
+            return
+        try:
+            data = json.loads(self._legacy_file.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning("피드백 JSON 이전 실패 (원본 유지): %s", e)
+            return
+        if not isinstance(data, list):
+            data = []
+        get_log_writer().flush(self._file)
+        tail = self._file.read_bytes() if self._file.exists() else b""
+        tmp = self._file.with_name(self._file.name + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in data).encode("utf-8"))
+            f.write(tail)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._file)
+        os.replace(self._legacy_file, self._legacy_file.with_name(self._legacy_file.name + ".migrated"))
+        logger.info("피드백 %d건 JSONL로 이전 완료: %s", len(data), self._file)
+
+    def _replay(self) -> None:
+        get_log_writer().flush(self._file)
+        if not self._file.exists():
+            return
+        with open(self._file, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    self._apply(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+
+    def _apply(self, entry: dict) -> None:
+        """통계 증분 갱신."""
+        rating = entry.get("rating", "unknown")
+        self._total += 1
+        if rating == "helpful":
+            self._helpful += 1
+        variety = entry.get("variety", "unknown")
+        counts = self._variety_counts.get(variety)
+        if counts is None:
+            counts = self._variety_counts[variety] = {
+                "helpful": 0, "inaccurate": 0, "needs_detail": 0, "total": 0,
+            }
+        counts[rating] = counts.get(rating, 0) + 1
+        counts["total"] += 1
+        self._recent.append((rating, entry.get("comment")))
+
+    # ── 공개 API ──
 
     def submit(
         self,
@@ -51,39 +109,23 @@ class SimulationFeedbackCollector:
             "comment": comment,
             "timestamp": datetime.now().isoformat(),
         }
-        data = self._load()
-        data.append(entry)
-        self._save(data)
+        get_log_writer().append(self._file, entry)
+        self._apply(entry)
         return entry
 
     def get_stats(self) -> dict:
         """전체 피드백 통계."""
-        data = self._load()
-        if not data:
+        if not self._total:
             return {"total": 0, "helpful_rate": 0.0, "recent_issues": [], "variety_breakdown": {}}
 
-        total = len(data)
-        helpful = sum(1 for f in data if f["rating"] == "helpful")
-
-        variety_counts: Dict[str, Dict[str, int]] = defaultdict(
-            lambda: {"helpful": 0, "inaccurate": 0, "needs_detail": 0, "total": 0}
-        )
-        for f in data:
-            v = f.get("variety", "unknown")
-            variety_counts[v][f.get("rating", "unknown")] += 1
-            variety_counts[v]["total"] += 1
-
-        recent_issues = [
-            f["comment"]
-            for f in data[-10:]
-            if f.get("rating") != "helpful" and f.get("comment")
-        ]
-
         return {
-            "total": total,
-            "helpful_rate": round(helpful / total, 2),
-            "recent_issues": recent_issues,
-            "variety_breakdown": dict(variety_counts),
+            "total": self._total,
+            "helpful_rate": round(self._helpful / self._total, 2),
+            "recent_issues": [
+                comment for rating, comment in self._recent
+                if rating != "helpful" and comment
+            ],
+            "variety_breakdown": {v: dict(c) for v, c in self._variety_counts.items()},
         }
 
 
@@ -0,0 +1,213 @@
+"""시뮬레이션 벡터 커널 (NumPy).
+
+simulate()의 산식을 N건의 입력 배열에 대해 한 번에 계산한다.
+배치 실행·시나리오 비교·민감도 분석 등 다건 평가 경로가 공유하는 단일 산식.
+
+정합성 원칙:
+  - 연산 순서와 정수 절사(int())를 simulate()와 동일하게 유지 → 결과 비트 단위 일치
+  - 반올림(round)은 응답 조립 단계에서 파이썬 round()로 수행 (np.round와 경계값 차이 방지)
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class KernelResult:
+    """커널 출력 (모든 배열의 첫 축 = 입력 행 N)."""
+    area_10a: np.ndarray            # (N,) float
+    total_trees: np.ndarray         # (N,) int
+    total_yield: np.ndarray         # (N,) float — 성목 기준 총 수확량(kg)
+    weighted_price: np.ndarray      # (N,) float — 농가 수취 가중 단가
+    annual_revenue: np.ndarray      # (N,) int
+    annual_cost: np.ndarray         # (N,) int
+    annual_profit: np.ndarray       # (N,) int
+    income_ratio: np.ndarray        # (N,) float (미반올림)
+    cost_amounts: np.ndarray        # (N, C) int — 항목별 비용
+    seedling_cost: np.ndarray       # (N,) int
+    infra_cost: np.ndarray          # (N,) int
+    initial_investment: np.ndarray  # (N,) int
+    yield_ratio: np.ndarray         # (N, Y) float
+    year_yield: np.ndarray          # (N, Y) float
+    year_revenue: np.ndarray        # (N, Y) int
+    year_cost: np.ndarray           # (N, Y) int
+    year_profit: np.ndarray         # (N, Y) int (projection_years 밖은 0)
+    cumulative_profit: np.ndarray   # (N, Y) int — 초기투자 차감 누적
+    year_mask: np.ndarray           # (N, Y) bool — projection_years 이내 여부
+    break_even_year: np.ndarray     # (N,) int
+    final_cumulative: np.ndarray    # (N,) int — 기간 말 누적이익
+    roi: np.ndarray                 # (N,) float (미반올림)
+
+
+def yield_curve_array(curve: dict[int, float], years: int) -> np.ndarray:
+    """YIELD_CURVE 딕셔너리 → 1..years 연차별 수확비율 배열 (미정의 연차 1.0)."""
+    return np.array([curve.get(y, 1.0) for y in range(1, years + 1)], dtype=np.float64)
+
+
+def ramped_yield_curve(curve: dict[int, float], years: int, speed: np.ndarray) -> np.ndarray:
+    """유목기 진행 속도를 바꾼 수확비율 곡선 (M, years).
+
+    speed > 1 이면 성목 도달이 빠르고, < 1 이면 느리다. n년차 비율 = 원 곡선의 (n × speed)년차
+    선형 보간값 (0년차 = 0, 정의 구간 밖 = 1.0). speed = 1이면 yield_curve_array와 같다.
+    """
+    knots = sorted(curve)
+    xp = np.array([0] + knots, dtype=np.float64)
+    fp = np.array([0.0] + [curve[y] for y in knots], dtype=np.float64)
+    t = np.arange(1, years + 1, dtype=np.float64)[None, :] * np.asarray(speed, dtype=np.float64)[:, None]
+    return np.interp(t, xp, fp, right=1.0)
+
+
+def _trunc_int(x: np.ndarray) -> np.ndarray:
+    """파이썬 int(float)와 동일한 0 방향 절사."""
+    return np.trunc(x).astype(np.int64)
+
+
+def weighted_price(
+    price_per_kg: np.ndarray, grade_weights: np.ndarray, farm_gate_ratio: float | np.ndarray,
+) -> np.ndarray:
+    """농가 수취 가중 단가 Σ(weight × price) × farm_gate — simulate()와 같은 등급 순차 합산.
+
+    price_per_kg의 형태에 grade_weights의 마지막 축(G)을 맞춰 브로드캐스트한다.
+    """
+    acc = 0.0
+    for g in range(grade_weights.shape[-1]):
+        acc = acc + grade_weights[..., g] * price_per_kg
+    return acc * farm_gate_ratio
+
+
+def evaluate(
+    *,
+    yield_per_10a: np.ndarray,
+    price_per_kg: np.ndarray,
+    grade_weights: np.ndarray,
+    area_pyeong: np.ndarray,
+    total_trees: np.ndarray,
+    seedling_unit: np.ndarray,
+    infra_per_10a: np.ndarray,
+    projection_years: np.ndarray,
+    cost_items: np.ndarray,
+    yield_curve: np.ndarray,
+    farm_gate_ratio: float | np.ndarray,
+    pyeong_to_m2: float,
+    cost_growth: np.ndarray | None = None,
+) -> KernelResult:
+    """N건 시뮬레이션을 한 번에 평가.
+
+    Args:
+        yield_per_10a: (N,) 급지 보정까지 반영된 10a당 수확량.
+        price_per_kg: (N,) 경매가 기준 kg당 가격.
+        grade_weights: (N, G) 등급별 ratio × multiplier — 시나리오 테이블 값.
+        area_pyeong: (N,) 면적(평).
+        total_trees: (N,) 나무 수. 0이면 기본 식재 밀도로 추정.
+        seedling_unit / infra_per_10a: (N,) 대목별 묘목 단가, 10a당 인프라비.
+        projection_years: (N,) 전망 연수.
+        cost_items: (C,) 또는 (N, C) 10a당 비용 항목.
+        yield_curve: (Y,) 또는 (N, Y) 연차별 수확비율. Y >= max(projection_years).
+        farm_gate_ratio: 스칼라 또는 (N,) 농가 수취 비율.
+        cost_growth: (N,) 연간 비용 상승률. n년차 비용에 (1+g)^(n-1)을 곱한다.
+            None이면 simulate()와 같이 비용 수준 고정.
+    """
+    yield_per_10a = np.asarray(yield_per_10a, dtype=np.float64)
+    n = yield_per_10a.shape[0]
+    price_per_kg = np.asarray(price_per_kg, dtype=np.float64)
+    grade_weights = np.asarray(grade_weights, dtype=np.float64)
+    area_pyeong = np.asarray(area_pyeong, dtype=np.float64)
+    projection_years = np.asarray(projection_years, dtype=np.int64)
+    cost_items = np.asarray(cost_items)
+    farm_gate = np.broadcast_to(np.asarray(farm_gate_ratio, dtype=np.float64), (n,))
+
+    years = int(projection_years.max()) if n else 0
+    years = max(years, 0)
+    curve = np.asarray(yield_curve, dtype=np.float64)
+    curve = np.broadcast_to(curve[..., :years], (n, years))
+
+    # 면적
+    area_m2 = area_pyeong * pyeong_to_m2
+    area_10a = area_m2 / 1000
+
+    # 연간 매출 (성목 기준): Σ(등급 가중 × 가격) × 농가 수취 비율
+    total_yield = yield_per_10a * area_10a
+    weighted = weighted_price(price_per_kg, grade_weights, farm_gate)
+    annual_revenue = _trunc_int(total_yield * weighted)
+
+    # 연간 비용
+    if cost_items.ndim == 1:
+        cost_total = cost_items.sum()
+        cost_amounts = _trunc_int(cost_items[None, :] * area_10a[:, None])
+    else:
+        cost_total = cost_items.sum(axis=1)
+        cost_amounts = _trunc_int(cost_items * area_10a[:, None])
+    annual_cost = _trunc_int(cost_total * area_10a)
+    annual_profit = annual_revenue - annual_cost
+    with np.errstate(divide="ignore", invalid="ignore"):
+        income_ratio = np.where(
+            annual_revenue > 0, annual_profit / np.maximum(annual_revenue, 1), 0.0,
+        )
+
+    # 나무 수 (간격 5m x 3m, 유효면적 85%) + 초기 투자
+    trees_given = np.asarray(total_trees, dtype=np.int64)
+    trees = np.where(trees_given != 0, trees_given, _trunc_int(area_m2 * 0.85 / (5.0 * 3.0)))
+    seedling_unit = np.asarray(seedling_unit, dtype=np.int64)
+    infra_per_10a = np.asarray(infra_per_10a, dtype=np.float64)
+    seedling_total = trees * seedling_unit
+    infra_raw = area_10a * infra_per_10a
+    initial_investment = _trunc_int(seedling_total + infra_raw)
+    seedling_cost = seedling_total
+    infra_cost = _trunc_int(infra_raw)
+
+    # 연도별 추이
+    year_yield = total_yield[:, None] * curve
+    year_revenue = _trunc_int(year_yield * weighted[:, None])
+    cost_ratio = 0.70 + 0.30 * np.minimum(curve, 1.0)
+    year_index = np.arange(1, years + 1, dtype=np.int64)
+    if cost_growth is None:
+        year_cost = _trunc_int(annual_cost[:, None] * cost_ratio)
+    else:
+        growth = np.asarray(cost_growth, dtype=np.float64)
+        escalation = (1.0 + growth[:, None]) ** (year_index[None, :] - 1)
+        year_cost = _trunc_int(annual_cost[:, None] * cost_ratio * escalation)
+    year_mask = year_index[None, :] <= projection_years[:, None]
+    year_profit = np.where(year_mask, year_revenue - year_cost, 0)
+    cumulative_profit = np.cumsum(year_profit, axis=1) - initial_investment[:, None]
+
+    # 손익분기: 누적이익 >= 0 이 되는 첫 연차 (없으면 projection_years)
+    reached = (cumulative_profit >= 0) & year_mask
+    first = np.argmax(reached, axis=1) + 1 if years else np.zeros(n, dtype=np.int64)
+    break_even_year = np.where(
+        reached.any(axis=1) if years else np.zeros(n, dtype=bool),
+        first, projection_years,
+    )
+
+    final_cumulative = year_profit.sum(axis=1) - initial_investment
+    with np.errstate(divide="ignore", invalid="ignore"):
+        roi = np.where(
+            initial_investment > 0,
+            final_cumulative / np.maximum(initial_investment, 1), 0.0,
+        )
+
+    return KernelResult(
+        area_10a=area_10a,
+        total_trees=trees,
+        total_yield=total_yield,
+        weighted_price=weighted,
+        annual_revenue=annual_revenue,
+        annual_cost=annual_cost,
+        annual_profit=annual_profit,
+        income_ratio=income_ratio,
+        cost_amounts=cost_amounts,
+        seedling_cost=seedling_cost,
+        infra_cost=infra_cost,
+        initial_investment=initial_investment,
+        yield_ratio=np.ascontiguousarray(curve),
+        year_yield=year_yield,
+        year_revenue=year_revenue,
+        year_cost=year_cost,
+        year_profit=year_profit,
+        cumulative_profit=cumulative_profit,
+        year_mask=year_mask,
+        break_even_year=break_even_year.astype(np.int64),
+        final_cumulative=final_cumulative,
+        roi=roi,
+    )
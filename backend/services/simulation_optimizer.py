@@ -0,0 +1,268 @@
+"""
+식재 포트폴리오 최적화 (품종 × 대목 × 급지, 혼합 식재).
+
+주어진 면적·예산에서 어떤 품종/대목을 어떤 비율로 심을지 탐색한다.
+
+  1. 단위 평가: (급지, 품종, 대목, 면적 비율) 단위를 기준·하방 시나리오로
+     벡터 커널 1회에 평가 → 연차별 이익, 초기투자, NPV
+  2. 조기 가지치기: 단독 초기투자가 예산을 넘는 단위 제외 (투자는 가산이므로 어떤 계획에도 불가)
+  3. 혼합 계획: 서로 다른 품종 최대 max_varieties개, 비율 합 1 — 단위 지표의 합으로 조립
+     (NPV·하방NPV·투자·연차별 이익은 면적 단위별로 가산). 조립 전 계획 수가
+     MAX_PLANS를 넘으면 ValueError (split_step을 키우거나 품종 수를 줄이도록 안내)
+  4. 예산 필터 → 급지별 NPV·ROI·하방NPV 파레토 비지배 계획만 남겨 목적함수 순으로 정렬
+"""
+
+from __future__ import annotations
+
+import bisect
+import itertools
+import logging
+
+import numpy as np
+
+from schemas.simulation import (
+    OptimizeRequest,
+    OptimizeResponse,
+    PlanComponent,
+    PortfolioPlan,
+    SimulationRequest,
+)
+from services.simulation import (
+    FARM_GATE_RATIO,
+    GRADE_MODIFIERS,
+    PYEONG_TO_M2,
+    ROOTSTOCK_COSTS,
+    SCENARIOS,
+    YIELD_CURVE,
+    get_scenario_table,
+    resolve_kernel_inputs,
+)
+from services.simulation_kernel import evaluate, yield_curve_array
+
+logger = logging.getLogger(__name__)
+
+MAX_PLANS = 250_000   # 조립 계획 수 상한 (≈1초 — split_step 0.1 × 3품종 × 4급지가 약 19만)
+
+
+def _split_patterns(parts: int, step: float) -> list[tuple[float, ...]]:
+    """합이 1인 parts개 양수 비율 (step 단위)."""
+    units = max(int(round(1 / step)), 1)
+    return [
+        tuple(c / units for c in combo)
+        for combo in itertools.product(range(1, units + 1), repeat=parts)
+        if sum(combo) == units
+    ]
+
+
+def _resolve_grades(req: OptimizeRequest) -> list[str]:
+    if req.region_id:
+        from services.simulation import _lookup_region_grade
+        grade = _lookup_region_grade(req.region_id)
+        return [grade.value if hasattr(grade, "value") else grade] if grade else [""]
+    grades = req.region_grades or list(GRADE_MODIFIERS)
+    return [g for g in grades if g in GRADE_MODIFIERS] or [""]
+
+
+def _pareto_mask(npv: np.ndarray, roi: np.ndarray, downside: np.ndarray) -> np.ndarray:
+    """3목적(최대화) 비지배 여부. NPV 내림차순 스윕 + (ROI, 하방NPV) 계단 구조."""
+    order = np.lexsort((-downside, -roi, -npv))
+    keep = np.zeros(npv.shape[0], dtype=bool)
+    # 계단: ROI 내림차순, 하방NPV 오름차순 (neg_roi 오름차순 리스트)
+    stair_neg_roi: list[float] = []
+    stair_down: list[float] = []
+    for i in order.tolist():
+        r, d = roi[i], downside[i]
+        pos = bisect.bisect_right(stair_neg_roi, -r)   # ROI >= r 인 접두부
+        if pos and stair_down[pos - 1] >= d:
+            continue  # NPV·ROI·하방NPV 모두 같거나 큰 계획이 이미 있음
+        keep[i] = True
+        # 새 점이 지배하는 (ROI <= r, 하방 <= d) 점 제거 — 접두부 뒤 연속 구간
+        end = pos
+        while end < len(stair_down) and stair_down[end] <= d:
+            end += 1
+        stair_neg_roi[pos:end] = [-r]
+        stair_down[pos:end] = [d]
+    return keep
+
+
+def optimize_portfolio(req: OptimizeRequest) -> OptimizeResponse:
+    """품종·대목·급지·혼합 비율 전 조합 탐색 → 비지배 상위 계획."""
+    table = get_scenario_table()
+    varieties = [v for v in (req.varieties or list(SCENARIOS)) if v in SCENARIOS]
+    rootstocks = [k for k in (req.rootstocks or list(ROOTSTOCK_COSTS)) if k in ROOTSTOCK_COSTS]
+    grades = _resolve_grades(req)
+    max_parts = min(req.max_varieties, len(varieties)) or 1
+    step = req.split_step
+    years = req.projection_years
+    objective = req.objective
+
+    shares = sorted({s for parts in range(1, max_parts + 1)
+                     for pattern in _split_patterns(parts, step) for s in pattern})
+
+    # ── 1. 기준 입력 (품종 × 대목): simulate()와 같은 수확량 SSOT·시세 규칙 ──
+    pairs = [(v, k) for v in varieties for k in rootstocks]
+    if not pairs:
+        unknown = [v for v in req.varieties or [] if v not in SCENARIOS]
+        unknown += [k for k in req.rootstocks or [] if k not in ROOTSTOCK_COSTS]
+        raise ValueError(f"후보 품종·대목 조합 없음 — 알 수 없는 이름: {', '.join(unknown)}")
+    base = resolve_kernel_inputs([
+        SimulationRequest(variety=v, area_pyeong=req.area_pyeong, rootstock_id=k,
+                          price_per_kg=req.price_per_kg, projection_years=years)
+        for v, k in pairs
+    ])["kernel_args"]
+
+    # 단위 축: (급지 G, 품종×대목 P, 비율 S, 시나리오 2)
+    n_g, n_p, n_s = len(grades), len(pairs), len(shares)
+    r_idx = np.array([table.region_grades.get(g, 0) for g in grades])
+    v_idx = np.array([table.varieties[v] for v, _ in pairs])
+    shape = (n_g, n_p, n_s, 2)
+
+    yield_base = base["yield_per_10a"][None, :]
+    adjusted = np.where(
+        r_idx[:, None] > 0, np.rint(yield_base * table.yield_factor[r_idx][:, None]), yield_base,
+    )                                                                   # (G, P)
+    stress = np.array([1.0, req.stress_yield]), np.array([1.0, req.stress_price])
+    yield_arr = adjusted[:, :, None, None] * stress[0][None, None, None, :]
+    price_arr = base["price_per_kg"][None, :, None, None] * stress[1][None, None, None, :]
+    area_arr = np.array(shares)[None, None, :, None] * req.area_pyeong
+    gw_arr = table.grade_weights[v_idx[None, :], r_idx[:, None]][:, :, None, None, :]  # (G, P, 1, 1, W)
+
+    def _flat(x, dtype=np.float64):
+        return np.broadcast_to(x, shape).reshape(-1).astype(dtype)
+
+    k = evaluate(
+        yield_per_10a=_flat(yield_arr),
+        price_per_kg=_flat(price_arr),
+        grade_weights=np.broadcast_to(gw_arr, shape + gw_arr.shape[-1:]).reshape(-1, gw_arr.shape[-1]),
+        area_pyeong=_flat(area_arr),
+        total_trees=np.zeros(int(np.prod(shape)), dtype=np.int64),
+        seedling_unit=_flat(base["seedling_unit"][None, :, None, None], np.int64),
+        infra_per_10a=_flat(base["infra_per_10a"][None, :, None, None]),
+        projection_years=np.full(int(np.prod(shape)), years, dtype=np.int64),
+        cost_items=table.cost_amounts,
+        yield_curve=yield_curve_array(YIELD_CURVE, years),
+        farm_gate_ratio=FARM_GATE_RATIO,
+        pyeong_to_m2=PYEONG_TO_M2,
+    )
+
+    discount = (1.0 + req.discount_rate) ** -np.arange(1, years + 1, dtype=np.float64)
+    yearly = k.year_profit.reshape(n_g, n_p, n_s, 2, years)
+    invest = k.initial_investment.reshape(shape)[..., 0]                 # (G, P, S)
+    npv = (yearly @ discount) - k.initial_investment.reshape(shape)     # (G, P, S, 2)
+    unit_npv, unit_down = npv[..., 0], npv[..., 1]
+    unit_yearly = yearly[..., 0, :]                                      # (G, P, S, Y)
+
+    # ── 2. 조기 가지치기: 단독으로 예산을 넘는 단위는 어떤 혼합 계획에도 들어갈 수 없다 ──
+    alive = np.ones((n_g, n_p, n_s), dtype=bool)
+    if req.budget is not None:
+        alive &= invest <= req.budget
+    pruned = int((~alive).sum())
+    by_variety: dict[str, list[int]] = {}
+    for p, (v, _) in enumerate(pairs):
+        by_variety.setdefault(v, []).append(p)
+
+    # ── 3. 계획 조립: 단위 id 묶음 (최대 max_parts개, -1 = 빈칸) ──
+    share_pos = {s: i for i, s in enumerate(shares)}
+    alive_count = {v: alive[:, ps, :].sum(axis=1) for v, ps in by_variety.items()}  # (G, S)
+    n_plans = sum(
+        int(np.prod([alive_count[v][:, share_pos[s]] for v, s in zip(combo, pattern)], axis=0).sum())
+        for parts in range(1, max_parts + 1)
+        for pattern in _split_patterns(parts, step)
+        for combo in itertools.combinations(list(by_variety), parts)
+    )
+    if n_plans > MAX_PLANS:
+        raise ValueError(
+            f"탐색할 계획 {n_plans:,}개 > 상한 {MAX_PLANS:,}개 — split_step을 키우거나 "
+            "max_varieties·후보 품종·급지를 줄이세요",
+        )
+    plan_rows: list[tuple[int, ...]] = []
+    plan_grade: list[int] = []
+    for g in range(n_g):
+        for parts in range(1, max_parts + 1):
+            patterns = _split_patterns(parts, step)
+            for combo in itertools.combinations(list(by_variety), parts):
+                options = [by_variety[v] for v in combo]
+                for pattern in patterns:
+                    s_idx = [share_pos[s] for s in pattern]
+                    per_slot = [
+                        [p for p in opts if alive[g, p, s]]
+                        for opts, s in zip(options, s_idx)
+                    ]
+                    for choice in itertools.product(*per_slot):
+                        unit_ids = [
+                            (g * n_p + p) * n_s + s for p, s in zip(choice, s_idx)
+                        ]
+                        plan_rows.append(tuple(unit_ids) + (-1,) * (max_parts - parts))
+                        plan_grade.append(g)
+
+    ids = np.array(plan_rows, dtype=np.int64).reshape(-1, max_parts)
+    valid = ids >= 0
+    safe = np.where(valid, ids, 0)
+
+    def _gather(flat: np.ndarray) -> np.ndarray:
+        return np.where(valid, flat[safe], 0).sum(axis=1)
+
+    plan_npv = _gather(unit_npv.reshape(-1))
+    plan_down = _gather(unit_down.reshape(-1))
+    plan_invest = _gather(invest.reshape(-1))
+    plan_yearly = (unit_yearly.reshape(-1, years)[safe] * valid[:, :, None]).sum(axis=1)
+    plan_total = plan_yearly.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plan_roi = np.where(
+            plan_invest > 0, (plan_total - plan_invest) / np.maximum(plan_invest, 1), 0.0,
+        )
+    cumulative = np.cumsum(plan_yearly, axis=1) - plan_invest[:, None]
+    reached = cumulative >= 0
+    plan_be = np.where(reached.any(axis=1), np.argmax(reached, axis=1) + 1, years)
+
+    # ── 4. 예산 → 파레토 → 목적함수 정렬 ──
+    feasible = np.ones(ids.shape[0], dtype=bool)
+    if req.budget is not None:
+        feasible &= plan_invest <= req.budget
+    cand = np.nonzero(feasible)[0]
+    # 급지는 필지 속성이므로 급지별로 비지배 계획을 구한다
+    grade_of = np.array(plan_grade, dtype=np.int64)
+    fronts = []
+    for g in range(n_g):
+        sub = cand[grade_of[cand] == g]
+        if sub.size:
+            fronts.append(sub[_pareto_mask(
+                plan_npv[sub].astype(np.float64), plan_roi[sub], plan_down[sub].astype(np.float64),
+            )])
+    front = np.concatenate(fronts) if fronts else cand
+    key = {"npv": plan_npv, "roi": plan_roi, "downside_npv": plan_down}[objective]
+    ranked = front[np.argsort(-key[front], kind="stable")][: max(req.top_n, 1)]
+
+    plans = []
+    for i in ranked.tolist():
+        components = []
+        for uid in ids[i][valid[i]].tolist():
+            _, p, s = np.unravel_index(uid, (n_g, n_p, n_s))
+            variety, rootstock = pairs[int(p)]
+            components.append(PlanComponent(
+                variety=variety,
+                rootstock_id=rootstock,
+                share=shares[int(s)],
+                area_pyeong=round(shares[int(s)] * req.area_pyeong, 1),
+            ))
+        plans.append(PortfolioPlan(
+            region_grade=grades[plan_grade[i]] or None,
+            components=components,
+            npv=int(plan_npv[i]),
+            downside_npv=int(plan_down[i]),
+            roi_10year=round(float(plan_roi[i]), 2),
+            total_profit=int(plan_total[i]),
+            initial_investment=int(plan_invest[i]),
+            break_even_year=int(plan_be[i]),
+        ))
+
+    return OptimizeResponse(
+        area_pyeong=req.area_pyeong,
+        budget=req.budget,
+        objective=objective,
+        evaluated_plans=int(ids.shape[0]),
+        pruned_components=pruned,
+        feasible_plans=int(cand.size),
+        pareto_plans=int(front.size),
+        plans=plans,
+    )
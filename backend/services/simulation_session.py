@@ -0,0 +1,240 @@
+"""
+What-if 시뮬레이션 세션 (WebSocket 증분 재계산).
+
+대화형 편집은 매번 SimulationRequest 전체를 다시 보내 급지 조회
+(get_orchard_grader().grade_region)와 검증까지 전부 재실행한다.
+세션은 simulate()의 단계별 중간 결과를 보관하고, 편집된 필드가 영향을 주는
+단계만 다시 계산한다.
+
+단계 의존 그래프 (괄호 = 입력 키):
+  region      (region_id, 기능 플래그 버전)          → 급지 등급
+  base_yield  (variety, rootstock_id, yield_per_10a)  → SSOT 수확량
+  grade       (variety, base_yield, region, 테이블)   → 보정 수확량·등급 비율·grade_impact
+  price       (variety, price_per_kg, 시세 버전)      → 가격·출처
+  revenue     (grade, price, area)                    → 총수확량·가중 단가·연간 매출
+  cost        (area)                                  → 항목별 비용·연간 비용
+  investment  (area, total_trees, rootstock_id)       → 나무 수·초기 투자
+  projection  (revenue, cost, investment, years)      → 연도별 추이·손익분기·ROI
+  validation  (전 단계, 검증기 CONFIG 지문)           → 검증 노트
+
+각 단계는 입력 키가 이전과 같으면 저장된 값을 재사용한다.
+검증 노트는 보고만 하고 /run의 자동 보정(refine)은 적용하지 않는다 — 사용자가 편집 중인
+입력을 서버가 바꾸지 않기 위함.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Callable
+
+from schemas.simulation import SimulationRequest, SimulationResponse
+from services.simulation import (
+    PYEONG_TO_M2,
+    SCENARIOS,
+    VARIETY_NAME_TO_ID,
+    _cost_stage,
+    _get_live_price,
+    _grade_adjusted_yield,
+    _grade_distribution,
+    _investment_stage,
+    _lookup_region_grade,
+    _projection_stage,
+    _resolve_base_yield,
+    _resolve_price,
+    _revenue_stage,
+    _table_indices,
+    get_scenario_table,
+)
+
+logger = logging.getLogger(__name__)
+
+STAGES = (
+    "region", "base_yield", "grade", "price", "revenue",
+    "cost", "investment", "projection", "validation",
+)
+
+
+class StaleComputation(Exception):
+    """더 새로운 편집이 도착해 현재 계산이 무의미해짐."""
+
+
+class SimulationSession:
+    """세션 1개의 입력 상태 + 단계별 (입력 키, 결과) 저장소."""
+
+    def __init__(self, session_id: str) -> None:
+        self.session_id = session_id
+        self.fields: dict[str, Any] = {}
+        self.seq = 0                     # 편집 일련번호 (최신 편집만 응답)
+        self._stages: dict[str, tuple[tuple, Any]] = {}
+        self.computations = 0
+        self.superseded = 0
+        self.stage_runs = {name: 0 for name in STAGES}
+
+    def apply(self, changes: dict[str, Any], replace: bool = False) -> tuple[int, SimulationRequest]:
+        """편집 반영 → (새 일련번호, 검증된 요청). 잘못된 입력이면 ValidationError."""
+        fields = dict(changes) if replace else {**self.fields, **changes}
+        req = SimulationRequest(**fields)
+        self.fields = req.model_dump(exclude_none=True)
+        self.seq += 1
+        return self.seq, req
+
+    def compute(self, req: SimulationRequest, seq: int, validate: bool = True) -> dict:
+        """편집 seq 시점의 요청을 단계별로 계산. 도중에 새 편집이 오면 StaleComputation."""
+        from core.feature_flags import get_feature_flags
+        from services.price_cache import get_price_cache
+        from services.simulation_validator import get_config_version, validate_simulation
+
+        t0 = time.perf_counter()
+        recomputed: list[str] = []
+        outputs: dict[str, Any] = {}
+        keys: dict[str, tuple] = {}      # 이번 계산이 쓴 단계 키 (공유 _stages는 밀려난 계산이 덮어쓸 수 있음)
+        table = get_scenario_table()
+
+        def stage(name: str, key: tuple, fn: Callable[[], Any]) -> Any:
+            if seq != self.seq:
+                raise StaleComputation(name)
+            keys[name] = key
+            cached = self._stages.get(name)
+            if cached is not None and cached[0] == key:
+                value = cached[1]
+            else:
+                value = fn()
+                self._stages[name] = (key, value)
+                self.stage_runs[name] += 1
+                recomputed.append(name)
+            outputs[name] = value
+            return value
+
+        scenario = SCENARIOS.get(req.variety, SCENARIOS["후지"])
+        variety_id = VARIETY_NAME_TO_ID.get(req.variety, "fuji")
+        area_m2 = req.area_pyeong * PYEONG_TO_M2
+        area_10a = area_m2 / 1000
+
+        region_grade = stage(
+            "region", (req.region_id, get_feature_flags().version),
+            lambda: _lookup_region_grade(req.region_id),
+        )
+        base_yield = stage(
+            "base_yield", (req.variety, req.rootstock_id, req.yield_per_10a or None),
+            lambda: _resolve_base_yield(req, scenario, variety_id, req.rootstock_id),
+        )
+
+        def _grade():
+            v, r = _table_indices(table, req.variety, region_grade)
+            adjusted, impact = _grade_adjusted_yield(table, base_yield, region_grade, r)
+            return v, r, adjusted, impact, _grade_distribution(table, v, r)
+
+        v, r, yield_per_10a, grade_impact, grades = stage(
+            "grade", (req.variety, base_yield, region_grade, table.version), _grade,
+        )
+        price_per_kg, price_source = stage(
+            "price", (req.variety, req.price_per_kg or None, get_price_cache().version),
+            lambda: _resolve_price(
+                req, scenario, None if req.price_per_kg else _get_live_price(),
+            ),
+        )
+        total_yield, weighted_price, annual_revenue = stage(
+            "revenue", (v, r, yield_per_10a, price_per_kg, req.area_pyeong, table.version),
+            lambda: _revenue_stage(table, v, r, yield_per_10a, price_per_kg, area_10a),
+        )
+        cost_breakdown, annual_cost = stage(
+            "cost", (req.area_pyeong, table.version),
+            lambda: _cost_stage(table, area_10a),
+        )
+        total_trees, initial_investment, investment_breakdown = stage(
+            "investment", (req.area_pyeong, req.total_trees or None, req.rootstock_id, table.version),
+            lambda: _investment_stage(table, req.total_trees, area_m2, area_10a, req.rootstock_id),
+        )
+        projections, break_even_year, roi = stage(
+            "projection",
+            (total_yield, weighted_price, annual_cost, initial_investment, req.projection_years),
+            lambda: _projection_stage(
+                total_yield, weighted_price, annual_cost, initial_investment, req.projection_years,
+            ),
+        )
+
+        annual_profit = annual_revenue - annual_cost
+        income_ratio = annual_profit / annual_revenue if annual_revenue > 0 else 0
+        result = SimulationResponse(
+            variety=req.variety,
+            area_pyeong=req.area_pyeong,
+            area_10a=round(area_10a, 2),
+            total_trees=total_trees,
+            yield_per_10a=yield_per_10a,
+            price_per_kg=price_per_kg,
+            grade_distribution=grades,
+            annual_revenue=annual_revenue,
+            annual_cost=annual_cost,
+            annual_profit=annual_profit,
+            income_ratio=round(income_ratio, 3),
+            cost_breakdown=cost_breakdown,
+            yearly_projections=projections,
+            break_even_year=break_even_year,
+            roi_10year=round(roi, 2),
+            price_source=price_source,
+            rootstock_id=req.rootstock_id,
+            initial_investment=initial_investment,
+            investment_breakdown=investment_breakdown,
+            region_grade=region_grade,
+            grade_impact=grade_impact,
+        )
+
+        if validate:
+            notes = stage(
+                "validation",
+                tuple(keys[name] for name in STAGES[:-1]) + (get_config_version(),),
+                lambda: validate_simulation(result) or None,
+            )
+            result.validation_notes = notes
+
+        self.computations += 1
+        return {
+            "seq": seq,
+            "recomputed": recomputed,
+            "reused": [name for name in outputs if name not in recomputed],
+            "duration_ms": round((time.perf_counter() - t0) * 1000, 2),
+            "result": result,
+        }
+
+    def get_stats(self) -> dict:
+        return {
+            "session_id": self.session_id,
+            "seq": self.seq,
+            "computations": self.computations,
+            "superseded": self.superseded,
+            "stage_runs": dict(self.stage_runs),
+        }
+
+
+class SessionRegistry:
+    """활성 세션 목록 (연결 수명 동안 유지)."""
+
+    def __init__(self) -> None:
+        self._sessions: dict[str, SimulationSession] = {}
+        self._opened = 0
+
+    def open(self) -> SimulationSession:
+        self._opened += 1
+        session = SimulationSession(f"s{self._opened}")
+        self._sessions[session.session_id] = session
+        return session
+
+    def close(self, session: SimulationSession) -> None:
+        self._sessions.pop(session.session_id, None)
+        logger.debug("what-if 세션 종료: %s", session.get_stats())
+
+    def get_stats(self) -> dict:
+        return {
+            "active": len(self._sessions),
+            "opened": self._opened,
+            "sessions": [s.get_stats() for s in self._sessions.values()],
+        }
+
+
+# 싱글턴 인스턴스
+_registry = SessionRegistry()
+
+
+def get_session_registry() -> SessionRegistry:
+    return _registry
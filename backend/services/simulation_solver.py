@@ -0,0 +1,242 @@
+"""
+시뮬레이션 역산 (목표 지표 → 필요 입력값).
+
+"후지 1,500평이 6년차에 손익분기하려면 kg당 최소 얼마?", "ROI 2.0을 내는 수확량은?"
+같은 질문에 답한다. 나머지 입력은 고정하고 변수 하나의 최솟값을 찾는다.
+
+풀이 방식:
+  - closed_form: 연간이익·소득률 × 가격/수확량 — 매출이 변수에 선형이므로 직접 계산
+  - bracketing: 그 외 (연차별 절사 누적, 손익분기 연차 이산성, 면적 → 나무 수 절사 등)
+    모든 목표의 탐색 격자를 한 배열로 쌓아 커널 1회 호출 = 전 목표 1단계 축소
+마지막에 모든 해를 한 번 더 커널로 검증해 achieved 값을 채운다.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+from schemas.simulation import SolveRequest, SolveResponse, SolveResult, SolveTarget
+from services.simulation import YIELD_CURVE, resolve_kernel_inputs
+from services.simulation_kernel import KernelResult, evaluate, yield_curve_array
+
+VARIABLES = ("price_per_kg", "yield_per_10a", "area_pyeong")
+METRICS = ("annual_profit", "income_ratio", "roi_10year", "total_profit", "break_even_year")
+
+_GRID = 64          # 목표당 격자점 수
+_ITERATIONS = 4     # 격자 축소 반복 (해상도 ≈ 구간 / 64^4)
+_UPPER_MULTIPLE = {"price_per_kg": 20.0, "yield_per_10a": 10.0, "area_pyeong": 100.0}
+_DEFAULT_LOWER = 0.01
+
+
+class _Context:
+    """기준 입력 1건 → 행 단위 커널 평가기."""
+
+    def __init__(self, req: SolveRequest) -> None:
+        inputs = resolve_kernel_inputs([req])
+        self.args = inputs["kernel_args"]
+        impact = inputs["impact_col"][0]
+        # 급지 보정: 사용자 수확량 입력에 round(yield × factor)가 적용됨
+        self.yield_factor = impact["yield_factor"] if impact else None
+        self.base = {
+            "price_per_kg": float(self.args["price_per_kg"][0]),
+            "yield_per_10a": float(impact["yield_before"] if impact else self.args["yield_per_10a"][0]),
+            "area_pyeong": float(self.args["area_pyeong"][0]),
+        }
+        self.years = max(req.projection_years, 0)
+        self.calls = 0
+
+    def evaluate(self, variables: np.ndarray, values: np.ndarray, years: np.ndarray) -> KernelResult:
+        """행마다 variables[i] 입력을 values[i]로 바꿔 평가."""
+        n = values.shape[0]
+        a = self.args
+        yield_in = np.where(variables == "yield_per_10a", values, self.base["yield_per_10a"])
+        if self.yield_factor is not None:
+            effective_yield = np.rint(yield_in * self.yield_factor)
+        else:
+            effective_yield = yield_in
+        self.calls += 1
+        return evaluate(
+            yield_per_10a=effective_yield,
+            price_per_kg=np.where(variables == "price_per_kg", values, a["price_per_kg"][0]),
+            grade_weights=np.broadcast_to(a["grade_weights"][0], (n, a["grade_weights"].shape[1])),
+            area_pyeong=np.where(variables == "area_pyeong", values, a["area_pyeong"][0]),
+            total_trees=np.broadcast_to(a["total_trees"], (n,)),
+            seedling_unit=np.broadcast_to(a["seedling_unit"], (n,)),
+            infra_per_10a=np.broadcast_to(a["infra_per_10a"], (n,)),
+            projection_years=years,
+            cost_items=a["cost_items"],
+            yield_curve=yield_curve_array(YIELD_CURVE, int(years.max()) if n else 0),
+            farm_gate_ratio=a["farm_gate_ratio"],
+            pyeong_to_m2=a["pyeong_to_m2"],
+        )
+
+
+def _metric(k: KernelResult, metrics: np.ndarray, targets: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """행별 (지표값, 목표 달성 여부)."""
+    value = np.zeros(metrics.shape[0], dtype=np.float64)
+    ok = np.zeros(metrics.shape[0], dtype=bool)
+    for name, col in (
+        ("annual_profit", k.annual_profit),
+        ("income_ratio", k.income_ratio),
+        ("roi_10year", k.roi),
+        ("total_profit", k.year_profit.sum(axis=1)),
+    ):
+        m = metrics == name
+        value[m] = col[m]
+        ok[m] = col[m] >= targets[m]
+
+    m = metrics == "break_even_year"
+    if m.any():
+        # 목표 연차 이내에 누적이익 >= 0 도달
+        year_index = np.arange(1, k.cumulative_profit.shape[1] + 1)
+        within = year_index[None, :] <= np.floor(targets)[:, None]
+        reached = ((k.cumulative_profit >= 0) & k.year_mask & within).any(axis=1)
+        value[m] = k.break_even_year[m]
+        ok[m] = reached[m]
+    return value, ok
+
+
+def _closed_form(ctx: _Context, t: SolveTarget) -> float | None:
+    """매출 선형 구간의 직접 해. 적용 불가면 None."""
+    if t.metric not in ("annual_profit", "income_ratio"):
+        return None
+    if t.variable == "area_pyeong":
+        return None
+    if t.variable == "yield_per_10a" and ctx.yield_factor is not None:
+        return None  # 급지 보정 반올림 → 비선형
+
+    a = ctx.args
+    area_10a = a["area_pyeong"][0] * a["pyeong_to_m2"] / 1000
+    annual_cost = math.trunc(a["cost_items"].sum() * area_10a)
+    if t.metric == "annual_profit":
+        required = math.ceil(t.target + annual_cost)
+    else:
+        if t.target >= 1.0:
+            return math.inf
+        required = math.ceil(annual_cost / (1.0 - t.target))
+    required = max(required, 1)
+
+    weighted = float(a["grade_weights"][0].sum()) * float(np.asarray(a["farm_gate_ratio"]))
+    if t.variable == "price_per_kg":
+        per_unit = float(a["yield_per_10a"][0]) * area_10a * weighted
+    else:
+        per_unit = area_10a * float(a["price_per_kg"][0]) * weighted
+    if per_unit <= 0:
+        return math.inf
+    return required / per_unit
+
+
+def _ceil2(x: float) -> float:
+    return math.ceil(x * 100) / 100
+
+
+def solve(req: SolveRequest) -> SolveResponse:
+    """목표별 최소 입력값 역산."""
+    ctx = _Context(req)
+    results: list[SolveResult | None] = [None] * len(req.targets)
+    solutions: dict[int, float] = {}
+    methods: dict[int, str] = {}
+    bracket: list[int] = []
+
+    for i, t in enumerate(req.targets):
+        if t.variable not in VARIABLES or t.metric not in METRICS:
+            results[i] = SolveResult(
+                variable=t.variable, metric=t.metric, target=t.target,
+                feasible=False, method="unsupported",
+                reason=f"variable ∈ {VARIABLES}, metric ∈ {METRICS}",
+            )
+            continue
+        x = _closed_form(ctx, t)
+        if x is None:
+            bracket.append(i)
+        elif math.isinf(x):
+            results[i] = SolveResult(
+                variable=t.variable, metric=t.metric, target=t.target,
+                feasible=False, method="closed_form", reason="목표 달성 불가",
+            )
+        else:
+            solutions[i] = max(x, t.lower if t.lower is not None else _DEFAULT_LOWER)
+            methods[i] = "closed_form"
+
+    def _years_for(idx: list[int]) -> np.ndarray:
+        # 손익분기 목표 연차가 전망 기간보다 길면 그 연차까지 평가
+        return np.array([
+            max(ctx.years, math.floor(req.targets[i].target))
+            if req.targets[i].metric == "break_even_year" else ctx.years
+            for i in idx
+        ], dtype=np.int64)
+
+    # ── 벡터 bracketing: 모든 목표의 격자를 한 번에 평가 ──
+    if bracket:
+        targets = [req.targets[i] for i in bracket]
+        lo = np.array([t.lower if t.lower is not None else _DEFAULT_LOWER for t in targets])
+        hi = np.array([
+            t.upper if t.upper is not None else max(ctx.base[t.variable], 1.0) * _UPPER_MULTIPLE[t.variable]
+            for t in targets
+        ])
+        variables = np.repeat(np.array([t.variable for t in targets]), _GRID)
+        metrics = np.repeat(np.array([t.metric for t in targets]), _GRID)
+        goal = np.repeat(np.array([t.target for t in targets], dtype=np.float64), _GRID)
+        years = np.repeat(_years_for(bracket), _GRID)
+        active = np.ones(len(targets), dtype=bool)
+        found_at_lo = np.zeros(len(targets), dtype=bool)
+        steps = np.linspace(0.0, 1.0, _GRID)
+
+        for step in range(_ITERATIONS):
+            grid = lo[:, None] + (hi - lo)[:, None] * steps[None, :]   # (T, G)
+            k = ctx.evaluate(variables, grid.ravel(), years)
+            _, ok = _metric(k, metrics, goal)
+            ok = ok.reshape(len(targets), _GRID)
+            any_ok = ok.any(axis=1)
+            first = np.argmax(ok, axis=1)
+            if step == 0:
+                active &= any_ok
+                found_at_lo = any_ok & (first == 0)
+            upd = active & ~found_at_lo & any_ok
+            rows = np.nonzero(upd)[0]
+            lo[rows] = grid[rows, np.maximum(first[rows] - 1, 0)]
+            hi[rows] = grid[rows, first[rows]]
+
+        for j, i in enumerate(bracket):
+            t = req.targets[i]
+            if not active[j]:
+                results[i] = SolveResult(
+                    variable=t.variable, metric=t.metric, target=t.target,
+                    feasible=False, method="bracketing",
+                    reason=f"탐색 상한 {hi[j]:.2f}에서도 목표 미달",
+                )
+            else:
+                solutions[i] = float(lo[j] if found_at_lo[j] else hi[j])
+                methods[i] = "bracketing"
+
+    # ── 검증: 모든 해를 소수 2자리 올림 후 한 번에 평가 (절사 경계면 0.01 상향 재검증) ──
+    idx = sorted(solutions)
+    if idx:
+        values = np.array([_ceil2(solutions[i]) for i in idx])
+        variables = np.array([req.targets[i].variable for i in idx])
+        metrics = np.array([req.targets[i].metric for i in idx])
+        goal = np.array([req.targets[i].target for i in idx], dtype=np.float64)
+        years = _years_for(idx)
+        achieved, ok = _metric(ctx.evaluate(variables, values, years), metrics, goal)
+        if not ok.all():
+            values = np.where(ok, values, values + 0.01)
+            achieved, ok = _metric(ctx.evaluate(variables, values, years), metrics, goal)
+        for j, i in enumerate(idx):
+            t = req.targets[i]
+            results[i] = SolveResult(
+                variable=t.variable, metric=t.metric, target=t.target,
+                feasible=bool(ok[j]),
+                solution=round(float(values[j]), 2),
+                achieved=round(float(achieved[j]), 3),
+                method=methods[i],
+                reason=None if ok[j] else "검증 실패 (비단조 구간)",
+            )
+
+    return SolveResponse(
+        variety=req.variety,
+        area_pyeong=req.area_pyeong,
+        results=results,
+        kernel_calls=ctx.calls,
+    )
@@ -21,16 +21,12 @@ from __future__ import annotations
 import json
 import logging
 import os
+from collections import deque
 from pathlib import Path
 from datetime import datetime
 from typing import List
 
-try:
-    import openai
-    _openai_available = True
-except ImportError:
-    _openai_available = False
-
+from core.log_writer import get_log_writer
 from schemas.simulation import (
     SimulationRequest,
     SimulationResponse,
@@ -171,28 +167,102 @@ _runtime_stats = {
 # ── Reflexion Memory (R58 — 세미나 05e) ──────────────────
 # 과거 JSONL 교훈을 읽어서 현재 검증에 반영.
 # "저장만 하고 읽지 않는" 문제를 해소.
+# 교훈은 크기 제한 링 버퍼에 보관: 기동 시 파일 꼬리만 1회 읽고,
+# 이후는 _record_outcome이 직접 공급 → 검증 비용이 로그 크기와 무관.
+
+_LESSON_WINDOW = 50
+
+
+def _tail_lines(path: Path, n: int, block: int = 8192) -> list[str]:
+    """파일 끝에서 n줄만 읽는다 (전체 읽기 없음)."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        data = b""
+        while pos > 0 and data.count(b"\n") <= n:
+            step = min(block, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    lines = data.decode("utf-8", errors="ignore").strip().split("\n")
+    return [line for line in lines[-n:] if line]
+
 
-def _load_recent_lessons(n: int = 50) -> dict:
+class ReflexionLessons:
+    """최근 window건 검증 결과의 링 버퍼 + 증분 집계 (필드 빈도, 보정 건수)."""
+
+    def __init__(self, window: int = _LESSON_WINDOW) -> None:
+        self._window = window
+        self._ring: deque[tuple[bool, tuple[str, ...]]] = deque()
+        self._refined = 0
+        self._field_freq: dict[str, int] = {}
+        self._seeded = False
+
+    def seed(self, path: Path) -> None:
+        """기동 시 1회: 결과 파일 꼬리에서 최근 window건 적재."""
+        self._seeded = True
+        try:
+            if not path.exists():
+                return
+            for line in _tail_lines(path, self._window):
+                try:
+                    rec = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self.push(bool(rec.get("refined")), rec.get("fields", []))
+        except Exception:
+            pass
+
+    def push(self, refined: bool, fields) -> None:
+        fields = tuple(fields)
+        self._ring.append((refined, fields))
+        self._refined += refined
+        for field in fields:
+            self._field_freq[field] = self._field_freq.get(field, 0) + 1
+        if len(self._ring) > self._window:
+            old_refined, old_fields = self._ring.popleft()
+            self._refined -= old_refined
+            for field in old_fields:
+                count = self._field_freq[field] - 1
+                if count:
+                    self._field_freq[field] = count
+                else:
+                    del self._field_freq[field]
+
+    def snapshot(self) -> dict:
+        total = len(self._ring)
+        return {
+            "field_freq": dict(self._field_freq),
+            "refinement_rate": self._refined / total if total else 0.0,
+            "total": total,
+        }
+
+
+_lessons = ReflexionLessons()
+
+
+def _get_lessons() -> ReflexionLessons:
+    if not _lessons._seeded:
+        _lessons.seed(_STATS_FILE)
+    return _lessons
+
+
+def _load_recent_lessons(n: int = _LESSON_WINDOW) -> dict:
     """최근 n건의 outcome에서 반복 패턴을 추출 → CONFIG 동적 조정 근거."""
-    lessons = {"field_freq": {}, "refinement_rate": 0.0, "total": 0}
-    try:
-        if not _STATS_FILE.exists():
-            return lessons
-        lines = _STATS_FILE.read_text(encoding="utf-8").strip().split("\n")
-        recent = lines[-n:] if len(lines) > n else lines
-        refined_count = 0
-        for line in recent:
-            rec = json.loads(line)
-            lessons["total"] += 1
-            if rec.get("refined"):
-                refined_count += 1
-            for field in rec.get("fields", []):
-                lessons["field_freq"][field] = lessons["field_freq"].get(field, 0) + 1
-        if lessons["total"] > 0:
-            lessons["refinement_rate"] = refined_count / lessons["total"]
-    except Exception:
-        pass
-    return lessons
+    lessons = _get_lessons()
+    if n == lessons._window:
+        return lessons.snapshot()
+    # 창 크기가 다르면 링에서 직접 집계 (n ≤ window)
+    recent = list(lessons._ring)[-n:]
+    freq: dict[str, int] = {}
+    for _, fields in recent:
+        for field in fields:
+            freq[field] = freq.get(field, 0) + 1
+    return {
+        "field_freq": freq,
+        "refinement_rate": sum(r for r, _ in recent) / len(recent) if recent else 0.0,
+        "total": len(recent),
+    }
 
 
 def _apply_reflexion_adjustments() -> None:
@@ -239,20 +309,26 @@ def _record_outcome(notes, was_refined: bool) -> None:
     _config_checkpoint.record_quality(len(notes), caution_count)
     _config_checkpoint.maybe_checkpoint(CONFIG)
 
+    # Reflexion 링 버퍼 갱신 (파일 재읽기 없이 다음 검증에 반영)
+    _get_lessons().push(was_refined, [n.field for n in notes])
+
     try:
-        _STATS_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(_STATS_FILE, "a", encoding="utf-8") as f:
-            f.write(json.dumps({
-                "ts": datetime.utcnow().isoformat(),
-                "notes": len(notes),
-                "refined": was_refined,
-                "severities": [n.severity for n in notes],
-                "fields": [n.field for n in notes],
-            }) + "\n")
+        get_log_writer().append(_STATS_FILE, {
+            "ts": datetime.utcnow().isoformat(),
+            "notes": len(notes),
+            "refined": was_refined,
+            "severities": [n.severity for n in notes],
+            "fields": [n.field for n in notes],
+        })
     except Exception:
         pass
 
 
+def get_config_version() -> int:
+    """현재 CONFIG 지문 — reflexion 조정·롤백으로 값이 바뀌면 달라진다."""
+    return hash(tuple(sorted(CONFIG.items())))
+
+
 def get_validation_stats() -> dict:
     return {
         **_runtime_stats,
@@ -263,204 +339,242 @@ def get_validation_stats() -> dict:
     }
 
 
-# ── Generator-Reviewer 크로스모델 비평 (R62 — 세미나 04) ──
+# ── 검증 규칙 (컴파일) ─────────────────────────────────────
+# 규칙은 CONFIG 지문별로 한 번만 컴파일하고, 평탄한 수치 레코드 1개에 대해 평가한다.
+# 응답 모델 전체를 순회하지 않으므로 보정 전후 재검증 비용이 작다.
 
-def _cross_model_critique(
-    notes: list[ValidationNote], result: SimulationResponse
-) -> str | None:
-    """GPT-4o-mini 독립 리뷰: 검증 이슈가 있을 때만 호출."""
-    if not _openai_available or not notes:
-        return None
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        return None
-    try:
-        summary = (
-            f"면적={result.area_pyeong}평, 소득률={result.income_ratio:.1%}, "
-            f"ROI={result.roi_10year:.2f}, 손익분기={result.break_even_year}년, "
-            f"수확량={result.yield_per_10a}kg/10a, 가격={result.price_per_kg}원/kg"
-        )
-        issues = "; ".join(f"[{n.severity}] {n.field}: {n.message}" for n in notes)
-        client = openai.OpenAI(api_key=api_key)
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": (
-                    "사과 농장 시뮬레이션 검증 리뷰어. "
-                    "비현실적 수치 조합 감지, 도메인 상식 위반 체크. "
-                    "한국어, 2문장 이내로 핵심만."
-                )},
-                {"role": "user", "content": f"시뮬레이션: {summary}\n검증이슈: {issues}"},
-            ],
-            max_tokens=150,
-            temperature=0.3,
-        )
-        return resp.choices[0].message.content.strip()
-    except Exception as e:
-        logger.warning(f"[cross-model] GPT critique failed: {e}")
-        return None
 
+class _Rule:
+    __slots__ = ("field", "severity", "test", "message")
 
-# ── 검증 함수 ──────────────────────────────────────────────
+    def __init__(self, field: str, severity: str, test, message) -> None:
+        self.field = field
+        self.severity = severity
+        self.test = test
+        self.message = message
 
-def validate_simulation(result: SimulationResponse) -> list[ValidationNote]:
-    """시뮬레이션 결과를 양방향으로 검증."""
-    _apply_reflexion_adjustments()  # R58: 과거 교훈 기반 threshold 동적 조정
-    _config_checkpoint.check_rollback(CONFIG)  # L3=5: 품질 저하 시 자동 롤백
-    notes: list[ValidationNote] = []
-
-    # ─── 과대 추정 (over-optimistic) ───
-
-    # 1. 등급 비율 합계
-    grade_sum = sum(g.ratio for g in result.grade_distribution)
-    if abs(grade_sum - 1.0) > 0.01:
-        notes.append(ValidationNote(
-            severity="warning", field="grade_distribution",
-            message=f"등급 비율 합계 {grade_sum:.2f} (기대값 1.0)",
-        ))
-
-    # 2. 소득률 과대
-    lo, hi = CONFIG["income_ratio"]
-    if result.income_ratio > hi:
-        notes.append(ValidationNote(
-            severity="caution", field="income_ratio",
-            message=f"소득률 {result.income_ratio:.1%} > 상한 {hi:.0%}. 비용 과소 추정 가능",
-        ))
-
-    # 3. ROI 과대
-    lo, hi = CONFIG["roi_10year"]
-    if result.roi_10year > hi:
-        notes.append(ValidationNote(
-            severity="caution", field="roi_10year",
-            message=f"10년 ROI {result.roi_10year:.1f} > 상한 {hi:.1f}. 낙관적 추정 가능",
-        ))
-
-    # 4. 손익분기 너무 빠름
-    min_be = CONFIG["break_even_year_min"]
-    if result.break_even_year < min_be:
-        notes.append(ValidationNote(
-            severity="caution", field="break_even_year",
-            message=f"손익분기 {result.break_even_year}년 < 유목기 {min_be}년",
-        ))
-
-    # 5. 수익-비용 정합성
-    expected_profit = result.annual_revenue - result.annual_cost
-    if abs(expected_profit - result.annual_profit) > 1:
-        notes.append(ValidationNote(
-            severity="warning", field="annual_profit",
-            message="연간수익 - 연간비용 ≠ 연간이익",
-        ))
-
-    # 6. 수확비율 단조증가
-    prev_ratio = -1.0
-    for proj in result.yearly_projections:
-        if proj.yield_ratio < prev_ratio - 0.01:
-            notes.append(ValidationNote(
-                severity="info", field="yearly_projections",
-                message=f"Year {proj.year} 수확비율({proj.yield_ratio:.0%}) 전년 대비 감소",
-            ))
-            break
-        prev_ratio = proj.yield_ratio
 
-    # 7. 파라미터 범위 초과
-    y_lo, y_hi = CONFIG["yield_per_10a_range"]
-    if result.yield_per_10a < y_lo or result.yield_per_10a > y_hi:
-        notes.append(ValidationNote(
-            severity="caution", field="yield_per_10a",
-            message=f"10a당 수확량 {result.yield_per_10a:.0f}kg 범위({y_lo}-{y_hi}) 밖",
-        ))
+_compiled: tuple[int, list[_Rule]] | None = None
+
 
+def _compile_rules() -> list[_Rule]:
+    """현재 CONFIG 임계값을 묶은 규칙 목록 (지문이 같으면 재사용)."""
+    global _compiled
+    version = get_config_version()
+    if _compiled is not None and _compiled[0] == version:
+        return _compiled[1]
+
+    ir_lo, ir_hi = CONFIG["income_ratio"]
+    roi_lo, roi_hi = CONFIG["roi_10year"]
+    min_be = CONFIG["break_even_year_min"]
+    max_be = CONFIG["break_even_year_max"]
+    y_lo, y_hi = CONFIG["yield_per_10a_range"]
     p_lo, p_hi = CONFIG["price_per_kg_range"]
-    if result.price_per_kg < p_lo or result.price_per_kg > p_hi:
-        notes.append(ValidationNote(
-            severity="caution", field="price_per_kg",
-            message=f"kg당 가격 {result.price_per_kg:.0f}원 범위({p_lo}-{p_hi}) 밖",
-        ))
-
-    # ─── 과소 추정 (under-pessimistic) v2 ───
-
-    # 8. 소득률 과소
-    if result.income_ratio < lo and result.annual_revenue > 0:
-        notes.append(ValidationNote(
-            severity="caution", field="income_ratio",
-            message=f"소득률 {result.income_ratio:.1%} < 하한 {lo:.0%}. 비용 과대 추정 가능",
-        ))
-
-    # 9. ROI 과소 (극도로 비관적)
     pessimistic_th = CONFIG["pessimistic_roi_threshold"]
-    if result.roi_10year < pessimistic_th:
-        notes.append(ValidationNote(
-            severity="warning", field="roi_10year",
-            message=f"10년 ROI {result.roi_10year:.1f} < {pessimistic_th}. 과소 추정 의심",
-        ))
 
-    # 10. 손익분기 너무 늦음
-    max_be = CONFIG["break_even_year_max"]
-    if result.break_even_year > max_be:
-        notes.append(ValidationNote(
-            severity="warning", field="break_even_year",
-            message=f"손익분기 {result.break_even_year}년 > {max_be}년. 비관적 추정 가능",
-        ))
+    rules = [
+        # ─── 과대 추정 (over-optimistic) ───
+        # 1. 등급 비율 합계
+        _Rule("grade_distribution", "warning",
+              lambda r: abs(r["grade_sum"] - 1.0) > 0.01,
+              lambda r: f"등급 비율 합계 {r['grade_sum']:.2f} (기대값 1.0)"),
+        # 2. 소득률 과대
+        _Rule("income_ratio", "caution",
+              lambda r: r["income_ratio"] > ir_hi,
+              lambda r: f"소득률 {r['income_ratio']:.1%} > 상한 {ir_hi:.0%}. 비용 과소 추정 가능"),
+        # 3. ROI 과대
+        _Rule("roi_10year", "caution",
+              lambda r: r["roi_10year"] > roi_hi,
+              lambda r: f"10년 ROI {r['roi_10year']:.1f} > 상한 {roi_hi:.1f}. 낙관적 추정 가능"),
+        # 4. 손익분기 너무 빠름
+        _Rule("break_even_year", "caution",
+              lambda r: r["break_even_year"] < min_be,
+              lambda r: f"손익분기 {r['break_even_year']}년 < 유목기 {min_be}년"),
+        # 5. 수익-비용 정합성
+        _Rule("annual_profit", "warning",
+              lambda r: abs(r["annual_revenue"] - r["annual_cost"] - r["annual_profit"]) > 1,
+              lambda r: "연간수익 - 연간비용 ≠ 연간이익"),
+        # 6. 수확비율 단조증가
+        _Rule("yearly_projections", "info",
+              lambda r: r["yield_drop_year"] > 0,
+              lambda r: f"Year {r['yield_drop_year']} 수확비율({r['yield_drop_ratio']:.0%}) 전년 대비 감소"),
+        # 7. 파라미터 범위 초과
+        _Rule("yield_per_10a", "caution",
+              lambda r: r["yield_per_10a"] < y_lo or r["yield_per_10a"] > y_hi,
+              lambda r: f"10a당 수확량 {r['yield_per_10a']:.0f}kg 범위({y_lo}-{y_hi}) 밖"),
+        _Rule("price_per_kg", "caution",
+              lambda r: r["price_per_kg"] < p_lo or r["price_per_kg"] > p_hi,
+              lambda r: f"kg당 가격 {r['price_per_kg']:.0f}원 범위({p_lo}-{p_hi}) 밖"),
+        # ─── 과소 추정 (under-pessimistic) v2 ───
+        # 8. 소득률 과소 (v2부터 하한은 roi_10year 구간 하한을 사용 — 기존 판정 유지)
+        _Rule("income_ratio", "caution",
+              lambda r: r["income_ratio"] < roi_lo and r["annual_revenue"] > 0,
+              lambda r: f"소득률 {r['income_ratio']:.1%} < 하한 {roi_lo:.0%}. 비용 과대 추정 가능"),
+        # 9. ROI 과소 (극도로 비관적)
+        _Rule("roi_10year", "warning",
+              lambda r: r["roi_10year"] < pessimistic_th,
+              lambda r: f"10년 ROI {r['roi_10year']:.1f} < {pessimistic_th}. 과소 추정 의심"),
+        # 10. 손익분기 너무 늦음
+        _Rule("break_even_year", "warning",
+              lambda r: r["break_even_year"] > max_be,
+              lambda r: f"손익분기 {r['break_even_year']}년 > {max_be}년. 비관적 추정 가능"),
+    ]
+    _compiled = (version, rules)
+    return rules
+
+
+def _yield_drop(ratios) -> tuple[int, float]:
+    """수확비율이 전년 대비 감소한 첫 연차 (없으면 0)."""
+    prev_ratio = -1.0
+    for year, ratio in ratios:
+        if ratio < prev_ratio - 0.01:
+            return year, ratio
+        prev_ratio = ratio
+    return 0, 0.0
+
+
+def validation_record(result) -> dict:
+    """SimulationResponse 또는 SimulationState → 검증용 평탄 수치 레코드.
+
+    응답과 같은 반올림(소득률 3자리, ROI 2자리)을 적용한다.
+    """
+    if isinstance(result, SimulationResponse):
+        grades, projections = result.grade_distribution, result.yearly_projections
+        income_ratio, roi = result.income_ratio, result.roi_10year
+    else:
+        grades, projections = result.grades, result.projections
+        income_ratio, roi = round(result.income_ratio, 3), round(result.roi, 2)
+    drop_year, drop_ratio = _yield_drop((p.year, p.yield_ratio) for p in projections)
+    return {
+        "grade_sum": sum(g.ratio for g in grades),
+        "income_ratio": income_ratio,
+        "roi_10year": roi,
+        "break_even_year": result.break_even_year,
+        "annual_revenue": result.annual_revenue,
+        "annual_cost": result.annual_cost,
+        "annual_profit": result.annual_profit,
+        "yield_drop_year": drop_year,
+        "yield_drop_ratio": drop_ratio,
+        "yield_per_10a": result.yield_per_10a,
+        "price_per_kg": result.price_per_kg,
+    }
+
+
+def evaluate_record(record: dict) -> list[ValidationNote]:
+    """컴파일된 규칙을 레코드 1개에 적용 (reflexion·롤백·크로스모델 비평 제외)."""
+    return [
+        ValidationNote(severity=rule.severity, field=rule.field, message=rule.message(record))
+        for rule in _compile_rules()
+        if rule.test(record)
+    ]
+
+
+def _prepare_validation() -> None:
+    _apply_reflexion_adjustments()  # R58: 과거 교훈 기반 threshold 동적 조정
+    _config_checkpoint.check_rollback(CONFIG)  # L3=5: 품질 저하 시 자동 롤백
+
 
+def _append_critique(notes: list[ValidationNote], result: SimulationResponse) -> list[ValidationNote]:
     # ─── Generator-Reviewer 크로스모델 비평 (R62) ───
+    # 비동기 큐: 캐시 적중이면 바로 포함, 아니면 critique_id로 나중에 조회
     if notes:
-        critique = _cross_model_critique(notes, result)
+        from services.critique_queue import get_critique_queue
+        result.critique_id, critique = get_critique_queue().submit(notes, result)
         if critique:
             notes.append(ValidationNote(
                 severity="info", field="cross_model_critique",
                 message=f"[GPT 리뷰] {critique}",
             ))
-
     return notes
 
 
+# ── 검증 함수 ──────────────────────────────────────────────
+
+def validate_simulation(result: SimulationResponse) -> list[ValidationNote]:
+    """시뮬레이션 결과를 양방향으로 검증."""
+    _prepare_validation()
+    return _append_critique(evaluate_record(validation_record(result)), result)
+
+
 # ── 보정 함수 ──────────────────────────────────────────────
 
-def suggest_refinement(
-    req: SimulationRequest,
-    result: SimulationResponse,
-    notes: list[ValidationNote],
-) -> SimulationRequest | None:
-    """양방향 보정: 과대 → 보수적 하향, 과소 → 보수적 상향."""
-    caution_fields = {n.field: n for n in notes if n.severity == "caution"}
+def refinement_changes(req: SimulationRequest, record: dict, notes: list[ValidationNote]) -> dict:
+    """양방향 보정: 과대 → 보수적 하향, 과소 → 보수적 상향. 바꿀 입력 필드만 반환."""
+    caution_fields = {n.field for n in notes if n.severity == "caution"}
+    changes: dict = {}
     if not caution_fields:
-        _record_outcome(notes, was_refined=False)
-        return None
-
-    adjusted = req.model_copy()
-    adjusted_any = False
+        return changes
 
     # 과대: ROI/소득률 과대 → 수확량 10% 하향
-    if "roi_10year" in caution_fields and result.roi_10year > CONFIG["roi_10year"][1]:
-        current_yield = req.yield_per_10a or result.yield_per_10a
-        adjusted.yield_per_10a = int(current_yield * 0.90)
-        adjusted_any = True
+    if "roi_10year" in caution_fields and record["roi_10year"] > CONFIG["roi_10year"][1]:
+        current_yield = req.yield_per_10a or record["yield_per_10a"]
+        changes["yield_per_10a"] = int(current_yield * 0.90)
 
-    if "income_ratio" in caution_fields and result.income_ratio > CONFIG["income_ratio"][1]:
-        current_yield = req.yield_per_10a or result.yield_per_10a
-        adjusted.yield_per_10a = int(current_yield * 0.90)
-        adjusted_any = True
+    if "income_ratio" in caution_fields and record["income_ratio"] > CONFIG["income_ratio"][1]:
+        current_yield = req.yield_per_10a or record["yield_per_10a"]
+        changes["yield_per_10a"] = int(current_yield * 0.90)
 
     # 과대: 가격/수확량 범위 클램핑
     if "price_per_kg" in caution_fields:
         p_lo, p_hi = CONFIG["price_per_kg_range"]
-        current = req.price_per_kg or result.price_per_kg
-        adjusted.price_per_kg = int(max(p_lo, min(p_hi, current)))
-        adjusted_any = True
+        current = req.price_per_kg or record["price_per_kg"]
+        changes["price_per_kg"] = int(max(p_lo, min(p_hi, current)))
 
-    if "yield_per_10a" in caution_fields and result.yield_per_10a > CONFIG["yield_per_10a_range"][1]:
+    if "yield_per_10a" in caution_fields and record["yield_per_10a"] > CONFIG["yield_per_10a_range"][1]:
         y_lo, y_hi = CONFIG["yield_per_10a_range"]
-        current = req.yield_per_10a or result.yield_per_10a
-        adjusted.yield_per_10a = int(max(y_lo, min(y_hi, current)))
-        adjusted_any = True
+        current = req.yield_per_10a or record["yield_per_10a"]
+        changes["yield_per_10a"] = int(max(y_lo, min(y_hi, current)))
 
     # 과소 v2: 소득률 과소 → 수확량 10% 상향 (비용이 과대일 수 있으므로)
-    if "income_ratio" in caution_fields and result.income_ratio < CONFIG["income_ratio"][0]:
+    if "income_ratio" in caution_fields and record["income_ratio"] < CONFIG["income_ratio"][0]:
         boost = CONFIG["yield_boost_factor"]
-        current_yield = req.yield_per_10a or result.yield_per_10a
-        adjusted.yield_per_10a = int(current_yield * boost)
-        adjusted_any = True
+        current_yield = req.yield_per_10a or record["yield_per_10a"]
+        changes["yield_per_10a"] = int(current_yield * boost)
         logger.info(f"[self-refine] Under-estimation: yield boosted by {boost}")
 
-    _record_outcome(notes, was_refined=adjusted_any)
-    return adjusted if adjusted_any else None
+    return changes
+
+
+def suggest_refinement(
+    req: SimulationRequest,
+    result: SimulationResponse,
+    notes: list[ValidationNote],
+) -> SimulationRequest | None:
+    """양방향 보정 요청 생성 (보정 불필요 시 None)."""
+    changes = refinement_changes(req, validation_record(result), notes)
+    _record_outcome(notes, was_refined=bool(changes))
+    return req.model_copy(update=changes) if changes else None
+
+
+def validate_and_refine(req: SimulationRequest):
+    """simulate → 검증 → 보정을 한 번에 수행 (/run 파이프라인).
+
+    simulate()·validate_simulation()을 두 번씩 돌리던 방식 대신:
+      - reflexion 조정·롤백 확인은 요청당 1회
+      - 보정값은 중간 산출물에 직접 적용 (매출·연도별 추이만 재계산)
+      - 재검증은 같은 컴파일 규칙으로 평탄 레코드만 평가
+      - 크로스모델 비평은 최종 노트에만 1회
+
+    Returns:
+        (SimulationResponse, refined 여부). 응답의 validation_notes는 채워져 있다.
+    """
+    from services.simulation import build_response, refine_state, simulate_state
+
+    state = simulate_state(req)
+    _prepare_validation()
+    record = validation_record(state)
+    notes = evaluate_record(record)
+    refined = False
+    if notes:
+        changes = refinement_changes(req, record, notes)
+        _record_outcome(notes, was_refined=bool(changes))
+        if changes:
+            state = refine_state(state, changes)
+            notes = evaluate_record(validation_record(state))
+            refined = True
+
+    result = build_response(state)
+    result.refined = refined
+    notes = _append_critique(notes, result)
+    result.validation_notes = notes if notes else None
+    return result, refined
@@ -7,31 +7,35 @@ Lv3: scikit-learn RandomForest (선택적, 없으면 graceful degradation)
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import pickle
 from datetime import date
 from pathlib import Path
+from typing import Callable
+
+import numpy as np
 
 from services.gdd_calculator import (
+    ML_FEATURE_KEYS,
+    TBASE,
     VARIETY_PHENOLOGY,
-    DailyClimate,
+    ClimateData,
+    PhenologyContext,
+    as_series,
     calc_accumulated_gdd,
     calc_august_night_temp,
     calc_summer_rain_total,
-    count_bloom_frost_days,
     count_frost_days,
     count_heat_stress_days,
     extract_ml_features,
-    predict_bloom_date,
-    predict_harvest_date,
 )
 from services.climate_collector import get_climate_collector, STATION_MAP
+from services.model_registry import MODEL_DIR, get_model_registry
 from core.config import settings
 
 logger = logging.getLogger(__name__)
 
-MODEL_DIR = Path(__file__).parent.parent / "data" / "models"
-
 # 월별 가중치 (핵심 생육기에 가중)
 MONTH_WEIGHTS: dict[int, float] = {
     1: 0.6, 2: 0.6, 3: 0.8, 4: 2.0,   # 개화기 2x
@@ -119,45 +123,49 @@ def _score_extreme_temp(
 
 
 def calc_monthly_scores(
-    daily_data: list[DailyClimate],
+    daily_data: ClimateData,
     normals: list[dict],
 ) -> list[dict]:
     """12개월 서브스코어 계산.
 
+    월별 합계는 month 열 기준 bincount로 한 번에 집계한다 (날짜 파싱 실패 행은 month=0 → 제외).
+
     Returns: [{"month": 1, "score": 80.0, "label": "좋음", ...}, ...]
     """
-    from services.gdd_calculator import calc_daily_gdd, TBASE
-
+    series = as_series(daily_data)
     normal_map = {n["month"]: n for n in normals}
-    monthly: dict[int, list[DailyClimate]] = {}
-    for d in daily_data:
-        try:
-            m = date.fromisoformat(d["date"]).month
-        except (ValueError, TypeError):
-            continue
-        monthly.setdefault(m, []).append(d)
+
+    def _by_month(weights: np.ndarray | None = None) -> list:
+        return np.bincount(series.month, weights=weights, minlength=13).tolist()
+
+    day_counts = _by_month()
+    gdd_sums = _by_month(series.daily_gdd())
+    frost_counts = _by_month((series.min_ta <= 0).astype(np.float64))
+    rain_sums = _by_month(series.rainfall)
+    min_sums = _by_month(series.min_ta)
+    max_sums = _by_month(series.max_ta)
 
     results = []
     for month in range(1, 13):
-        days = monthly.get(month, [])
+        n_days = day_counts[month]
         normal = normal_map.get(month, {"min_ta": 0, "max_ta": 10, "rainfall": 50})
 
         # 월별 GDD
-        month_gdd = sum(calc_daily_gdd(d["min_ta"], d["max_ta"]) for d in days)
+        month_gdd = gdd_sums[month]
         normal_gdd = sum(
             max(0, (normal["max_ta"] + normal["min_ta"]) / 2 - TBASE)
-            for _ in range(len(days) or 30)
+            for _ in range(n_days or 30)
         )
 
         # 서리일수
-        frost = sum(1 for d in days if d["min_ta"] <= 0)
+        frost = int(frost_counts[month])
 
         # 총 강수
-        rain = sum(d["rainfall"] for d in days)
+        rain = rain_sums[month]
 
         # 평균 최저/최고
-        avg_min = sum(d["min_ta"] for d in days) / len(days) if days else normal["min_ta"]
-        avg_max = sum(d["max_ta"] for d in days) / len(days) if days else normal["max_ta"]
+        avg_min = min_sums[month] / n_days if n_days else normal["min_ta"]
+        avg_max = max_sums[month] / n_days if n_days else normal["max_ta"]
 
         # 4개 서브스코어
         gdd_score = _score_gdd_deviation(month_gdd, normal_gdd)
@@ -217,32 +225,33 @@ def calc_annual_score(monthly_scores: list[dict]) -> tuple[float, str]:
 # Lv2: 통계 기반 예측
 # ──────────────────────────────────────────────────────────────────────
 
-def calc_bloom_predictions(daily_data: list[DailyClimate]) -> list[dict]:
-    """전 품종 개화·수확 예측."""
+def calc_bloom_predictions(
+    daily_data: ClimateData,
+    phenology: PhenologyContext | None = None,
+) -> list[dict]:
+    """전 품종 개화·만개·수확 예측 (공유 PhenologyContext에서 조회)."""
+    ctx = phenology or PhenologyContext.build(daily_data)
     results = []
-    for variety, pheno in VARIETY_PHENOLOGY.items():
-        bloom = predict_bloom_date(daily_data, variety)
-        harvest = predict_harvest_date(bloom, variety) if bloom else None
-
-        # GDD at bloom
-        gdd_at_bloom = None
-        if bloom:
-            bloom_data = [d for d in daily_data if d["date"] <= bloom]
-            gdd_list = calc_accumulated_gdd(bloom_data)
-            gdd_at_bloom = gdd_list[-1] if gdd_list else None
-
+    for i, variety in enumerate(ctx.varieties):
+        pheno = VARIETY_PHENOLOGY.get(variety, VARIETY_PHENOLOGY["fuji"])
         results.append({
             "variety": variety,
-            "bloom_date": bloom,
-            "harvest_date": harvest,
-            "gdd_at_bloom": gdd_at_bloom,
+            "bloom_date": ctx.bloom_dates[i],
+            "full_bloom_date": ctx.full_bloom_dates[i],
+            "harvest_date": ctx.harvest_dates[i],
+            "gdd_at_bloom": ctx.gdd_at_bloom[i],
             "days_to_harvest": pheno["days_bloom_to_harvest"],
         })
     return results
 
 
-def calc_variety_risks(daily_data: list[DailyClimate]) -> list[dict]:
+def calc_variety_risks(
+    daily_data: ClimateData,
+    phenology: PhenologyContext | None = None,
+) -> list[dict]:
     """품종별 리스크 매트릭스."""
+    daily_data = as_series(daily_data)
+    ctx = phenology or PhenologyContext.build(daily_data)
     frost_total = count_frost_days(daily_data)
     heat_total = count_heat_stress_days(daily_data)
     summer_rain = calc_summer_rain_total(daily_data)
@@ -255,9 +264,8 @@ def calc_variety_risks(daily_data: list[DailyClimate]) -> list[dict]:
         return "높음"
 
     results = []
-    for variety, pheno in VARIETY_PHENOLOGY.items():
-        bloom = predict_bloom_date(daily_data, variety)
-        bloom_frost = count_bloom_frost_days(daily_data, bloom)
+    for variety, bloom_frost in zip(ctx.varieties, ctx.bloom_frost_days):
+        pheno = VARIETY_PHENOLOGY.get(variety, VARIETY_PHENOLOGY["fuji"])
 
         # 품종 특성 반영
         frost_sens = pheno["frost_sensitivity"]
@@ -309,30 +317,16 @@ def calc_variety_risks(daily_data: list[DailyClimate]) -> list[dict]:
 # Lv3: ML 기반 예측 (선택적)
 # ──────────────────────────────────────────────────────────────────────
 
-def _try_ml_predict(daily_data: list[DailyClimate], region_id: str, year: int) -> dict | None:
+def _try_ml_predict(daily_data: ClimateData, region_id: str, year: int) -> dict | None:
     """scikit-learn RandomForest 예측 (없으면 None)."""
     try:
-        import numpy as np
         from sklearn.ensemble import RandomForestRegressor  # noqa: F401
 
-        model_path = MODEL_DIR / f"yield_rf_{region_id}.pkl"
-        if not model_path.exists():
-            return None
-
-        with open(model_path, "rb") as f:
-            model = pickle.load(f)
-
         features = extract_ml_features(daily_data)
-        X = np.array([[
-            features["total_gdd"],
-            features["frost_days"],
-            features["bloom_frost_days"],
-            features["heat_stress_days"],
-            features["summer_rain_mm"],
-            features["aug_night_temp"],
-            features["bloom_date_doy"],
-        ]])
-        predicted = model.predict(X)[0]
+        X = np.array([[features[k] for k in ML_FEATURE_KEYS]])
+        predicted = get_model_registry().predict(region_id, X)
+        if predicted is None:
+            return None
 
         return {
             "region_id": region_id,
@@ -351,23 +345,25 @@ def _try_ml_predict(daily_data: list[DailyClimate], region_id: str, year: int) -
         return None
 
 
-def train_model(region_id: str, historical_data: list[dict]) -> dict:
+def train_model(
+    region_id: str,
+    historical_data: list[dict],
+    on_progress: Callable[[float], None] | None = None,
+) -> dict:
     """ML 모델 학습 (수동 트리거).
 
     historical_data: [{"features": {...}, "yield_kg_per_10a": float}, ...]
+    on_progress: 진행률(0~1) 콜백. 지정하면 트리를 10그루씩 warm_start로 추가하며
+        호출한다 (random_state 고정 → 한 번에 학습한 모델과 동일). 작업 큐는 이 콜백에서
+        취소 예외를 던진다.
     """
     try:
-        import numpy as np
         from sklearn.ensemble import RandomForestRegressor
 
         if len(historical_data) < 5:
             return {"success": False, "error": "최소 5년치 데이터 필요"}
 
-        feature_keys = [
-            "total_gdd", "frost_days", "bloom_frost_days",
-            "heat_stress_days", "summer_rain_mm", "aug_night_temp",
-            "bloom_date_doy",
-        ]
+        feature_keys = list(ML_FEATURE_KEYS)
 
         X = np.array([
             [d["features"].get(k, 0) for k in feature_keys]
@@ -375,8 +371,16 @@ def train_model(region_id: str, historical_data: list[dict]) -> dict:
         ])
         y = np.array([d["yield_kg_per_10a"] for d in historical_data])
 
-        model = RandomForestRegressor(n_estimators=100, random_state=42)
-        model.fit(X, y)
+        if on_progress is None:
+            model = RandomForestRegressor(n_estimators=100, random_state=42)
+            model.fit(X, y)
+        else:
+            model = RandomForestRegressor(n_estimators=10, random_state=42, warm_start=True)
+            for n_trees in range(10, 101, 10):
+                model.set_params(n_estimators=n_trees)
+                model.fit(X, y)
+                on_progress(n_trees / 100)
+            model.set_params(warm_start=False)
 
         MODEL_DIR.mkdir(parents=True, exist_ok=True)
         model_path = MODEL_DIR / f"yield_rf_{region_id}.pkl"
@@ -409,7 +413,7 @@ async def annual_forecast(region_id: str, year: int | None = None) -> dict:
         year = date.today().year
 
     collector = get_climate_collector()
-    daily_data = await collector.fetch_asos_daily(region_id, year)
+    daily_data = await collector.fetch_climate_series(region_id, year)
     normals = collector.get_climate_normals(region_id)
 
     # Lv1: 월별 스코어
@@ -417,11 +421,12 @@ async def annual_forecast(region_id: str, year: int | None = None) -> dict:
     overall_score, overall_label = calc_annual_score(monthly_scores)
 
     # Lv2: 개화·수확 + 품종 리스크
-    bloom_predictions = calc_bloom_predictions(daily_data)
-    variety_risks = calc_variety_risks(daily_data)
+    phenology = PhenologyContext.build(daily_data)
+    bloom_predictions = calc_bloom_predictions(daily_data, phenology)
+    variety_risks = calc_variety_risks(daily_data, phenology)
 
-    # Lv3: ML 예측 (선택)
-    yield_pred = _try_ml_predict(daily_data, region_id, year)
+    # Lv3: ML 예측 (선택) — 모델 로드·예측은 워커 스레드 (선로드 중이면 그 완료를 기다림)
+    yield_pred = await asyncio.to_thread(_try_ml_predict, daily_data, region_id, year)
 
     # 추천 메시지
     recommendation = _generate_recommendation(overall_score, overall_label, variety_risks)
@@ -454,36 +459,27 @@ async def get_gdd_progress(region_id: str, year: int | None = None) -> dict:
         year = date.today().year
 
     collector = get_climate_collector()
-    daily_data = await collector.fetch_asos_daily(region_id, year)
+    series = await collector.fetch_climate_series(region_id, year)
     normals = collector.get_climate_normals(region_id)
 
-    from services.gdd_calculator import calc_daily_gdd, TBASE
+    from services.gdd_calculator import calc_daily_gdd
 
     # 실제 GDD 누적
-    gdd_acc = calc_accumulated_gdd(daily_data)
+    gdd_acc = calc_accumulated_gdd(series)
 
-    # 평년 GDD 누적 (일별 보간)
+    # 평년 GDD 누적 (일별 보간) — 월별 평년 GDD 표를 month 열로 조회 (파싱 실패 행 = 0)
     normal_map = {n["month"]: n for n in normals}
-    normal_acc = []
-    total = 0.0
-    for d in daily_data:
-        try:
-            m = date.fromisoformat(d["date"]).month
-        except (ValueError, TypeError):
-            normal_acc.append(total)
-            continue
+    month_gdd = np.zeros(13, dtype=np.float64)
+    for m in range(1, 13):
         n = normal_map.get(m, {"min_ta": 0, "max_ta": 10})
-        total += calc_daily_gdd(n["min_ta"], n["max_ta"])
-        normal_acc.append(round(total, 1))
+        month_gdd[m] = calc_daily_gdd(n["min_ta"], n["max_ta"])
+    normal_acc = [round(v, 1) for v in np.cumsum(month_gdd[series.month]).tolist()]
 
     # 응답 생성
-    progress = []
-    for i, d in enumerate(daily_data):
-        progress.append({
-            "date": d["date"],
-            "accumulated": gdd_acc[i] if i < len(gdd_acc) else 0,
-            "normal": normal_acc[i] if i < len(normal_acc) else 0,
-        })
+    progress = [
+        {"date": d, "accumulated": acc, "normal": normal}
+        for d, acc, normal in zip(series.dates, gdd_acc, normal_acc)
+    ]
 
     current = gdd_acc[-1] if gdd_acc else 0
     normal_total = normal_acc[-1] if normal_acc else 1
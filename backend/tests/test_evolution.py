@@ -1,5 +1,7 @@
 """진화·자율성·워크플로우·품질·학습순환 렌즈 테스트."""
 
+import pytest
+
 
 def test_system_info(client):
     """시스템 정보 엔드포인트 (진화 렌즈)."""
@@ -89,16 +91,31 @@ def test_evolution_status(client):
     assert isinstance(data["generation"], int)
 
 
-def test_evolution_evolve(client):
+@pytest.fixture
+def isolated_evolve(tmp_path, monkeypatch):
+    """실제 evolve 작업을 tmp_path 안에서만 실행 — 작업 기록·튜닝 상태/로그·검증 이력 격리."""
+    import core.evolution_engine as ee
+    import services.job_queue as jq
+    import services.simulation_validator as sv
+
+    monkeypatch.setattr(ee, "_DATA_DIR", tmp_path)
+    monkeypatch.setattr(ee, "_TUNING_STATE", tmp_path / "tuning_state.json")
+    monkeypatch.setattr(ee, "_TUNING_LOG", tmp_path / "tuning_log.jsonl")
+    monkeypatch.setattr(sv, "_STATS_FILE", tmp_path / "validator_outcomes.jsonl")
+    monkeypatch.setattr(jq, "_queue", jq.JobQueue(data_dir=tmp_path / "jobs"))
+    return tmp_path
+
+
+def test_evolution_evolve(client, isolated_evolve):
     """진화 사이클 실행 (데이터 부족 시 스킵)."""
-    res = client.post("/api/evolution/evolve")
+    res = client.post("/api/evolution/evolve", params={"wait": True})
     assert res.status_code == 200
     data = res.json()
     assert "evolved" in data
     assert "generation" in data
 
 
-def test_evolution_rollback(client):
+def test_evolution_rollback(client, isolated_evolve):
     """진화 롤백."""
     res = client.post("/api/evolution/rollback")
     assert res.status_code == 200
@@ -136,3 +153,119 @@ def test_migration_status(client):
     assert "latest_schema_version" in data
     assert "migrations" in data
     assert len(data["migrations"]) >= 1
+
+
+def test_evolution_cursors_consume_only_new(tmp_path, monkeypatch):
+    """진화 엔진 소비 커서 — 검증 이력·이상 알림을 새로 쌓인 만큼만 처리하고 재기동 후 이어감."""
+    import json
+    import core.evolution_engine as ee
+    import services.anomaly_detector as ad
+    from core.feature_flags import get_feature_flags
+
+    monkeypatch.setattr(ee, "_DATA_DIR", tmp_path)
+    monkeypatch.setattr(ee, "_TUNING_STATE", tmp_path / "tuning_state.json")
+    detector = ad.AnomalyDetector()
+    monkeypatch.setattr(ad, "_detector", detector)
+    monkeypatch.setattr(detector, "_log", lambda alert: None)
+    monkeypatch.setattr(get_feature_flags(), "is_enabled", lambda name, *a, **k: True)
+
+    path = tmp_path / "validator_outcomes.jsonl"
+
+    def write(rows, partial=""):
+        with open(path, "a", encoding="utf-8") as f:
+            for refined, fields in rows:
+                f.write(json.dumps({"refined": refined, "fields": fields}) + "\n")
+            f.write(partial)
+
+    write([(i % 2 == 0, ["income_ratio"]) for i in range(60)], partial='{"refined": tr')
+    engine = ee.EvolutionEngine()
+    first = engine._analyze_validator_outcomes()
+    assert first["new_validations"] == 60 and first["total_validations"] == 50
+    assert first["adjustment_rate"] == 0.5 and first["frequent_warnings"] == {"income_ratio": 50}
+    assert engine._state["cursors"]["validator_offset"] < path.stat().st_size  # 미완결 줄은 보류
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('ue, "fields": []}\n')
+    write([(True, ["yield_per_10a"])] * 9)
+    second = engine._analyze_validator_outcomes()
+    assert second["new_validations"] == 10
+    assert engine._state["diagnostics"]["validator_total"] == 70
+    assert engine._state["cursors"]["validator_offset"] == path.stat().st_size
+    assert engine._analyze_validator_outcomes()["new_validations"] == 0
+
+    for i in range(3):
+        detector.check_price("후지", 3000 if i % 2 else 2000)
+    first = engine.consume_anomaly_alerts()
+    assert first["alerts_processed"] == 2 and first["alerts_missed"] == 0
+    assert engine.consume_anomaly_alerts()["reason"] == "no_alerts"
+    detector.check_price("후지", 1000)
+    assert engine.consume_anomaly_alerts()["alerts_processed"] == 1
+
+    resumed = ee.EvolutionEngine()  # tuning_state.json에서 커서·누적값 복원
+    assert resumed._state["cursors"] == engine._state["cursors"]
+    assert resumed._analyze_validator_outcomes()["new_validations"] == 0
+    assert resumed.consume_anomaly_alerts()["reason"] == "no_alerts"
+
+
+def test_job_queue_process_pool_dedup_cancel(tmp_path, monkeypatch):
+    """작업 큐 — 프로세스 풀 배치 실행, 대기 작업 병합, 대기/실행 중 취소, 결과 영속화."""
+    import asyncio
+    import services.job_queue as jq
+    from schemas.simulation import SimulationRequest
+    from services.simulation import simulate_batch
+
+    async def slow(queue, ctx, steps):
+        for i in range(steps):
+            await asyncio.sleep(0.01)
+            ctx((i + 1) / steps, f"step {i}")
+        return {"steps": steps}
+
+    monkeypatch.setitem(jq.JOB_KINDS, "slow", (slow, True))
+    reqs = [{"variety": "후지", "area_pyeong": 1000}, {"variety": "감홍", "area_pyeong": 500, "projection_years": 5}]
+
+    async def scenario():
+        queue = jq.JobQueue(data_dir=tmp_path, concurrency=2, process_workers=1)
+        batch = queue.submit("simulation_batch", requests=reqs)
+        long = queue.submit("slow", steps=500)
+        queued = queue.submit("slow", steps=3)
+        assert queue.submit("slow", steps=3) is queued and queued.merged == 1
+        doomed = queue.submit("slow", steps=4)
+        assert queue.cancel(doomed.job_id).status == "cancelled"
+
+        await asyncio.sleep(0.1)
+        running = queue.get(long.job_id)
+        assert running.status == "running" and 0 < running.progress < 1
+        queue.cancel(long.job_id)
+        assert (await queue.wait(long.job_id, timeout=5)).status == "cancelled"
+        assert (await queue.wait(queued.job_id, timeout=5)).result == {"steps": 3}
+
+        done = await queue.wait(batch.job_id, timeout=60)
+        assert done.status == "done", done.error
+        expected = simulate_batch([SimulationRequest(**r) for r in reqs])
+        assert done.result["annual_profit"] == expected["annual_profit"]
+        assert done.result["yearly"] == expected["yearly"]
+        assert queue.get_stats()["process_tasks"] == 1
+        await queue.stop()
+        return batch.job_id
+
+    batch_id = asyncio.run(scenario())
+    restored = jq.JobQueue(data_dir=tmp_path)  # 재기동 후 결과 조회
+    assert restored.get(batch_id).status == "done"
+    assert restored.get(batch_id).result["count"] == 2
+    assert {j["status"] for j in restored.list_jobs()} == {"done", "cancelled"}
+
+
+def test_job_api_evolve_and_status(client, isolated_evolve):
+    """진화 작업 제출 → 상태 조회, 알 수 없는 id."""
+    res = client.post("/api/evolution/evolve", params={"wait": True})
+    assert "evolved" in res.json()
+
+    res = client.get("/api/jobs", params={"kind": "evolve"})
+    assert res.status_code == 200
+    body = res.json()
+    job = body["jobs"][0]
+    assert job["kind"] == "evolve" and job["status"] == "done"
+    assert "evolve" in body["stats"]["kinds"]
+    assert client.get(f"/api/jobs/{job['job_id']}").json()["result"]["generation"] >= 0
+    assert client.get("/api/jobs/nope").json()["status"] == "unknown"
+    assert (isolated_evolve / "jobs" / f"{job['job_id']}.json").exists()
@@ -0,0 +1,205 @@
+"""작황 예측 테스트 (mock 기상 데이터)."""
+
+
+def _sample_daily() -> list[dict]:
+    """2023년 mock 일별 데이터 + 날짜 파싱 불가 행 1개."""
+    from services.climate_collector import get_climate_collector
+
+    daily = get_climate_collector()._generate_mock_daily("yeongju", 2023)
+    daily.insert(200, {"date": "bad", "min_ta": -1.0, "max_ta": 34.0, "rainfall": 12.0})
+    return daily
+
+
+def test_climate_series_matches_dict_api():
+    """ClimateSeries 경로와 list[DailyClimate] 어댑터 결과 일치 (파싱 실패 행 처리 포함)."""
+    from services import gdd_calculator as g
+
+    daily = _sample_daily()
+    series = g.ClimateSeries.from_daily(daily)
+    assert len(series) == len(daily)
+    assert series.month[200] == 0 and series.ordinal[200] == -1
+    assert series.doy[0] == 1 and series.month[-1] == 12
+
+    # 기준값: 날짜를 행마다 파싱하는 단순 구현
+    from datetime import date
+    months = [date.fromisoformat(d["date"]).month if d["date"] != "bad" else 0 for d in daily]
+    assert g.count_frost_days(series) == sum(1 for d in daily if d["min_ta"] <= 0)
+    assert g.count_heat_stress_days(series) == sum(
+        1 for d, m in zip(daily, months) if m in (7, 8) and d["max_ta"] > 33.0
+    )
+    assert g.calc_august_night_temp(series) == round(
+        sum(d["min_ta"] for d, m in zip(daily, months) if m == 8)
+        / sum(1 for m in months if m == 8), 1,
+    )
+
+    total = 0.0
+    bloom = None
+    for d in daily:
+        total += g.calc_daily_gdd(d["min_ta"], d["max_ta"])
+        if bloom is None and total >= g.VARIETY_PHENOLOGY["gala"]["bloom_gdd"]:
+            bloom = d["date"]
+    assert g.calc_accumulated_gdd(series)[-1] == round(total, 1)
+    assert g.predict_bloom_date(series, "gala") == bloom
+    assert g.extract_ml_features(daily, "gala") == g.extract_ml_features(series, "gala")
+
+
+def test_forecast_annual_mock(client):
+    res = client.get("/api/forecast/annual?region_id=andong&year=2023")
+    assert res.status_code == 200
+    data = res.json()
+    assert len(data["monthly_scores"]) == 12
+    assert {b["variety"] for b in data["bloom_predictions"]} == {
+        v["variety"] for v in data["variety_risks"]
+    }
+    gdd = client.get("/api/forecast/gdd?region_id=andong&year=2023").json()
+    assert len(gdd["daily_progress"]) == 365
+    assert gdd["current_gdd"] == gdd["daily_progress"][-1]["accumulated"]
+
+
+def test_ml_feature_bulk_matches_single():
+    """연도 × 품종 일괄 피처 = 연도·품종별 extract_ml_features (짧은/빈 연도 포함)."""
+    from services import gdd_calculator as g
+    from services.climate_collector import get_climate_collector
+
+    collector = get_climate_collector()
+    years = [collector._generate_mock_daily("jangsu", y) for y in (2020, 2021, 2022)]
+    years += [years[0][:90], []]
+    varieties = list(g.VARIETY_PHENOLOGY)
+
+    bulk = g.extract_ml_features_bulk(years, varieties)
+    assert len(bulk) == len(years)
+    for daily, by_variety in zip(years, bulk):
+        for v in varieties:
+            assert by_variety[v] == g.extract_ml_features(daily, v)
+    assert bulk[3]["fuji"]["bloom_date_doy"] == 110      # 3월까지만 → 개화 전
+    assert bulk[4]["fuji"] == {
+        "total_gdd": 0.0, "frost_days": 0, "bloom_frost_days": 0, "heat_stress_days": 0,
+        "summer_rain_mm": 0.0, "aug_night_temp": 20.0, "bloom_date_doy": 110,
+    }
+    tensor = g.ml_feature_tensor(g.ClimateStack.from_series(years[:3]), varieties)
+    assert tensor.shape == (3, len(varieties), len(g.ML_FEATURE_KEYS))
+
+
+def test_phenology_context_matches_per_variety():
+    """공유 누적 GDD 컨텍스트 = 품종별 개화·수확·개화기 서리 개별 계산."""
+    from services import gdd_calculator as g
+
+    daily = _sample_daily()
+    ctx = g.PhenologyContext.build(daily)
+    assert ctx.varieties == tuple(g.VARIETY_PHENOLOGY)
+    for i, v in enumerate(ctx.varieties):
+        bloom = g.predict_bloom_date(daily, v)
+        assert ctx.bloom_dates[i] == bloom
+        assert ctx.harvest_dates[i] == g.predict_harvest_date(bloom, v)
+        assert ctx.bloom_frost_days[i] == g.count_bloom_frost_days(daily, bloom)
+        assert ctx.full_bloom_dates[i] >= bloom
+        acc = g.calc_accumulated_gdd(daily)
+        assert ctx.gdd_at_bloom[i] == acc[[d["date"] for d in daily].index(bloom)]
+
+    early = g.PhenologyContext.build(daily[:60], ("fuji", "gala"))
+    assert early.bloom_dates == (None, None)
+    assert early.harvest_dates == (None, None) and early.bloom_frost_days == (0, 0)
+    assert g.PhenologyContext.build([]).gdd_at_bloom == (None,) * len(g.VARIETY_PHENOLOGY)
+
+
+def test_forecast_cache_shared_and_versioned(client, monkeypatch):
+    """annual·variety-risk·bloom 결과 공유 + 기후 데이터 버전 변경 시 재계산 + single-flight."""
+    import asyncio
+    import services.forecast_cache as fc
+    from services.climate_collector import get_climate_collector
+
+    cache = fc.ForecastCache()
+    monkeypatch.setattr(fc, "_cache", cache)
+    calls = []
+    real = fc.annual_forecast
+
+    async def counting(region_id, year=None):
+        calls.append((region_id, year))
+        await asyncio.sleep(0.01)
+        return await real(region_id, year)
+
+    monkeypatch.setattr(fc, "annual_forecast", counting)
+
+    annual = client.get("/api/forecast/annual?region_id=geochang&year=2021").json()
+    risks = client.get("/api/forecast/variety-risk?region_id=geochang&year=2021").json()
+    bloom = client.get("/api/forecast/bloom?region_id=geochang&year=2021").json()
+    assert calls == [("geochang", 2021)]
+    assert risks["variety_risks"] == annual["variety_risks"]
+    assert bloom["bloom_predictions"] == annual["bloom_predictions"]
+
+    # 신규 관측일 수집 → 버전 증가 → 재계산, 이전 버전 항목 폐기
+    get_climate_collector()._bump_version("geochang", 2021)
+    client.get("/api/forecast/bloom?region_id=geochang&year=2021")
+    assert len(calls) == 2
+    assert cache.get_stats()["entries"] == 1
+
+    async def concurrent():
+        return await asyncio.gather(*(cache.annual("jangsu", 2020) for _ in range(5)))
+
+    results = asyncio.run(concurrent())
+    assert calls.count(("jangsu", 2020)) == 1
+    assert all(r == results[0] for r in results)
+    stats = cache.get_stats()
+    assert stats["coalesced"] == 4 and stats["hits"] == 2 and stats["invalidations"] == 1
+
+
+def test_model_registry_loads_once_and_reloads_on_change(tmp_path):
+    """모델은 한 번만 로드, 파일 변경·invalidate 시 재로드, 지역별 비용 기록."""
+    import os
+    import pickle
+    import numpy as np
+    from sklearn.ensemble import RandomForestRegressor
+    from services.model_registry import ModelRegistry
+
+    X = np.arange(70, dtype=float).reshape(10, 7)
+    model = RandomForestRegressor(n_estimators=5, random_state=0).fit(X, np.arange(10.0))
+    path = tmp_path / "yield_rf_andong.pkl"
+    path.write_bytes(pickle.dumps(model))
+
+    registry = ModelRegistry(tmp_path, recheck_seconds=0.0)
+    assert registry.warm() == {"loaded": ["andong"], "failed": []}
+    first = registry.predict("andong", X[:1])
+    assert registry.predict("andong", X[:1]) == first
+    assert registry.predict("yesan", X[:1]) is None
+
+    stats = registry.get_stats()["regions"]["andong"]
+    assert stats["loads"] == 1 and stats["predicts"] == 2
+    assert stats["n_estimators"] == 5 and stats["size_bytes"] == path.stat().st_size
+
+    # 파일 교체 (mtime 변경) → 재로드
+    model.set_params(n_estimators=8, warm_start=True).fit(X, np.arange(10.0))
+    path.write_bytes(pickle.dumps(model))
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+    registry.predict("andong", X[:1])
+    assert registry.get_stats()["regions"]["andong"]["n_estimators"] == 8
+
+    registry.invalidate("andong")
+    registry.get("andong")
+    assert registry.get_stats()["regions"]["andong"]["loads"] == 3
+
+
+def test_forecast_cache_expires_mock_results(monkeypatch):
+    """지난 연도라도 mock 폴백으로 만든 결과는 TTL 후 재계산 (ASOS 재시도)."""
+    import asyncio
+    import services.forecast_cache as fc
+
+    sources = iter(["mock", "asos"])
+    calls = []
+
+    async def fake(region_id, year=None):
+        calls.append(year)
+        return {"region_id": region_id, "year": year, "data_source": next(sources)}
+
+    monkeypatch.setattr(fc, "annual_forecast", fake)
+    cache = fc.ForecastCache(current_year_ttl_seconds=0.0)
+
+    async def scenario():
+        first = await cache.annual("yesan", 2019)
+        second = await cache.annual("yesan", 2019)
+        third = await cache.annual("yesan", 2019)
+        return first, second, third
+
+    first, second, third = asyncio.run(scenario())
+    assert (first["data_source"], second["data_source"], third["data_source"]) == ("mock", "asos", "asos")
+    assert calls == [2019, 2019]
+    assert cache.get_stats()["expirations"] == 1
@@ -70,3 +70,783 @@ def test_simulation_unknown_variety_uses_default(client):
     data = res.json()
     # SSOT 기반 수확량 (간격에 따라 다양) ± self-refine 보정
     assert 1500 <= data["yield_per_10a"] <= 3000
+
+
+def test_simulation_batch_matches_single(client):
+    """배치 엔드포인트 결과가 요청별 simulate()와 동일."""
+    from schemas.simulation import SimulationRequest
+    from services.simulation import simulate
+
+    reqs = [
+        {"variety": "후지", "area_pyeong": 1000},
+        {"variety": "감홍", "area_pyeong": 500, "yield_per_10a": 2000,
+         "price_per_kg": 10000, "projection_years": 5},
+        {"variety": "홍로", "area_pyeong": 777.7, "rootstock_id": "M9",
+         "total_trees": 300, "projection_years": 15},
+    ]
+    res = client.post("/api/simulation/batch", json={"requests": reqs})
+    assert res.status_code == 200
+    data = res.json()
+    assert data["count"] == 3
+    assert len(data["cost_items"]) == 19
+
+    for i, body in enumerate(reqs):
+        single = simulate(SimulationRequest(**body))
+        assert data["annual_revenue"][i] == single.annual_revenue
+        assert data["annual_cost"][i] == single.annual_cost
+        assert data["income_ratio"][i] == single.income_ratio
+        assert data["break_even_year"][i] == single.break_even_year
+        assert data["roi_10year"][i] == single.roi_10year
+        assert data["initial_investment"][i] == single.initial_investment
+        assert data["cost_amounts"][i] == [c.amount for c in single.cost_breakdown]
+        assert data["yearly"]["profit"][i] == [p.profit for p in single.yearly_projections]
+        assert data["yearly"]["yield_kg"][i] == [p.yield_kg for p in single.yearly_projections]
+
+
+def test_simulation_revenue_matches_per_grade_formula():
+    """정수 입력 격자 — 매출이 등급별 Σ(ratio × multiplier × price) × FARM_GATE_RATIO 절사와 일치."""
+    from schemas.simulation import SimulationRequest
+    from services.simulation import (
+        FARM_GATE_RATIO, PYEONG_TO_M2, SCENARIOS, YIELD_CURVE, simulate, simulate_batch,
+    )
+
+    reqs = [
+        SimulationRequest(variety=v, area_pyeong=a, yield_per_10a=y, price_per_kg=p)
+        for v in SCENARIOS for a in (1000, 3000, 10000)
+        for y in (2000, 2500, 3000) for p in (4500, 5500, 6500)
+    ]
+    batch = simulate_batch(reqs)
+    for i, req in enumerate(reqs):
+        weighted = sum(
+            g["ratio"] * g["multiplier"] * req.price_per_kg for g in SCENARIOS[req.variety]["grades"]
+        ) * FARM_GATE_RATIO
+        total_yield = req.yield_per_10a * (req.area_pyeong * PYEONG_TO_M2 / 1000)
+        expected = int(total_yield * weighted)
+        result = simulate(req)
+        assert result.annual_revenue == expected == batch["annual_revenue"][i], req
+        assert [p.revenue for p in result.yearly_projections] == [
+            int(total_yield * YIELD_CURVE.get(year, 1.0) * weighted)
+            for year in range(1, req.projection_years + 1)
+        ]
+
+    fuji = simulate(SimulationRequest(variety="후지", area_pyeong=10000, yield_per_10a=2500, price_per_kg=5500))
+    assert fuji.annual_revenue == 246001107
+
+
+def test_simulation_batch_empty(client):
+    """빈 배치도 정상 응답."""
+    res = client.post("/api/simulation/batch", json={"requests": []})
+    assert res.status_code == 200
+    assert res.json()["count"] == 0
+
+
+def test_simulation_monte_carlo_bands(client):
+    """Monte Carlo 응답 — 백분위 구간 순서와 연차별 밴드."""
+    res = client.post("/api/simulation/monte-carlo", json={
+        "variety": "후지", "area_pyeong": 1000, "draws": 10000, "seed": 7,
+    })
+    assert res.status_code == 200
+    data = res.json()
+    assert data["draws"] == 10000
+    assert len(data["yearly_projections"]) == 10
+    for band in (data["annual_profit"], data["roi_10year"], data["total_profit"]):
+        assert band["p10"] <= band["p50"] <= band["p90"]
+    year10 = data["yearly_projections"][9]["profit"]
+    assert year10["p10"] < year10["p90"]
+    assert 0 <= data["break_even_probability"] <= 1
+
+
+def test_simulation_monte_carlo_degenerate_matches_simulate():
+    """분산 0이면 모든 표본이 결정론적 simulate()와 같다."""
+    from schemas.simulation import MonteCarloRequest, SimulationRequest
+    from services.simulation import simulate, simulate_monte_carlo
+
+    fixed = {"dist": "normal", "center": 1.0, "spread": 0.0}
+    mc = simulate_monte_carlo(MonteCarloRequest(
+        variety="홍로", area_pyeong=800, draws=200, seed=1,
+        yield_dist=fixed, price_dist=fixed,
+        cost_inflation={"center": 0.0, "spread": 0.0}, grade_concentration=0,
+    ))
+    single = simulate(SimulationRequest(variety="홍로", area_pyeong=800))
+    assert mc.annual_profit.p50 == single.annual_profit
+    assert mc.break_even_year.p90 == single.break_even_year
+    assert [y.profit.p10 for y in mc.yearly_projections] == [
+        p.profit for p in single.yearly_projections
+    ]
+
+
+def test_simulation_result_cache_hit_and_invalidation(client):
+    """동일 요청은 캐시 적중, 시세 버전 변경 시 무효화."""
+    from services.price_cache import get_price_cache
+    from services.simulation_cache import get_result_cache
+
+    cache = get_result_cache()
+    body = {"variety": "시나노골드", "area_pyeong": 1234, "rootstock_id": "M9"}
+    first = client.post("/api/simulation/run", json=body).json()
+    hits = cache.get_stats()["hits"]
+    second = client.post("/api/simulation/run", json={**body, "total_trees": 0}).json()
+    assert cache.get_stats()["hits"] == hits + 1
+    assert second["annual_profit"] == first["annual_profit"]
+    assert second["validation_notes"] == first["validation_notes"]
+
+    price_cache = get_price_cache()
+    saved = (price_cache._apple_price, price_cache._version)
+    try:
+        price_cache.update([{"dpr1": "4,321"}])
+        invalidations = cache.get_stats()["invalidations"]
+        misses = cache.get_stats()["misses"]
+        third = client.post("/api/simulation/run", json=body).json()
+        stats = client.get("/api/simulation/cache").json()
+        assert stats["invalidations"] == invalidations + 1
+        assert stats["misses"] == misses + 1
+        assert third["price_per_kg"] == 4321
+    finally:
+        price_cache._apple_price, price_cache._version = saved
+
+
+def test_scenario_table_compiled_values():
+    """컴파일된 시나리오 테이블 — 원본 상수와 일치, 재구성 시 새 버전."""
+    from services.simulation import (
+        COST_ITEMS, SCENARIOS, _apply_grade_adjustment,
+        get_scenario_table, rebuild_scenario_table,
+    )
+
+    table = get_scenario_table()
+    v = table.varieties["감홍"]
+    r = table.region_grades["S"]
+    _, adjusted, _ = _apply_grade_adjustment(1800, SCENARIOS["감홍"]["grades"], "S")
+    assert table.grade_ratios[v, r].tolist() == [g["ratio"] for g in adjusted]
+    assert table.grade_weights[v, 0].tolist() == [
+        g["ratio"] * g["multiplier"] for g in SCENARIOS["감홍"]["grades"]
+    ]
+    assert table.cost_total == sum(c["amount"] for c in COST_ITEMS)
+    assert table.rootstock_costs[table.rootstocks["M9"]].tolist() == [25_000, 2_000_000]
+
+    assert get_scenario_table() is table
+    rebuilt = rebuild_scenario_table()
+    assert rebuilt is not table
+    assert rebuilt.version != table.version
+
+
+def test_compare_extra_scenarios_match_simulate(client):
+    """사용자 추가 시나리오 — 프리셋 뒤에 붙고 simulate() 결과와 동일."""
+    from schemas.simulation import SimulationRequest
+    from services.simulation import SCENARIOS, simulate
+
+    res = client.post("/api/simulation/compare", json={
+        "variety": "홍로",
+        "area_pyeong": 700,
+        "extra_scenarios": [
+            {"scenario": "drought", "label": "가뭄", "yield_factor": 0.6, "price_factor": 1.3},
+            {"scenario": "glut", "label": "과잉생산", "yield_factor": 1.1, "price_factor": 0.6},
+        ],
+    })
+    assert res.status_code == 200
+    scenarios = res.json()["scenarios"]
+    assert [s["scenario"] for s in scenarios] == [
+        "optimistic", "neutral", "pessimistic", "drought", "glut",
+    ]
+
+    base = SCENARIOS["홍로"]
+    single = simulate(SimulationRequest(
+        variety="홍로", area_pyeong=700,
+        yield_per_10a=base["yield_per_10a"] * 0.6,
+        price_per_kg=base["price_per_kg"] * 1.3,
+    ))
+    drought = scenarios[3]
+    assert drought["annual_profit"] == single.annual_profit
+    assert drought["break_even_year"] == single.break_even_year
+    assert drought["roi_10year"] == single.roi_10year
+    assert drought["total_10year_profit"] == sum(p.profit for p in single.yearly_projections)
+
+
+def test_simulation_sensitivity_tornado(client):
+    """민감도 분석 — 모든 비용 항목 포함, swing 내림차순, 기준값 = simulate()."""
+    from schemas.simulation import SimulationRequest
+    from services.simulation import COST_ITEMS, simulate
+
+    res = client.post("/api/simulation/sensitivity", json={
+        "variety": "후지", "area_pyeong": 1500, "delta": 0.2,
+    })
+    assert res.status_code == 200
+    data = res.json()
+    assert data["axes"] == 7 + len(COST_ITEMS)
+    axes = {bar["axis"] for bar in data["annual_profit"]}
+    assert {"farm_gate_ratio", "ramp_speed", "cost:토지 임차료"} <= axes
+
+    swings = [bar["swing"] for bar in data["annual_profit"]]
+    assert swings == sorted(swings, reverse=True)
+    price = next(b for b in data["annual_profit"] if b["axis"] == "price_per_kg")
+    assert price["high_result"] > price["low_result"]
+    ramp = next(b for b in data["annual_profit"] if b["axis"] == "ramp_speed")
+    assert ramp["swing"] == 0  # 성목 기준 연간이익은 유목기 속도와 무관
+
+    single = simulate(SimulationRequest(variety="후지", area_pyeong=1500))
+    assert data["baseline"]["annual_profit"] == single.annual_profit
+    assert data["baseline"]["break_even_year"] == single.break_even_year
+
+    for delta in (0, -0.1, 0.95):   # 요청하지 않은 흔들기 폭으로 바꾸지 않고 거부
+        res = client.post("/api/simulation/sensitivity", json={
+            "variety": "후지", "area_pyeong": 1500, "delta": delta,
+        })
+        assert res.status_code == 422, delta
+
+
+def test_simulation_inverse_solve(client):
+    """역산 — 해는 목표를 만족하고 0.01 아래 값은 만족하지 않는다."""
+    from schemas.simulation import SimulationRequest
+    from services.simulation import simulate
+
+    res = client.post("/api/simulation/solve", json={
+        "variety": "후지",
+        "area_pyeong": 1500,
+        "targets": [
+            {"variable": "price_per_kg", "metric": "break_even_year", "target": 6},
+            {"variable": "price_per_kg", "metric": "annual_profit", "target": 10_000_000},
+            {"variable": "yield_per_10a", "metric": "roi_10year", "target": 2.0},
+            {"variable": "machine_id", "metric": "roi_10year", "target": 1.0},
+        ],
+    })
+    assert res.status_code == 200
+    be, profit, roi, bad = res.json()["results"]
+    assert be["method"] == "bracketing" and be["feasible"]
+    assert profit["method"] == "closed_form" and profit["feasible"]
+    assert bad["method"] == "unsupported" and not bad["feasible"]
+
+    def run(**kw):
+        return simulate(SimulationRequest(variety="후지", area_pyeong=1500, **kw))
+
+    assert run(price_per_kg=be["solution"]).break_even_year <= 6
+    assert run(price_per_kg=be["solution"] - 0.01).break_even_year > 6
+    assert run(price_per_kg=profit["solution"]).annual_profit >= 10_000_000
+    assert run(price_per_kg=profit["solution"] - 0.01).annual_profit < 10_000_000
+    assert run(yield_per_10a=roi["solution"]).roi_10year >= 2.0
+
+
+def test_simulation_portfolio_optimizer(client):
+    """포트폴리오 최적화 — 예산 준수, 단일 품종 계획은 simulate()와 일치."""
+    from schemas.simulation import SimulationRequest
+    from services.simulation import simulate
+
+    budget = 40_000_000
+    res = client.post("/api/simulation/optimize", json={
+        "area_pyeong": 3000, "budget": budget, "region_grades": ["A"],
+        "max_varieties": 2, "objective": "roi", "top_n": 5,
+    })
+    assert res.status_code == 200
+    data = res.json()
+    assert data["evaluated_plans"] >= data["feasible_plans"] >= data["pareto_plans"] >= 1
+    for plan in data["plans"]:
+        assert plan["initial_investment"] <= budget
+        assert sum(c["share"] for c in plan["components"]) == pytest.approx(1.0)
+        assert len({c["variety"] for c in plan["components"]}) == len(plan["components"])
+
+    single = client.post("/api/simulation/optimize", json={
+        "area_pyeong": 3000, "region_grades": ["A"], "max_varieties": 1,
+        "varieties": ["감홍"], "rootstocks": ["MM106"],
+    }).json()["plans"][0]
+    expected = simulate(SimulationRequest(variety="감홍", area_pyeong=3000, rootstock_id="MM106"))
+    assert single["initial_investment"] == expected.initial_investment
+    assert single["roi_10year"] == expected.roi_10year
+    assert single["break_even_year"] == expected.break_even_year
+
+
+def test_simulation_portfolio_optimizer_rejects_empty_candidates(client):
+    """후보가 남지 않는 필터·0년 기간은 500이 아니라 400/422."""
+    res = client.post("/api/simulation/optimize", json={"area_pyeong": 1000, "rootstocks": ["M7"]})
+    assert res.status_code == 400
+    assert "M7" in res.json()["detail"]
+
+    res = client.post("/api/simulation/optimize", json={"area_pyeong": 1000, "varieties": ["없음"]})
+    assert res.status_code == 400
+    assert "없음" in res.json()["detail"]
+
+    res = client.post("/api/simulation/optimize", json={"area_pyeong": 1000, "projection_years": 0})
+    assert res.status_code == 422
+
+    for bad in ({"objective": "xx"}, {"top_n": 0}, {"max_varieties": 0}, {"max_varieties": 4},
+                {"split_step": 0}, {"split_step": 0.01}, {"split_step": 1.5}):
+        res = client.post("/api/simulation/optimize", json={"area_pyeong": 1000, **bad})
+        assert res.status_code == 422, bad
+
+    # 계획 수 상한 초과 → 400 (수 초짜리 탐색 대신 안내)
+    res = client.post("/api/simulation/optimize", json={
+        "area_pyeong": 1000, "split_step": 0.05, "max_varieties": 3,
+    })
+    assert res.status_code == 400
+    assert "split_step" in res.json()["detail"]
+
+
+def test_simulation_portfolio_optimizer_budget_pruning():
+    """단독으로 예산을 넘는 단위는 조합 전에 제외 — 조립 계획 수가 줄고 예산은 그대로 준수."""
+    from schemas.simulation import OptimizeRequest
+    from services import simulation_optimizer as so
+
+    req = OptimizeRequest(area_pyeong=3000, budget=10_000_000, region_grades=["A"])
+    pruned = so.optimize_portfolio(req)
+    assert pruned.pruned_components > 0
+    assert all(p.initial_investment <= req.budget for p in pruned.plans)
+
+    unpruned = so.optimize_portfolio(req.model_copy(update={"budget": None}))
+    assert unpruned.pruned_components == 0
+    assert pruned.evaluated_plans < unpruned.evaluated_plans
+
+
+def test_simulation_cube_interpolation(client, tmp_path, monkeypatch):
+    """사전 계산 큐브 — 격자 내 보간이 simulate()와 일치, 격자 밖·시세 변경 시 정확 계산."""
+    import services.simulation_cube as cube_module
+    from schemas.simulation import SimulationRequest
+    from services.price_cache import get_price_cache
+    from services.simulation import simulate
+
+    cube = cube_module.SimulationCube(tmp_path)
+    monkeypatch.setattr(cube_module, "_cube", cube)
+    status = cube.rebuild()
+    assert status["fresh"] and (tmp_path / "simulation_cube.npy").exists()
+    assert cube_module.SimulationCube(tmp_path).load()  # 같은 입력 → 파일 재사용
+    assert not (tmp_path / "simulation_cube.json.tmp").exists()
+
+    # 큐브 교체 후 메타 교체 전 중단 → 이전 메타는 새 .npy를 거부
+    import json
+    import os
+    meta_path = tmp_path / "simulation_cube.json"
+    stale = json.loads(meta_path.read_text(encoding="utf-8"))
+    npy = tmp_path / "simulation_cube.npy"
+    os.utime(npy, ns=(npy.stat().st_atime_ns, stale["cube_mtime_ns"] + 10**9))
+    assert not cube_module.SimulationCube(tmp_path).load()
+    cube.rebuild()
+
+    body = {"variety": "홍로", "area_pyeong": 1234.5, "rootstock_id": "M9", "price_per_kg": 6100}
+    data = client.post("/api/simulation/quick", json=body).json()
+    expected = simulate(SimulationRequest(**body))
+    assert data["source"] == "cube"
+    assert abs(data["annual_profit"] - expected.annual_profit) <= 1
+    assert data["initial_investment"] == expected.initial_investment
+    assert data["break_even_year"] == expected.break_even_year
+    assert data["roi_10year"] == expected.roi_10year
+
+    outside = client.post("/api/simulation/quick", json={**body, "area_pyeong": 90_000}).json()
+    assert outside["source"] == "exact"
+
+    # 시세 변경 → 큐브 stale → 재구성 전까지 정확 계산
+    monkeypatch.setattr(get_price_cache(), "_version", get_price_cache().version + 1)
+    assert not cube.is_fresh()
+    assert client.post("/api/simulation/quick", json=body).json()["source"] == "exact"
+    cube.rebuild()
+    assert client.post("/api/simulation/quick", json=body).json()["source"] == "cube"
+
+
+def test_simulation_whatif_session(client):
+    """What-if 세션 — 결과는 simulate()와 같고, 편집된 필드의 하위 단계만 재계산."""
+    from schemas.simulation import SimulationRequest
+    from services.simulation import simulate
+
+    base = {"variety": "후지", "area_pyeong": 1500, "rootstock_id": "M26"}
+    with client.websocket_connect("/api/simulation/session") as ws:
+        assert ws.receive_json()["type"] == "session"
+
+        ws.send_json({"type": "init", "request": base})
+        first = ws.receive_json()
+        assert first["type"] == "result" and first["seq"] == 1
+        expected = simulate(SimulationRequest(**base)).model_dump(mode="json")
+        for key in ("annual_profit", "initial_investment", "break_even_year", "roi_10year", "yearly_projections"):
+            assert first["result"][key] == expected[key]
+
+        ws.send_json({"type": "edit", "changes": {"price_per_kg": 7000}})
+        second = ws.receive_json()
+        assert {"price", "revenue", "projection"} <= set(second["recomputed"])
+        assert {"region", "base_yield", "grade", "cost", "investment"} <= set(second["reused"])
+        assert second["result"]["annual_profit"] == simulate(
+            SimulationRequest(**base, price_per_kg=7000)).annual_profit
+
+        ws.send_json({"type": "edit", "changes": {"area_pyeong": -1, "variety": None}})
+        assert ws.receive_json()["type"] == "error"
+
+        # 연속 편집: 마지막 편집 결과가 반드시 도착
+        for area in (1000, 2000, 3000):
+            ws.send_json({"type": "edit", "changes": {"area_pyeong": area}})
+        while (msg := ws.receive_json())["seq"] != 5:
+            pass
+        assert msg["result"]["area_pyeong"] == 3000
+
+
+def test_simulation_session_validation_key_ignores_superseded_stage(monkeypatch):
+    """밀려난 계산이 공유 단계 항목을 덮어써도 검증 캐시 키는 이번 계산의 단계 키로 만든다."""
+    from schemas.simulation import SimulationRequest
+    import services.simulation_session as ss
+
+    session = ss.SimulationSession("t")
+    seq, req = session.apply({"variety": "후지", "area_pyeong": 1500})
+    real = ss._projection_stage
+
+    def racing(*args):
+        # to_thread로 계속 도는 이전 계산이 cost 단계를 다른 키로 덮어쓴 상황
+        session._stages["cost"] = (("stale",), session._stages["cost"][1])
+        return real(*args)
+
+    monkeypatch.setattr(ss, "_projection_stage", racing)
+    session.compute(req, seq)
+    validation_key = session._stages["validation"][0]
+    assert ("stale",) not in validation_key
+    assert (1500, ss.get_scenario_table().version) in validation_key
+
+
+def test_simulation_single_pass_refine_matches_resimulation():
+    """단일 패스 보정 — simulate → 검증 → 보정 → 재시뮬레이션 → 재검증과 같은 결과."""
+    from schemas.simulation import SimulationRequest
+    from services.simulation import simulate
+    from services.simulation_validator import (
+        suggest_refinement, validate_and_refine, validate_simulation,
+    )
+
+    for body in (
+        {"variety": "후지", "area_pyeong": 1500, "price_per_kg": 20000},
+        {"variety": "감홍", "area_pyeong": 800, "yield_per_10a": 5000, "region_id": "11110"},
+        {"variety": "홍로", "area_pyeong": 3000},
+    ):
+        req = SimulationRequest(**body)
+        expected = simulate(req)
+        notes = validate_simulation(expected)
+        refined_req = suggest_refinement(req, expected, notes) if notes else None
+        if refined_req is not None:
+            expected = simulate(refined_req)
+            expected.refined = True
+            notes = validate_simulation(expected)
+        expected.validation_notes = notes or None
+
+        result, refined = validate_and_refine(req)
+        assert refined == (refined_req is not None)
+        assert result.model_dump() == expected.model_dump()
+
+
+def test_reflexion_lessons_ring(tmp_path):
+    """Reflexion 교훈 링 — 파일 꼬리 시딩 + 증분 집계가 전체 재집계와 일치."""
+    import json
+    from services.simulation_validator import ReflexionLessons
+
+    path = tmp_path / "outcomes.jsonl"
+    records = [
+        {"refined": i % 3 == 0, "fields": ["income_ratio"] if i % 2 else ["price_per_kg", "roi_10year"]}
+        for i in range(500)
+    ]
+    path.write_text("".join(json.dumps(r) + "\n" for r in records), encoding="utf-8")
+
+    lessons = ReflexionLessons(window=50)
+    lessons.seed(path)
+    for i in range(30):  # 시딩 이후 _record_outcome 경로로 추가
+        records.append({"refined": True, "fields": ["break_even_year"]})
+        lessons.push(True, ["break_even_year"])
+
+    recent = records[-50:]
+    freq: dict[str, int] = {}
+    for r in recent:
+        for f in r["fields"]:
+            freq[f] = freq.get(f, 0) + 1
+    snap = lessons.snapshot()
+    assert snap["total"] == 50
+    assert snap["field_freq"] == freq
+    assert snap["refinement_rate"] == sum(r["refined"] for r in recent) / 50
+
+
+def test_critique_queue_offline_load():
+    """비평 큐 — 스텁 클라이언트로 동시성 상한·캐시·타임아웃 확인."""
+    import asyncio
+    from schemas.simulation import SimulationRequest, ValidationNote
+    from services.critique_queue import CritiqueQueue, StubCritiqueClient
+    from services.simulation import simulate
+
+    results = [simulate(SimulationRequest(variety="후지", area_pyeong=a)) for a in range(500, 2500, 100)]
+    notes = [ValidationNote(severity="caution", field="price_per_kg", message="범위 밖")]
+
+    async def scenario():
+        stub = StubCritiqueClient(latency_s=0.01)
+        queue = CritiqueQueue(client=stub, concurrency=3, timeout_s=1.0)
+        ids = [queue.submit(notes, results[i % len(results)])[0] for i in range(200)]
+        await queue.drain()
+        assert stub.calls == len(set(ids)) == len(results)   # 같은 키는 1회만 호출
+        assert queue.get_stats()["max_in_flight"] <= 3
+        critique_id, cached = queue.submit(notes, results[0])
+        assert cached and queue.get(critique_id)["status"] == "done"
+
+        slow = CritiqueQueue(client=StubCritiqueClient(latency_s=0.3), concurrency=1, timeout_s=0.02)
+        slow_id, _ = slow.submit(notes, results[0])
+        await slow.drain()
+        assert slow.get(slow_id)["status"] == "timeout"
+        await queue.stop()
+        await slow.stop()
+
+        # 워커 스레드 동시 제출 (what-if 세션 경로) — 키당 1회 호출, 항목 손상 없음
+        threaded = CritiqueQueue(client=StubCritiqueClient(latency_s=0.001), concurrency=2)
+        threaded.submit(notes, results[0])   # 루프 스레드에서 워커 기동
+        await asyncio.gather(*(
+            asyncio.to_thread(lambda k=k: [threaded.submit(notes, r) for r in results[k::4]])
+            for k in range(4)
+        ))
+        await asyncio.sleep(0.05)
+        await threaded.drain()
+        stats = threaded.get_stats()
+        assert stats["submitted"] == stats["entries"] == len(results) == stats["completed"]
+        await threaded.stop()
+
+    asyncio.run(scenario())
+
+
+def test_jsonl_writer_batches_and_flushes(tmp_path):
+    """공용 JSONL 기록기 — 다중 스레드 배치 기록, 읽기 전 flush, 시간 기반 기록."""
+    import json
+    import threading
+    import time
+    from core.log_writer import JsonlWriter
+
+    writer = JsonlWriter(max_batch=64, max_delay_s=0.05)
+    a, b = tmp_path / "a.jsonl", tmp_path / "sub" / "b.jsonl"
+
+    def produce(t: int):
+        for i in range(250):
+            writer.append(a if i % 2 else b, {"t": t, "i": i})
+
+    threads = [threading.Thread(target=produce, args=(t,)) for t in range(4)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    writer.flush(a)
+    rows = [json.loads(line) for line in a.read_text(encoding="utf-8").splitlines()]
+    assert len(rows) == 500
+    for t in range(4):  # 스레드별 순서 유지
+        seq = [r["i"] for r in rows if r["t"] == t]
+        assert seq == sorted(seq)
+
+    writer.append(b, {"late": True})
+    deadline = time.monotonic() + 2.0
+    while writer.get_stats()["written"] < 1001 and time.monotonic() < deadline:  # 시간 기반 기록
+        time.sleep(0.01)
+    stats = writer.get_stats()
+    assert stats["queue_depth"] == 0 and stats["written"] == 1001
+    assert stats["batches"] < stats["written"]
+
+    writer.close()
+    writer.append(b, {"after_close": True})   # 종료 후에는 즉시 기록
+    assert len(b.read_text(encoding="utf-8").splitlines()) == 502
+
+
+def test_analytics_incremental_aggregates(tmp_path, monkeypatch):
+    """실행 분석 — 증분 합계·최대값·최다 품종·prefix-sum 트렌드가 전체 재집계와 일치."""
+    import random
+    from services.simulation_analytics import SimulationAnalytics
+
+    monkeypatch.setattr(SimulationAnalytics, "_JSONL_FILE", tmp_path / "runs.jsonl")
+    analytics = SimulationAnalytics(max_records=20)
+    rng = random.Random(7)
+    runs: list[dict] = []
+    for _ in range(300):
+        run = dict(
+            variety=rng.choice(["후지", "홍로", "감홍"]), area_pyeong=rng.uniform(100, 5000),
+            total_trees=100, projection_years=10, annual_profit=0,
+            roi_10year=rng.uniform(-1, 4), break_even_year=rng.randint(1, 10), duration_ms=1.0,
+        )
+        analytics.record_run(**run)
+        runs.append(run)
+
+    ring = runs[-20:]
+    snap = analytics.get_snapshot()
+    assert snap.recent_runs == 20 and snap.total_runs == 300
+    assert abs(snap.avg_roi - sum(r["roi_10year"] for r in ring) / 20) < 1e-9
+    assert abs(snap.avg_break_even - sum(r["break_even_year"] for r in ring) / 20) < 1e-9
+    assert snap.largest_area == max(r["area_pyeong"] for r in ring)
+    assert snap.most_popular_variety == max(snap.variety_counts, key=snap.variety_counts.get)
+
+    trends = analytics.get_trends(window=7)
+    assert trends["window"] == 7
+    assert trends["avg_roi_recent"] == round(sum(r["roi_10year"] for r in ring[-7:]) / 7, 2)
+    older = sum(r["roi_10year"] for r in ring[:-7]) / 13
+    assert abs(trends["roi_change"] - round(trends["avg_roi_recent"] - older, 2)) <= 0.011
+
+
+def test_analytics_checkpoint_tail_replay(tmp_path, monkeypatch):
+    """분석 복원 — 체크포인트 + 꼬리 재생이 전체 재생과 같고, 수백만 줄 로그도 즉시 기동."""
+    import json
+    import time
+    from dataclasses import asdict
+    from services import simulation_analytics as sa
+    import numpy as np
+    from services.run_store import RUN_DTYPE, RunStore
+    from services.simulation_analytics import SimulationAnalytics, SimulationRunRecord
+
+    log = tmp_path / "runs.jsonl"
+    monkeypatch.setattr(SimulationAnalytics, "_JSONL_FILE", log)
+    monkeypatch.setattr(sa, "CHECKPOINT_EVERY", 50)
+
+    def run(i: int) -> dict:
+        return dict(variety=["후지", "홍로", "감홍"][i % 3 if i < 120 else 1], area_pyeong=100.0 + i,
+                    total_trees=10, projection_years=10, annual_profit=i, roi_10year=i / 100,
+                    break_even_year=i % 9 + 1, duration_ms=1.0)
+
+    # 주기 체크포인트는 record_run(이벤트 루프)이 아니라 기록 스레드에서, 직전 줄까지의 오프셋으로
+    from core.log_writer import JsonlWriter
+    early_log, real_writer, slow = tmp_path / "early.jsonl", sa.get_log_writer, JsonlWriter(max_delay_s=60.0)
+    monkeypatch.setattr(SimulationAnalytics, "_JSONL_FILE", early_log)
+    monkeypatch.setattr(sa, "get_log_writer", lambda: slow)
+    early = SimulationAnalytics(max_records=30)
+    for i in range(55):
+        early.record_run(**run(i))
+    assert not early._checkpoint_file.exists()
+    seen = []
+    slow.after(early_log, lambda: seen.append(early_log.stat().st_size))
+    slow.flush(early_log)
+    cp = json.loads(early._checkpoint_file.read_text(encoding="utf-8"))
+    assert cp["total_runs"] == 50 and cp["store"]["rows"] == 50
+    lines = early_log.read_bytes().splitlines(keepends=True)
+    assert cp["offset"] == sum(len(line) for line in lines[:50])
+    assert seen == [early_log.stat().st_size]
+    slow.close()
+    monkeypatch.setattr(sa, "get_log_writer", real_writer)
+    monkeypatch.setattr(SimulationAnalytics, "_JSONL_FILE", log)
+
+    live = SimulationAnalytics(max_records=30)
+    for i in range(170):   # 50건마다 체크포인트, 마지막 20건은 꼬리
+        live.record_run(**run(i))
+    sa.get_log_writer().flush(log)
+    cp = json.loads(live._checkpoint_file.read_text(encoding="utf-8"))
+    assert cp["total_runs"] == 150 and cp["offset"] < log.stat().st_size
+
+    restored = SimulationAnalytics(max_records=30)
+    log.with_name("runs.checkpoint.json").unlink()
+    full = SimulationAnalytics(max_records=30)
+    assert restored._restore_stats["replayed_lines"] == 20
+    assert full._restore_stats["replayed_lines"] == 170
+    for a in (restored, full):
+        assert a.get_snapshot().to_dict() == live.get_snapshot().to_dict()
+        assert a.recent_records() == live.recent_records()
+
+    # 수백만 줄 로그: 체크포인트가 앞부분을 덮으면 꼬리 100줄만 재생
+    big = tmp_path / "big.jsonl"
+    monkeypatch.setattr(SimulationAnalytics, "_JSONL_FILE", big)
+    record = asdict(SimulationRunRecord(0.0, "후지", 500.0, 100, 10, 1, 1.5, 4, 1.0))
+    line = (json.dumps(record, ensure_ascii=False) + "\n").encode()
+    n_lines = 2_000_000
+    with open(big, "wb") as f:
+        for _ in range(n_lines // 100_000):
+            f.write(line * 100_000)
+        offset = f.tell()
+    with open(big, "rb") as f:
+        digest = sa._tail_digest(f, offset)
+    store = RunStore()
+    rows = np.zeros(n_lines, dtype=RUN_DTYPE)
+    for name in RUN_DTYPE.names:
+        rows[name] = store.variety_code("후지") if name == "variety" else record[name]
+    store.extend(rows)
+    big.with_name("big.checkpoint.json").write_text(json.dumps({
+        "format": sa.CHECKPOINT_FORMAT, "offset": offset, "tail_digest": digest,
+        "total_runs": n_lines, "variety_counts": {"후지": n_lines},
+        "store": store.save(big.with_name("big.store")),
+    }), encoding="utf-8")
+    del rows, store
+    with open(big, "ab") as f:
+        f.write(line.replace("후지".encode(), "홍로".encode()) * 100)
+
+    t0 = time.perf_counter()
+    analytics = SimulationAnalytics()
+    elapsed = time.perf_counter() - t0
+    snap = analytics.get_snapshot()
+    assert snap.total_runs == n_lines + 100
+    assert snap.variety_counts == {"후지": n_lines, "홍로": 100}
+    assert analytics._restore_stats["replayed_lines"] == 100
+    assert elapsed < 0.5
+
+
+def test_run_store_group_query(client, tmp_path):
+    """컬럼 실행 저장소 — 그룹 집계가 직접 계산과 일치, 청크 저장·복원, 조회 API."""
+    import numpy as np
+    from services.run_store import RUN_DTYPE, RunStore
+
+    store = RunStore(chunk_rows=1000)
+    names = ["후지", "홍로", "감홍"]
+    codes = [store.variety_code(n) for n in names]
+    rng = np.random.default_rng(3)
+    n = 25_500
+    rows = np.zeros(n, dtype=RUN_DTYPE)
+    rows["timestamp"] = np.sort(1.7e9 + rng.uniform(0, 86400 * 10, n))
+    rows["variety"] = rng.choice(codes, n)
+    rows["area_pyeong"] = rng.uniform(100, 20000, n)
+    rows["roi_10year"] = rng.normal(1.5, 1.0, n)
+    store.extend(rows)
+    assert RUN_DTYPE.itemsize <= 64 and store.nbytes == n * RUN_DTYPE.itemsize
+
+    result = store.query(group_by=("variety", "roi"), metric="area_pyeong", quantiles=(0.5, 0.9))
+    assert sum(g["count"] for g in result["groups"]) == n
+    band = np.searchsorted(np.array([0.0, 1.0, 2.0, 3.0]), rows["roi_10year"], side="right")
+    labels = ["<0", "0-1", "1-2", "2-3", "≥3"]
+    for g in result["groups"]:
+        sel = rows["area_pyeong"][
+            (rows["variety"] == names.index(g["key"]["variety"])) & (band == labels.index(g["key"]["roi"]))
+        ]
+        assert g["count"] == sel.size
+        assert abs(g["mean"] - sel.mean()) < 1e-3
+        assert np.allclose(list(g["quantiles"].values()), np.quantile(sel, [0.5, 0.9]), atol=1e-3)
+
+    days = store.query(group_by=("time",), time_bucket="day", since=rows["timestamp"][5000])
+    assert days["matched_rows"] == n - 5000
+    assert days["group_count"] == np.unique(rows["timestamp"][5000:].astype(np.int64) // 86400).size
+
+    loaded = RunStore.load(tmp_path, store.save(tmp_path))
+    assert len(loaded) == n and loaded.tail(3) == store.tail(3)
+    assert loaded.query(group_by=("variety", "roi"), metric="area_pyeong")["groups"] == result["groups"]
+
+    # 가득 찬 청크의 그룹 인덱스는 캐시 — 이후 조회는 작성 중 청크만 다시 묶는다
+    spec = (("variety", "roi"), None, None, (0.0, 1.0, 2.0, 3.0))
+    assert sorted(store._group_cache[spec]) == list(range(n // 1000))
+    more = rows[:700].copy()
+    more["roi_10year"] += 5.0
+    store.extend(more)
+    fresh = RunStore(chunk_rows=1000)
+    for name in names:
+        fresh.variety_code(name)
+    fresh.extend(np.concatenate([rows, more]))
+    query = dict(group_by=("variety", "roi"), metric="area_pyeong", quantiles=(0.1, 0.5))
+    assert store.query(**query)["groups"] == fresh.query(**query)["groups"]
+
+    client.post("/api/simulation/run", json={"variety": "후지", "area_pyeong": 1000})
+    res = client.get("/api/simulation/analytics/query", params={"group_by": "variety,area", "quantiles": "0.5"})
+    assert res.status_code == 200
+    body = res.json()
+    assert body["group_by"] == ["variety", "area"] and body["store"]["rows"] >= 1
+    assert all("p50" in g["quantiles"] for g in body["groups"])
+
+    for bad in ({"group_by": "bogus"}, {"metric": "bogus"}, {"time_bucket": "year"},
+                {"quantiles": "0.5,abc"}, {"quantiles": "1.5"}, {"quantiles": ","}):
+        res = client.get("/api/simulation/analytics/query", params=bad)
+        assert res.status_code == 400, bad
+    assert client.get("/api/simulation/analytics/query", params={"limit": -1}).status_code == 422
+
+
+def test_feedback_log_migration_and_incremental_stats(tmp_path):
+    """피드백 — JSON 배열 일회성 이전 + 추가 전용 로그 + 증분 통계 (재기동 후 동일)."""
+    import json
+    from core.log_writer import get_log_writer
+    from services.simulation_feedback import SimulationFeedbackCollector
+
+    legacy = [
+        {"variety": "후지" if i % 3 else "홍로", "area_pyeong": 1000,
+         "rating": ["helpful", "inaccurate", "needs_detail"][i % 3], "comment": f"c{i}" if i % 2 else "",
+         "timestamp": "2025-01-01T00:00:00"}
+        for i in range(40)
+    ]
+    (tmp_path / "simulation_feedback.json").write_text(json.dumps(legacy, ensure_ascii=False), encoding="utf-8")
+
+    collector = SimulationFeedbackCollector(data_dir=tmp_path)
+    assert not (tmp_path / "simulation_feedback.json").exists()
+    assert (tmp_path / "simulation_feedback.json.migrated").exists()
+    for i in range(15):
+        collector.submit("감홍", 500, "inaccurate" if i % 2 else "helpful", comment=f"new{i}")
+    entries = legacy + [{"variety": "감홍", "rating": "inaccurate" if i % 2 else "helpful",
+                         "comment": f"new{i}"} for i in range(15)]
+
+    stats = collector.get_stats()
+    assert stats["total"] == 55
+    assert stats["helpful_rate"] == round(sum(e["rating"] == "helpful" for e in entries) / 55, 2)
+    assert stats["recent_issues"] == [e["comment"] for e in entries[-10:] if e["rating"] != "helpful" and e["comment"]]
+    assert stats["variety_breakdown"]["감홍"] == {"helpful": 8, "inaccurate": 7, "needs_detail": 0, "total": 15}
+
+    get_log_writer().flush(tmp_path / "simulation_feedback.jsonl")
+    assert SimulationFeedbackCollector(data_dir=tmp_path).get_stats() == stats